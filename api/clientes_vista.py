@@ -15,6 +15,7 @@ class ClientesVista:
         print("4. Clientes por vencimiento")
         print("5. Actualizar cliente")
         print("6. Eliminar cliente")
+        print("7. Plan de renovaciones")
         print("0. Volver")
         return input("\nSeleccione: ").strip()
 
@@ -60,6 +61,21 @@ class ClientesVista:
         for c in clientes:
             print(f"  {c.codigo} | {c.nombre_empresa}")
 
+    def plan_renovaciones(self):
+        try:
+            meses = int(input("\nMeses a planificar [3]: ").strip() or "3")
+            plan = self.service.plan_renovaciones(meses)
+        except ValueError:
+            print("Cantidad de meses inválida.")
+            return
+        except ValidacionError as e:
+            print(f"Error: {e}")
+            return
+        for vencimiento in plan:
+            print(f"\n{vencimiento.mes} {vencimiento.anio}: {len(vencimiento.clientes)} cliente(s)")
+            for c in vencimiento.clientes:
+                print(f"  {c.codigo} | {c.nombre_empresa} | {c.nombre_encargado} | {c.celular}")
+
     def actualizar_cliente(self):
         codigo = input("\nCódigo del cliente: ").strip()
         try:
@@ -82,5 +98,14 @@ class ClientesVista:
         try:
             self.service.eliminar(codigo)
             print("Cliente eliminado.")
+        except ConflictError as e:
+            print(f"Error: {e}")
+            if input(f"¿Eliminar {codigo} junto con sus tickets? (s/N): ").strip().lower() != 's':
+                return
+            try:
+                self.service.eliminar(codigo, en_cascada=True)
+                print("Cliente y tickets eliminados.")
+            except (NotFoundError, RepositoryError) as e:
+                print(f"Error: {e}")
         except (NotFoundError, RepositoryError) as e:
             print(f"Error: {e}")
\ No newline at end of file
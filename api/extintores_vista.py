@@ -1,6 +1,8 @@
 from services.extintores_service import ExtintoresService
 from config.exceptions import *
 
+TAMANO_PAGINA = 20
+
 class ExtintoresVista:
     def __init__(self, service: ExtintoresService):
         self.service = service
@@ -55,13 +57,23 @@ class ExtintoresVista:
         min_c = float(input("Capacidad mínima: ").strip() or "0")
         max_c = input("Capacidad máxima (vacío = sin límite): ").strip()
         max_c = float(max_c) if max_c else None
-        resultados = self.service.buscar_por_rango_capacidad(min_c, max_c) # type: ignore
-        if not resultados:
+        descendente = input("Orden (a = menor a mayor, d = mayor a menor) [a]: ").strip().lower() == 'd'
+        try:
+            total = self.service.contar_por_rango_capacidad(min_c, max_c)
+        except ValidacionError as e:
+            print(f"Error: {e}")
+            return
+        if not total:
             print("No encontrado.")
             return
-        print(f"\n{len(resultados)} resultado(s):")
-        for e in resultados:
-            print(f"  {e.codigo} | {e.nombre} | {e.capacidad}lb")
+        print(f"\n{total} resultado(s):")
+        for desde in range(0, total, TAMANO_PAGINA):
+            pagina = self.service.buscar_por_rango_capacidad(min_c, max_c, desde, TAMANO_PAGINA, descendente)
+            for e in pagina:
+                print(f"  {e.codigo} | {e.nombre} | {e.capacidad}lb")
+            if desde + TAMANO_PAGINA < total and input(
+                    f"-- {desde + len(pagina)} de {total}. Enter para seguir, 'q' para salir: ").strip().lower() == 'q':
+                break
 
     def actualizar_extintor(self):
         codigo = input("\nCódigo: ").strip()
@@ -83,5 +95,5 @@ class ExtintoresVista:
         try:
             self.service.eliminar(codigo)
             print("Extintor eliminado.")
-        except (NotFoundError, RepositoryError) as e:
+        except (NotFoundError, ConflictError, RepositoryError) as e:
             print(f"Error: {e}")
\ No newline at end of file
@@ -1,6 +1,8 @@
 from services.productos_service import ProductosService
 from config.exceptions import *
 
+TAMANO_PAGINA = 20
+
 class ProductosVista:
     def __init__(self, service: ProductosService):
         self.service = service
@@ -51,13 +53,23 @@ class ProductosVista:
         min_p = float(input("Precio mínimo: ").strip() or "0")
         max_p = input("Precio máximo (dejar vacío para sin límite): ").strip()
         max_p = float(max_p) if max_p else None
-        resultados = self.service.buscar_por_precio(min_p, max_p) # type: ignore
-        if not resultados:
+        descendente = input("Orden (a = menor a mayor, d = mayor a menor) [a]: ").strip().lower() == 'd'
+        try:
+            total = self.service.contar_por_precio(min_p, max_p)
+        except ValidacionError as e:
+            print(f"Error: {e}")
+            return
+        if not total:
             print("No encontrado.")
             return
-        print(f"\n{len(resultados)} resultado(s):")
-        for p in resultados:
-            print(f"  {p.codigo} | {p.nombre} | ${p.precio}")
+        print(f"\n{total} resultado(s):")
+        for desde in range(0, total, TAMANO_PAGINA):
+            pagina = self.service.buscar_por_precio(min_p, max_p, desde, TAMANO_PAGINA, descendente)
+            for p in pagina:
+                print(f"  {p.codigo} | {p.nombre} | ${p.precio}")
+            if desde + TAMANO_PAGINA < total and input(
+                    f"-- {desde + len(pagina)} de {total}. Enter para seguir, 'q' para salir: ").strip().lower() == 'q':
+                break
 
     def actualizar_producto(self):
         codigo = input("\nCódigo: ").strip()
@@ -77,5 +89,5 @@ class ProductosVista:
         try:
             self.service.eliminar(codigo)
             print("Producto eliminado.")
-        except (NotFoundError, RepositoryError) as e:
+        except (NotFoundError, ConflictError, RepositoryError) as e:
             print(f"Error: {e}")
\ No newline at end of file
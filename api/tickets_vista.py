@@ -1,9 +1,14 @@
+from datetime import date
+
 from services.tickets_service import TicketsService
+from services.importacion_service import ImportacionService
+from services.catalogo_service import PREFIJOS
 from config.exceptions import *
 
 class TicketsVista:
-    def __init__(self, service: TicketsService):
+    def __init__(self, service: TicketsService, importacion: ImportacionService = None): # type: ignore
         self.service = service
+        self.importacion = importacion or ImportacionService(service)
 
     def mostrar_menu(self):
         print("\n" + "="*50)
@@ -14,9 +19,31 @@ class TicketsVista:
         print("3. Ver por cliente")
         print("4. Actualizar ticket")
         print("5. Eliminar ticket")
+        print("6. Importar tickets (CSV/JSONL)")
+        print("7. Tickets por rango de fechas")
+        print("8. Reporte de ingresos")
         print("0. Volver")
         return input("\nSeleccione: ").strip()
 
+    def _elegir_del_catalogo(self, texto: str):
+        """
+        Si `texto` no es un código (PRO-/EXT-), lo busca por nombre en el
+        catálogo y deja elegir entre los más parecidos. Devuelve el código
+        elegido, o None si no hubo coincidencias o no se eligió ninguno.
+        """
+        if texto.upper().startswith(tuple(PREFIJOS)):
+            return texto
+        opciones = self.service.catalogo.buscar(texto, 5)
+        if not opciones:
+            print("  Sin coincidencias en el catálogo.")
+            return None
+        for i, entrada in enumerate(opciones, 1):
+            print(f"   {i}. {entrada.codigo} | {entrada.nombre} | ${entrada.precio}")
+        eleccion = input("  Número (Enter para omitir): ").strip()
+        if eleccion.isdigit() and 1 <= int(eleccion) <= len(opciones):
+            return opciones[int(eleccion) - 1].codigo
+        return None
+
     def crear_ticket(self):
         print("\n--- CREAR TICKET ---")
         servicio = input("Servicio: ").strip()
@@ -24,9 +51,12 @@ class TicketsVista:
         print("Productos (ingrese uno por uno, 'fin' para terminar):")
         productos = []
         while True:
-            codigo = input("  Código producto (o 'fin'): ").strip()
+            codigo = input("  Código o nombre del producto (o 'fin'): ").strip()
             if codigo.lower() == 'fin':
                 break
+            codigo = self._elegir_del_catalogo(codigo)
+            if codigo is None:
+                continue
             try:
                 cantidad = int(input("  Cantidad: ").strip())
                 productos.append({"codigo": codigo, "cantidad": cantidad})
@@ -39,13 +69,17 @@ class TicketsVista:
             print(f"Error: {e}")
 
     def listar_todos(self):
-        tickets = self.service.listar_todos()
-        if not tickets:
+        # Se imprimen a medida que se leen; el total se conoce al final
+        cantidad = 0
+        for t in self.service.iterar_todos():
+            if cantidad == 0:
+                print()
+            cantidad += 1
+            print(f"  {t.codigo_ticket} | {t.cliente} | ${t.total} | {t.fecha.strftime('%Y-%m-%d')}")
+        if cantidad == 0:
             print("\nNo hay tickets.")
             return
-        print(f"\n{len(tickets)} ticket(s):")
-        for t in tickets:
-            print(f"  {t.codigo_ticket} | {t.cliente} | ${t.total} | {t.fecha.strftime('%Y-%m-%d')}")
+        print(f"\n{cantidad} ticket(s).")
 
     def ver_por_cliente(self):
         codigo = input("\nCódigo cliente: ").strip()
@@ -57,6 +91,45 @@ class TicketsVista:
         for t in tickets:
             print(f"  {t.codigo_ticket} | {t.servicio} | ${t.total}")
 
+    def ver_por_rango(self):
+        try:
+            desde = date.fromisoformat(input("\nDesde (AAAA-MM-DD): ").strip())
+            hasta = date.fromisoformat(input("Hasta (AAAA-MM-DD): ").strip())
+        except ValueError:
+            print("Fecha inválida.")
+            return
+        try:
+            tickets = self.service.listar_por_rango(desde, hasta)
+        except ValidacionError as e:
+            print(f"Error: {e}")
+            return
+        if not tickets:
+            print("No hay tickets en ese rango.")
+            return
+        print(f"\n{len(tickets)} ticket(s), total ${sum(t.total for t in tickets)}:")
+        for t in tickets:
+            print(f"  {t.codigo_ticket} | {t.fecha.strftime('%Y-%m-%d')} | {t.cliente} | ${t.total}")
+
+    def reporte_ingresos(self):
+        reportes = self.service.reportes
+        general = reportes.total_general()
+        if general.cantidad == 0:
+            print("\nNo hay tickets.")
+            return
+        print(f"\nIngresos totales: ${general.monto} en {general.cantidad} ticket(s).")
+        print("\nPor mes:")
+        for mes, t in reportes.resumen("mes"):
+            print(f"  {mes} | ${t.monto} | {t.cantidad} ticket(s)")
+        print("\nPor servicio:")
+        for servicio, t in reportes.resumen("servicio"):
+            print(f"  {servicio} | ${t.monto} | {t.cantidad} ticket(s)")
+        print("\nClientes con más ingresos:")
+        for codigo, t in reportes.resumen("cliente")[:10]:
+            print(f"  {codigo} | ${t.monto} | {t.cantidad} ticket(s)")
+        print("\nProductos con más ingresos:")
+        for codigo, t in reportes.resumen("producto")[:10]:
+            print(f"  {codigo} | ${t.monto} | {t.cantidad} unidad(es)")
+
     def actualizar_ticket(self):
         codigo = input("\nCódigo ticket: ").strip()
         try:
@@ -67,9 +140,12 @@ class TicketsVista:
                 productos = []
                 print("Productos nuevos (uno por uno, 'fin' para terminar):")
                 while True:
-                    cod = input("  Código (o 'fin'): ").strip()
+                    cod = input("  Código o nombre (o 'fin'): ").strip()
                     if cod.lower() == 'fin':
                         break
+                    cod = self._elegir_del_catalogo(cod)
+                    if cod is None:
+                        continue
                     cant = int(input("  Cantidad: ").strip())
                     productos.append({"codigo": cod, "cantidad": cant})
             else:
@@ -87,4 +163,17 @@ class TicketsVista:
             self.service.eliminar(codigo)
             print("Ticket eliminado.")
         except (NotFoundError, RepositoryError) as e:
-            print(f"Error: {e}")
\ No newline at end of file
+            print(f"Error: {e}")
+
+    def importar_tickets(self):
+        ruta = input("\nRuta del archivo (.csv o .jsonl): ").strip()
+        try:
+            resultado = self.importacion.importar(ruta)
+        except (ValidacionError, RepositoryError) as e:
+            print(f"Error: {e}")
+            return
+        print(f"\n{len(resultado.importados)} ticket(s) importado(s), {len(resultado.errores)} con errores.")
+        for numero, mensaje in resultado.errores[:20]:
+            print(f"  Fila {numero}: {mensaje}")
+        if len(resultado.errores) > 20:
+            print(f"  ... y {len(resultado.errores) - 20} error(es) más.")
\ No newline at end of file
@@ -1,12 +1,30 @@
 import getpass
 from services.usuarios_service import UsuariosService
+from services.sesiones_service import SesionesService
 from config.exceptions import (
     ValidacionError, NotFoundError, ConflictError, AutenticacionError, RepositoryError
 )
 
 class UsuariosVista:
-    def __init__(self, service: UsuariosService):
+    def __init__(self, service: UsuariosService, sesiones: SesionesService = None): # type: ignore
         self.service = service
+        self.sesiones = sesiones or SesionesService(service)
+        self.sesion = None  # Sesion del usuario actual
+
+    def _abrir_sesion(self, usuario):
+        self.sesion = self.sesiones.abrir(usuario)
+        return usuario
+
+    def usuario_en_sesion(self):
+        """Usuario de la sesión abierta, o None si no hay o ya no es válida."""
+        if self.sesion is None:
+            return None
+        try:
+            return self.sesiones.validar(self.sesion.token)
+        except AutenticacionError as e:
+            print(f"\n❌ {e}")
+            self.sesion = None
+            return None
 
     def mostrar_menu(self, usuario_actual=None):
         print("\n" + "="*50)
@@ -34,7 +52,7 @@ class UsuariosVista:
         try:
             usuario = self.service.crear(nombre, email, password)
             print(f"\n✅ Usuario creado: {usuario.email}")
-            return usuario
+            return self._abrir_sesion(usuario)
         except ValidacionError as e:
             print(f"❌ Error de validación: {e}")
         except ConflictError as e:
@@ -51,7 +69,7 @@ class UsuariosVista:
         try:
             usuario = self.service.login(email, password)
             print(f"\n✅ Bienvenido, {usuario.nombre}!")
-            return usuario
+            return self._abrir_sesion(usuario)
         except AutenticacionError as e:
             print(f"❌ {e}")
         except ValidacionError as e:
@@ -72,7 +90,7 @@ class UsuariosVista:
                 password=None # type: ignore
             )
             print(f"\n✅ Datos actualizados: {usuario.email}")
-            return usuario
+            return self._abrir_sesion(usuario)
         except (ValidacionError, ConflictError, NotFoundError, RepositoryError) as e:
             print(f"❌ Error: {e}")
         return usuario_actual
@@ -98,7 +116,7 @@ class UsuariosVista:
                 password=password_nueva
             )
             print("\n✅ Contraseña cambiada exitosamente.")
-            return usuario
+            return self._abrir_sesion(usuario)
         except AutenticacionError:
             print("❌ Contraseña actual incorrecta.")
         except (ValidacionError, RepositoryError) as e:
@@ -117,6 +135,7 @@ class UsuariosVista:
             self.service.login(usuario_actual.email, password)
             self.service.eliminar(usuario_actual.email)
             print("\n✅ Cuenta eliminada permanentemente.")
+            self.sesion = None
             return None
         except AutenticacionError:
             print("❌ Contraseña incorrecta.")
@@ -125,6 +144,9 @@ class UsuariosVista:
         return usuario_actual
 
     def cerrar_sesion(self, usuario_actual):
+        if self.sesion is not None:
+            self.sesiones.cerrar(self.sesion.token)
+            self.sesion = None
         if usuario_actual:
             print(f"\n👋 Sesión cerrada: {usuario_actual.email}")
         return None
\ No newline at end of file
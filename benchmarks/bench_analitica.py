@@ -0,0 +1,98 @@
+"""
+Benchmark de análisis de tickets en columnas contra bucles sobre los dicts.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_analitica
+
+Genera en memoria LINEAS líneas de producto sintéticas repartidas en
+tickets de 1 a 9 líneas y calcula ingresos por mes, los 10 productos con
+más ingresos y la distribución de totales por cliente:
+
+- "dicts": bucles de Python sobre Ticket.productos, como se haría hoy.
+- "array": ColumnasTickets sin NumPy (columnas del módulo array).
+- "numpy": ColumnasTickets vectorizado, si NumPy está instalado.
+
+La carga a columnas se informa aparte del cálculo: se paga una vez y
+después cada análisis recorre solo las columnas.
+"""
+import random
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from models.tickets import Ticket
+from services.analitica_service import ColumnasTickets, np
+
+LINEAS = 1_000_000
+CLIENTES = 5_000
+PRODUCTOS = 4_000
+
+
+def generar() -> List[Ticket]:
+    aleatorio = random.Random(42)
+    precios = [aleatorio.randrange(10, 500) * 100 for _ in range(PRODUCTOS)]
+    tickets = []
+    lineas = 0
+    while lineas < LINEAS:
+        productos = []
+        for _ in range(min(aleatorio.randint(1, 9), LINEAS - lineas)):
+            i = aleatorio.randrange(PRODUCTOS)
+            productos.append({"codigo": f"PRO-{i}", "nombre": f"Producto {i}", "precio": precios[i],
+                                "cantidad": aleatorio.randint(1, 5)})
+        lineas += len(productos)
+        total = sum(p["precio"] * p["cantidad"] for p in productos)
+        cliente = aleatorio.randrange(CLIENTES)
+        fecha = datetime(2026, aleatorio.randint(1, 12), aleatorio.randint(1, 28))
+        tickets.append(Ticket(f"TIC-{len(tickets) + 1}", "Recarga", f"CLI-{cliente}", f"Empresa {cliente}",
+                                productos, total, fecha))
+    return tickets
+
+
+def con_dicts(tickets: List[Ticket]) -> None:
+    por_mes: Dict[str, float] = {}
+    por_producto: Dict[str, float] = {}
+    por_cliente: Dict[str, List[float]] = {}
+    for t in tickets:
+        mes = t.fecha.strftime("%Y-%m")
+        por_mes[mes] = por_mes.get(mes, 0) + t.total
+        por_cliente.setdefault(t.codigo_cliente, []).append(t.total)
+        for p in t.productos:
+            por_producto[p["codigo"]] = por_producto.get(p["codigo"], 0) + p["precio"] * p["cantidad"]
+    sorted(por_producto.items(), key=lambda item: -item[1])[:10]
+    for totales in por_cliente.values():
+        totales.sort()
+        (sum(totales), totales[0], totales[len(totales) // 2], totales[-1])
+
+
+def con_columnas(columnas: ColumnasTickets) -> None:
+    columnas.por_mes()
+    columnas.top_productos(10)
+    columnas.por_cliente()
+
+
+def medir(funcion, *argumentos) -> float:
+    inicio = time.perf_counter()
+    funcion(*argumentos)
+    return time.perf_counter() - inicio
+
+
+def main():
+    tickets = generar()
+    print(f"{sum(len(t.productos) for t in tickets)} líneas en {len(tickets)} tickets,"
+            f" {CLIENTES} clientes, {PRODUCTOS} productos")
+    print(f"  {'dicts':<6} cálculo {medir(con_dicts, tickets) * 1000:>8.1f} ms")
+
+    modos = [False] + ([True] if np is not None else [])
+    for vectorizado in modos:
+        inicio = time.perf_counter()
+        columnas = ColumnasTickets.desde_tickets(tickets, vectorizado)
+        carga = time.perf_counter() - inicio
+        calculo = medir(con_columnas, columnas)
+        nombre = "numpy" if vectorizado else "array"
+        print(f"  {nombre:<6} cálculo {calculo * 1000:>8.1f} ms | carga {carga * 1000:>8.1f} ms")
+    if np is None:
+        print("  numpy  (no instalado)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark de búsqueda de productos por nombre.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_busqueda_catalogo
+
+Crea PRODUCTOS productos sintéticos en un directorio temporal y mide, para
+varios tamaños, el recorrido completo con comparación de subcadenas (como
+era buscar_por_nombre) contra ProductosService.buscar_por_nombre con el
+índice de trigramas ya construido, que además tolera errores de tipeo.
+"""
+import os
+import random
+import tempfile
+import time
+
+from models.productos import Producto
+from repositories.productos_repo import ProductosRepo
+from services.productos_service import ProductosService
+
+TAMANOS = [1_000, 10_000, 50_000]
+CONSULTAS = ["polvo", "extntor co2", "manguera", "señalizacion", "zzz"]
+REPETICIONES = 20
+LIMITE = 20
+
+PALABRAS = ["Extintor", "Polvo", "Químico", "Seco", "CO2", "Manguera", "Gabinete", "Señalización",
+            "Soporte", "Recarga", "Válvula", "Boquilla", "Detector", "Humo", "Alarma", "Kit"]
+
+
+def poblar(repo: ProductosRepo, cantidad: int) -> None:
+    aleatorio = random.Random(7)
+    with repo.agrupar():
+        for i in range(cantidad):
+            nombre = " ".join(aleatorio.sample(PALABRAS, 3)) + f" {i}"
+            repo.guardar_producto(Producto("", nombre, aleatorio.randint(10, 500) * 1000))
+
+
+def recorrido(repo: ProductosRepo, texto: str) -> list:
+    texto = texto.lower().strip()
+    return [p for p in repo.iterar_todos() if texto in p.nombre.lower()]
+
+
+def medir(funcion, consulta: str) -> float:
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        funcion(consulta)
+    return (time.perf_counter() - inicio) / REPETICIONES
+
+
+def main():
+    print(f"{'productos':>9} | {'consulta':<13} | {'recorrido ms':>12} | {'trigramas ms':>12}"
+            f" | {'subcadena':>9} | {'aprox.':>6}")
+    for tamano in TAMANOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            repo = ProductosRepo(os.path.join(directorio, "productos.json"), formato="compacto")
+            poblar(repo, tamano)
+            service = ProductosService(repo)
+            buscar = lambda texto: service.buscar_por_nombre(texto, LIMITE)
+            buscar("x")  # construye el índice
+            for consulta in CONSULTAS:
+                antes = medir(lambda texto: recorrido(repo, texto), consulta)
+                despues = medir(buscar, consulta)
+                print(f"{tamano:>9} | {consulta:<13} | {antes * 1000:>12.2f} | {despues * 1000:>12.2f}"
+                        f" | {len(recorrido(repo, consulta)):>9} | {len(buscar(consulta)):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark de búsqueda de clientes por nombre.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_busqueda_clientes
+
+Crea CLIENTES clientes sintéticos en un directorio temporal y mide, para
+varios tamaños, el recorrido completo con comparación de subcadenas (como
+era buscar_por_nombre) contra ClientesService.buscar_por_nombre con el
+índice invertido ya construido.
+"""
+import os
+import random
+import tempfile
+import time
+
+from models.clientes import Cliente
+from repositories.clientes_repo import ClientesRepo
+from services.clientes_service import ClientesService
+
+TAMANOS = [1_000, 10_000, 50_000]
+CONSULTAS = ["extin", "bogotá", "jose per", "seguridad norte", "zzz"]
+REPETICIONES = 20
+
+PALABRAS = ["Extintores", "Seguridad", "Protección", "Industrial", "Norte", "Sur", "Bogotá", "Medellín",
+            "Cali", "Andina", "Fuego", "Control", "Servicios", "Integral", "Caribe", "Pacífico"]
+NOMBRES = ["José", "María", "Ana", "Luis", "Carlos", "Lucía", "Andrés", "Sofía"]
+APELLIDOS = ["Pérez", "Gómez", "Núñez", "Rodríguez", "Martínez", "López", "Díaz", "Ramírez"]
+
+
+def poblar(repo: ClientesRepo, cantidad: int) -> None:
+    aleatorio = random.Random(7)
+    with repo.agrupar():
+        for i in range(cantidad):
+            empresa = " ".join(aleatorio.sample(PALABRAS, 3)) + f" {i}"
+            encargado = f"{aleatorio.choice(NOMBRES)} {aleatorio.choice(APELLIDOS)}"
+            repo.guardar_clientes(Cliente("", empresa, encargado, "Calle 1", "3001234567", "Enero"))
+
+
+def recorrido(repo: ClientesRepo, texto: str) -> list:
+    texto = texto.lower().strip()
+    return [
+        c for c in repo.iterar_todos()
+        if texto in c.nombre_empresa.lower() or texto in c.nombre_encargado.lower()
+    ]
+
+
+def medir(funcion, consulta: str) -> float:
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        funcion(consulta)
+    return (time.perf_counter() - inicio) / REPETICIONES
+
+
+def main():
+    print(f"{'clientes':>8} | {'consulta':<16} | {'recorrido ms':>12} | {'índice ms':>9} | {'resultados':>10}")
+    for tamano in TAMANOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            repo = ClientesRepo(os.path.join(directorio, "clientes.json"), formato="compacto")
+            poblar(repo, tamano)
+            service = ClientesService(repo)
+            service.buscar_por_nombre("x")  # construye el índice
+            for consulta in CONSULTAS:
+                antes = medir(lambda texto: recorrido(repo, texto), consulta)
+                despues = medir(service.buscar_por_nombre, consulta)
+                resultados = len(service.buscar_por_nombre(consulta))
+                print(f"{tamano:>8} | {consulta:<16} | {antes * 1000:>12.2f} | {despues * 1000:>9.2f}"
+                        f" | {resultados:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark de varios procesos escribiendo sobre el mismo directorio de datos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_concurrencia
+
+Lanza PROCESOS procesos que crean clientes y tickets a la vez sobre un
+directorio temporal compartido (como varias terminales con main.py).
+Al final verifica que no se perdió ninguna alta ni se repitió ningún
+código, e informa las esperas de bloqueo que midió cada proceso.
+"""
+import multiprocessing
+import os
+import tempfile
+import time
+from collections import Counter
+
+PROCESOS = 4
+ALTAS_POR_PROCESO = 100
+
+
+def trabajador(directorio: str, almacenamiento: str, numero: int):
+    from repositories.bloqueo import metricas_bloqueos
+    from repositories.clientes_repo import ClientesRepo
+    from repositories.tickets_repo import TicketsRepo
+    from models.clientes import Cliente
+    from models.tickets import Ticket
+    from datetime import datetime
+
+    clientes = ClientesRepo(os.path.join(directorio, "clientes.json"))
+    tickets = TicketsRepo(os.path.join(directorio, "tickets.json"), almacenamiento=almacenamiento)
+    for i in range(ALTAS_POR_PROCESO):
+        cliente = Cliente("", f"Empresa {numero}-{i}", "Encargado", "Calle 1", "3001234567", "Enero")
+        clientes.guardar_clientes(cliente)
+        tickets.crear(Ticket("", "Recarga", cliente.codigo, cliente.nombre_empresa, [], 0, datetime.now()))
+    return metricas_bloqueos()
+
+
+def ejecutar(almacenamiento: str) -> None:
+    from repositories.clientes_repo import ClientesRepo
+    from repositories.tickets_repo import TicketsRepo
+
+    with tempfile.TemporaryDirectory() as directorio:
+        inicio = time.perf_counter()
+        with multiprocessing.Pool(PROCESOS) as pool:
+            metricas = pool.starmap(
+                trabajador, [(directorio, almacenamiento, n) for n in range(PROCESOS)]
+            )
+        duracion = time.perf_counter() - inicio
+
+        codigos_clientes = [c.codigo for c in ClientesRepo(os.path.join(directorio, "clientes.json")).cargar_todos()]
+        codigos_tickets = [
+            t.codigo_ticket
+            for t in TicketsRepo(os.path.join(directorio, "tickets.json"), almacenamiento=almacenamiento).cargar_todos()
+        ]
+        esperado = PROCESOS * ALTAS_POR_PROCESO
+        repetidos = sum(n - 1 for n in Counter(codigos_clientes + codigos_tickets).values() if n > 1)
+
+        print(f"tickets '{almacenamiento}': {PROCESOS} procesos × {ALTAS_POR_PROCESO} altas en {duracion:.2f} s")
+        print(f"  clientes {len(codigos_clientes)}/{esperado}, tickets {len(codigos_tickets)}/{esperado},"
+                f" códigos repetidos: {repetidos}")
+
+        totales: dict = {}
+        for por_proceso in metricas:
+            for ruta, por_modo in por_proceso.items():
+                for modo, valores in por_modo.items():
+                    acumulado = totales.setdefault((os.path.basename(ruta), modo), Counter())
+                    acumulado["adquisiciones"] += valores["adquisiciones"]
+                    acumulado["esperas"] += valores["esperas"]
+                    acumulado["tiempo_espera"] += valores["tiempo_espera"]
+                    acumulado["espera_maxima"] = max(acumulado["espera_maxima"], valores["espera_maxima"])
+        for (archivo, modo), valores in sorted(totales.items()):
+            if valores["adquisiciones"]:
+                print(f"  {archivo:<24} {modo:<11} {valores['adquisiciones']:>6} tomas,"
+                        f" {valores['esperas']:>5} con espera, {valores['tiempo_espera'] * 1000:>8.1f} ms total,"
+                        f" máx {valores['espera_maxima'] * 1000:>6.2f} ms")
+
+
+def main():
+    for almacenamiento in ("json", "journal"):
+        ejecutar(almacenamiento)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark del hash de contraseñas con bcrypt.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_contrasenas
+
+Hashea CONTRASENAS contraseñas para varios costos de bcrypt, una por una en
+el hilo que llama (como era UsuariosService._hash_password) y en lote con
+ContrasenasService.hashear_varios, e imprime las métricas de latencia que
+registra el servicio. La ganancia del lote depende de los núcleos
+disponibles: bcrypt libera el GIL, así que cada hilo del pool usa uno.
+"""
+import os
+import time
+
+import bcrypt
+
+from services.contrasenas_service import HASH, ContrasenasService
+
+CONTRASENAS = 16
+COSTOS = [8, 10, 12]
+
+
+def secuencial(passwords: list, costo: int) -> float:
+    inicio = time.perf_counter()
+    for password in passwords:
+        bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(costo))
+    return time.perf_counter() - inicio
+
+
+def main():
+    passwords = [f"clave-{i}" for i in range(CONTRASENAS)]
+    print(f"{CONTRASENAS} contraseñas, {os.cpu_count()} núcleo(s)")
+    print(f"{'costo':>5} | {'secuencial ms':>13} | {'pool ms':>9} | {'promedio ms':>11} | {'espera máx. ms':>14}")
+    for costo in COSTOS:
+        antes = secuencial(passwords, costo)
+        contrasenas = ContrasenasService(costo)
+        inicio = time.perf_counter()
+        contrasenas.hashear_varios(passwords)
+        despues = time.perf_counter() - inicio
+        metricas = contrasenas.metricas()[HASH]
+        contrasenas.cerrar()
+        print(f"{costo:>5} | {antes * 1000:>13.1f} | {despues * 1000:>9.1f}"
+                f" | {metricas['tiempo_promedio'] * 1000:>11.1f} | {metricas['espera_maxima'] * 1000:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
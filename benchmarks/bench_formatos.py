@@ -0,0 +1,60 @@
+"""
+Benchmark de los formatos de archivo (repositories/formatos.py).
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_formatos
+
+Genera tickets sintéticos con varios ítems cada uno (la forma de
+tickets.json) y mide, para cada formato, el tamaño en disco, el tiempo de
+escritura completa, de lectura completa y de recorrido en streaming.
+"""
+import os
+import tempfile
+import time
+
+from herramientas.migrar_formato import medir
+from repositories.formatos import FORMATOS
+
+CANTIDAD_TICKETS = 20000
+ITEMS_POR_TICKET = 5
+
+
+def tickets_sinteticos():
+    return [
+        {
+            "codigo_ticket": f"TIC-{i}",
+            "servicio": "Recarga",
+            "codigo_cliente": f"CLI-{i % 500 + 1}",
+            "cliente": f"Empresa {i % 500 + 1}",
+            "productos": [
+                {"codigo": f"PRO-{(i + j) % 2000 + 1}", "nombre": f"Producto {(i + j) % 2000}",
+                    "precio": 1000.0 + j, "cantidad": j + 1}
+                for j in range(ITEMS_POR_TICKET)
+            ],
+            "total": 15000.0,
+            "fecha": "2026-10-18T09:30:00"
+        }
+        for i in range(CANTIDAD_TICKETS)
+    ]
+
+
+def main():
+    registros = tickets_sinteticos()
+    print(f"{CANTIDAD_TICKETS} tickets × {ITEMS_POR_TICKET} ítems")
+    print(f"{'formato':<10} | {'KiB':>9} | {'escribir ms':>11} | {'leer ms':>8} | {'recorrer ms':>11}")
+    with tempfile.TemporaryDirectory() as directorio:
+        for nombre, formato in FORMATOS.items():
+            ruta = os.path.join(directorio, nombre)
+            tamano, escritura, lectura = medir(formato, registros, ruta)
+
+            inicio = time.perf_counter()
+            for _ in formato.iterar(ruta):
+                pass
+            recorrido = time.perf_counter() - inicio
+
+            print(f"{nombre:<10} | {tamano / 1024:>9.1f} | {escritura * 1000:>11.1f} | {lectura * 1000:>8.1f}"
+                    f" | {recorrido * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark de memoria del historial de tickets cargado como objetos.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_memoria_tickets
+
+Genera LINEAS líneas de producto sintéticas repartidas en tickets de 1 a 9
+líneas, las serializa como las guarda TicketsRepo y mide con tracemalloc
+cuánta memoria queda ocupada después de cargarlas:
+
+- "registros": la lista de dicts que devuelve json.loads (lo que guarda la
+  caché del almacén).
+- "clasico": los modelos de antes, clases con __dict__ por instancia y
+  Ticket.productos como lista de dicts.
+- "slots": Ticket y LineaTicket con __slots__, con códigos y nombres
+  internados.
+"""
+import gc
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, List
+
+from models.tickets import Ticket
+
+LINEAS = 1_000_000
+CLIENTES = 5_000
+PRODUCTOS = 4_000
+
+
+class TicketClasico:
+    """Ticket como era antes de los __slots__: un __dict__ por instancia y dicts por línea."""
+
+    def __init__(self, codigo_ticket, servicio, codigo_cliente, cliente, productos, total, fecha):
+        self.codigo_ticket = codigo_ticket
+        self.servicio = servicio
+        self.codigo_cliente = codigo_cliente
+        self.cliente = cliente
+        self.productos = productos
+        self.total = total
+        self.fecha = fecha
+
+
+def generar() -> str:
+    """Historial sintético en el formato de tickets.json."""
+    aleatorio = random.Random(42)
+    precios = [aleatorio.randrange(10, 500) * 100 for _ in range(PRODUCTOS)]
+    registros = []
+    lineas = 0
+    while lineas < LINEAS:
+        productos = []
+        for _ in range(min(aleatorio.randint(1, 9), LINEAS - lineas)):
+            i = aleatorio.randrange(PRODUCTOS)
+            productos.append({"codigo": f"PRO-{i}", "nombre": f"Producto {i}", "precio": precios[i],
+                                "cantidad": aleatorio.randint(1, 5)})
+        lineas += len(productos)
+        cliente = aleatorio.randrange(CLIENTES)
+        registros.append({
+            "codigo_ticket": f"TIC-{len(registros) + 1}",
+            "servicio": "Recarga",
+            "codigo_cliente": f"CLI-{cliente}",
+            "cliente": f"Empresa {cliente}",
+            "productos": productos,
+            "total": sum(p["precio"] * p["cantidad"] for p in productos),
+            "fecha": datetime(2026, aleatorio.randint(1, 12), aleatorio.randint(1, 28)).isoformat()
+        })
+    return json.dumps(registros)
+
+
+def como_objetos(texto: str, clase) -> List:
+    # Mismos campos que TicketsRepo._a_ticket
+    return [
+        clase(t['codigo_ticket'], t['servicio'], t['codigo_cliente'], t['cliente'], t['productos'],
+                t['total'], datetime.fromisoformat(t['fecha']))
+        for t in json.loads(texto)
+    ]
+
+
+def medir(cargar: Callable[[], List]) -> tuple:
+    """(bytes ocupados al terminar, segundos) de una carga; el resultado se libera al salir."""
+    gc.collect()
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    cargados = cargar()
+    duracion = time.perf_counter() - inicio
+    ocupado, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cargados
+    return ocupado, duracion
+
+
+def main():
+    texto = generar()
+    print(f"{LINEAS} líneas, {CLIENTES} clientes, {PRODUCTOS} productos ({len(texto) / 2**20:.1f} MB de JSON)")
+    modos = [
+        ("registros", lambda: json.loads(texto)),
+        ("clasico", lambda: como_objetos(texto, TicketClasico)),
+        ("slots", lambda: como_objetos(texto, Ticket)),
+    ]
+    base = None
+    for nombre, cargar in modos:
+        ocupado, duracion = medir(cargar)
+        base = base or ocupado
+        print(f"  {nombre:<9} {ocupado / 2**20:>8.1f} MB ({ocupado / base:>5.0%})"
+                f" | {ocupado / LINEAS:>6.1f} B/línea | carga {duracion:>6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark de consultas de tickets por rango de fechas.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_rango
+
+Genera MESES meses de historial sintético en un directorio temporal, con el
+almacenamiento de archivo único ("json") y con un archivo por mes
+("particionado"), y mide TicketsRepo.iterar_por_rango para el último mes
+en frío (caché vacía, como al iniciar la aplicación) y en caliente.
+"""
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from models.tickets import Ticket
+from repositories.almacen_json import _almacenes
+from repositories.tickets_repo import TicketsRepo
+
+MESES = 36
+TICKETS_POR_MES = 2000
+
+
+def generar() -> list:
+    inicio = datetime(2023, 11, 1)
+    tickets = []
+    for mes in range(MESES):
+        primer_dia = (inicio + timedelta(days=31 * mes)).replace(day=1)
+        for i in range(TICKETS_POR_MES):
+            fecha = primer_dia + timedelta(minutes=i * 20)
+            productos = [{"codigo": "PRO-1", "nombre": "Producto 1", "precio": 1000, "cantidad": 2}]
+            tickets.append(Ticket("", "Recarga", f"CLI-{i % 300}", f"Empresa {i % 300}", productos, 2000, fecha))
+    return tickets
+
+
+def medir(repo: TicketsRepo, desde: datetime, hasta: datetime) -> tuple:
+    inicio = time.perf_counter()
+    cantidad = sum(1 for _ in repo.iterar_por_rango(desde, hasta))
+    return cantidad, time.perf_counter() - inicio
+
+
+def main():
+    tickets = generar()
+    ultimo = max(t.fecha for t in tickets)
+    desde = ultimo.replace(day=1, hour=0, minute=0)
+    hasta = ultimo.replace(hour=23, minute=59, second=59)
+    print(f"{len(tickets)} tickets en {MESES} meses; consulta: {desde:%Y-%m-%d} a {hasta:%Y-%m-%d}")
+
+    for almacenamiento in ("json", "particionado"):
+        with tempfile.TemporaryDirectory() as directorio:
+            archivo = os.path.join(directorio, "tickets.json")
+            TicketsRepo(archivo, almacenamiento=almacenamiento, formato="compacto").crear_varios(tickets)
+
+            # Caché vacía, como un proceso recién iniciado
+            _almacenes.clear()
+            repo = TicketsRepo(archivo, almacenamiento=almacenamiento, formato="compacto")
+            cantidad, frio = medir(repo, desde, hasta)
+            repo.cargar_todos_por_cliente("CLI-1")  # carga la caché completa
+            _, caliente = medir(repo, desde, hasta)
+            print(f"  {almacenamiento:<13} {cantidad:>5} tickets | frío {frio * 1000:>8.1f} ms"
+                    f" | caliente {caliente * 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmark de búsqueda de productos por rango de precio.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_rango_precio
+
+Crea PRODUCTOS productos sintéticos en un directorio temporal y mide, para
+varios tamaños, el recorrido completo comparando cada precio (como era
+buscar_por_precio) contra ProductosService.buscar_por_precio con el índice
+ordenado ya construido, pidiendo el rango completo y solo la primera página.
+"""
+import os
+import random
+import tempfile
+import time
+
+from models.productos import Producto
+from repositories.productos_repo import ProductosRepo
+from services.productos_service import ProductosService
+
+TAMANOS = [1_000, 10_000, 100_000]
+RANGOS = [(10_000, 12_000), (100_000, 200_000), (0, None)]
+REPETICIONES = 20
+PAGINA = 20
+
+
+def poblar(repo: ProductosRepo, cantidad: int) -> None:
+    aleatorio = random.Random(7)
+    with repo.agrupar():
+        for i in range(cantidad):
+            repo.guardar_producto(Producto("", f"Producto {i}", aleatorio.randint(1, 1000) * 500))
+
+
+def recorrido(repo: ProductosRepo, minimo: float, maximo) -> list:
+    return [p for p in repo.iterar_todos() if p.precio >= minimo and (maximo is None or p.precio <= maximo)]
+
+
+def medir(funcion) -> float:
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        funcion()
+    return (time.perf_counter() - inicio) / REPETICIONES
+
+
+def main():
+    print(f"{'productos':>9} | {'rango':<17} | {'recorrido ms':>12} | {'índice ms':>9} | {'página ms':>9}"
+            f" | {'resultados':>10}")
+    for tamano in TAMANOS:
+        with tempfile.TemporaryDirectory() as directorio:
+            repo = ProductosRepo(os.path.join(directorio, "productos.json"), formato="compacto")
+            poblar(repo, tamano)
+            service = ProductosService(repo)
+            service.contar_por_precio(0, None)  # construye el índice
+            for minimo, maximo in RANGOS:
+                antes = medir(lambda: recorrido(repo, minimo, maximo))
+                despues = medir(lambda: service.buscar_por_precio(minimo, maximo))
+                pagina = medir(lambda: service.buscar_por_precio(minimo, maximo, 0, PAGINA))
+                rango = f"{minimo}-{maximo if maximo is not None else '∞'}"
+                print(f"{tamano:>9} | {rango:<17} | {antes * 1000:>12.2f} | {despues * 1000:>9.2f}"
+                        f" | {pagina * 1000:>9.3f} | {service.contar_por_precio(minimo, maximo):>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark de creación de tickets según la cantidad de ítems.
+
+Uso (desde la raíz del proyecto):
+    python -m benchmarks.bench_tickets
+
+Crea un catálogo sintético en un directorio temporal y mide el tiempo de
+TicketsService.crear para tickets de distinto tamaño. Con la resolución en
+bloque del catálogo, el costo por ítem se mantiene constante: el tiempo
+total crece solo por el trabajo lineal de armar las líneas del ticket.
+"""
+import os
+import tempfile
+import time
+
+from models.productos import Producto, Extintor
+from repositories.clientes_repo import ClientesRepo
+from repositories.productos_repo import ProductosRepo
+from repositories.extintores_repo import ExtintoresRepo
+from repositories.tickets_repo import TicketsRepo
+from services.clientes_service import ClientesService
+from services.tickets_service import TicketsService
+
+TAMANO_CATALOGO = 2000
+ITEMS_POR_TICKET = [1, 10, 50, 200]
+REPETICIONES = 20
+
+
+def preparar(directorio: str) -> TicketsService:
+    clientes_repo = ClientesRepo(os.path.join(directorio, "clientes.json"))
+    productos_repo = ProductosRepo(os.path.join(directorio, "productos.json"))
+    extintores_repo = ExtintoresRepo(os.path.join(directorio, "extintores.json"))
+    tickets_repo = TicketsRepo(os.path.join(directorio, "tickets.json"))
+
+    ClientesService(clientes_repo).crear("Empresa Demo", "Encargado", "Calle 1", "3001234567", "Enero")
+    for i in range(TAMANO_CATALOGO):
+        productos_repo.guardar_producto(Producto("", f"Producto {i}", 1000 + i))
+        extintores_repo.guardar_extintor(Extintor("", f"Extintor {i}", 5000 + i, "Abc", 10))
+
+    return TicketsService(tickets_repo, clientes_repo, productos_repo, extintores_repo)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directorio:
+        service = preparar(directorio)
+        print(f"Catálogo: {TAMANO_CATALOGO} productos + {TAMANO_CATALOGO} extintores")
+        print(f"{'ítems':>6} | {'resolver ms':>11} | {'µs/ítem':>8} | {'crear ms':>9}")
+        for cantidad in ITEMS_POR_TICKET:
+            # Mitad productos, mitad extintores, para ejercitar ambos catálogos
+            items = [
+                {"codigo": f"PRO-{i + 1}" if i % 2 == 0 else f"EXT-{i + 1}", "cantidad": 1}
+                for i in range(cantidad)
+            ]
+            inicio = time.perf_counter()
+            for _ in range(REPETICIONES):
+                service._sincronizar_productos(items)
+            resolver = (time.perf_counter() - inicio) / REPETICIONES
+
+            inicio = time.perf_counter()
+            for _ in range(REPETICIONES):
+                service.crear("Recarga", "CLI-1", items)
+            crear = (time.perf_counter() - inicio) / REPETICIONES
+
+            print(f"{cantidad:>6} | {resolver * 1000:>11.3f} | {resolver * 1e6 / cantidad:>8.2f}"
+                    f" | {crear * 1000:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Configuración de almacenamiento y armado de los repositorios.
+
+Sin dependencias de la interfaz: lo usan main.py y las herramientas de
+herramientas/ que corren como tareas programadas.
+"""
+import os
+
+from repositories.usuarios_repo import UsuariosRepo
+from repositories.clientes_repo import ClientesRepo
+from repositories.productos_repo import ProductosRepo
+from repositories.extintores_repo import ExtintoresRepo
+from repositories.tickets_repo import TicketsRepo
+from repositories.usuarios_sqlite_repo import UsuariosSqliteRepo
+from repositories.clientes_sqlite_repo import ClientesSqliteRepo
+from repositories.productos_sqlite_repo import ProductosSqliteRepo
+from repositories.extintores_sqlite_repo import ExtintoresSqliteRepo
+from repositories.tickets_sqlite_repo import TicketsSqliteRepo
+
+
+# === CONFIGURACIÓN DE ALMACENAMIENTO ===
+# "json"    → archivos data/*.json (por defecto)
+# "journal" → igual que "json", pero los tickets se guardan en un diario de solo-anexado
+# "particionado" → igual que "json", pero los tickets se guardan en un archivo por mes
+#                  (data/tickets/AAAA-MM.json). Para pasar tickets existentes:
+#                  python -m herramientas.particionar_tickets
+# "sqlite"  → base de datos data/extinsia.db con índices y escrituras transaccionales
+MOTOR_ALMACENAMIENTO = os.environ.get("EXTINSIA_MOTOR", "json")
+
+# Formato de los archivos de datos para los motores "json" y "journal"
+# "json"     → lista JSON indentada, legible a mano (por defecto)
+# "compacto" → lista JSON sin espacios: archivos más chicos y escrituras más rápidas
+# "binario"  → registros con prefijo de longitud (data/*.bin)
+# Para convertir datos existentes: python -m herramientas.migrar_formato <formato>
+FORMATO_ARCHIVOS = os.environ.get("EXTINSIA_FORMATO", "json")
+
+
+def crear_repositorios(motor: str, formato: str = "json"):
+    """Devuelve (usuarios, clientes, productos, extintores, tickets) según el motor."""
+    # Los clientes cargan sus tickets del repositorio de tickets, al usarlos
+    if motor == "sqlite":
+        tickets = TicketsSqliteRepo()
+        return (UsuariosSqliteRepo(), ClientesSqliteRepo(tickets_repo=tickets), ProductosSqliteRepo(),
+                ExtintoresSqliteRepo(), tickets)
+    if motor in ("json", "journal", "particionado"):
+        tickets = TicketsRepo(almacenamiento=motor, formato=formato)
+        return (UsuariosRepo(formato=formato), ClientesRepo(formato=formato, tickets_repo=tickets),
+                ProductosRepo(formato=formato), ExtintoresRepo(formato=formato), tickets)
+    raise ValueError(f"Motor de almacenamiento desconocido: '{motor}'")
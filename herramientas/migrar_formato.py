@@ -0,0 +1,152 @@
+"""
+Convierte los archivos de datos a otro formato de repositories/formatos.py.
+
+Uso (desde la raíz del proyecto):
+    python -m herramientas.migrar_formato compacto
+    python -m herramientas.migrar_formato binario --directorio data
+    python -m herramientas.migrar_formato --solo-medir
+
+Para cada colección (usuarios, clientes, productos, extintores, tickets)
+busca su archivo en cualquier formato, aplica el diario pendiente si lo hay
+(motor "journal") y lo reescribe en el formato pedido, informando tamaño y
+tiempos de lectura/escritura antes y después. Los tickets por mes (motor
+"particionado", data/tickets/AAAA-MM.*) se convierten partición por
+partición. Con --solo-medir no modifica nada: mide los tres formatos sobre
+los datos actuales.
+
+La aplicación debe estar cerrada durante la migración. Después hay que
+iniciarla con el mismo formato (variable EXTINSIA_FORMATO).
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from repositories.almacen_journal import AlmacenJournal
+from repositories.almacen_particionado import PATRON_MES
+from repositories.formatos import FORMATOS, Formato, detectar_formato, obtener_formato, ruta_para
+
+# Colección → clave primaria
+COLECCIONES = {
+    "usuarios": "codigo",
+    "clientes": "codigo",
+    "productos": "codigo",
+    "extintores": "codigo",
+    "tickets": "codigo_ticket",
+}
+
+
+def nombre_de(formato: Formato) -> str:
+    return next(nombre for nombre, f in FORMATOS.items() if f is formato)
+
+
+def medir(formato: Formato, registros: List[dict], ruta: str) -> Tuple[int, float, float]:
+    """Escribe y relee los registros en `ruta`. Devuelve (bytes, segundos escritura, segundos lectura)."""
+    inicio = time.perf_counter()
+    formato.escribir(ruta, registros)
+    escritura = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    formato.leer(ruta)
+    lectura = time.perf_counter() - inicio
+    return os.path.getsize(ruta), escritura, lectura
+
+
+def buscar_archivo(directorio: str, coleccion: str) -> Optional[str]:
+    """Devuelve el archivo existente de la colección, en cualquier formato."""
+    base = os.path.join(directorio, coleccion)
+    candidatos = sorted({base + f.extension for f in FORMATOS.values()})
+    existentes = [ruta for ruta in candidatos if os.path.exists(ruta)]
+    if len(existentes) > 1:
+        raise SystemExit(
+            f"Hay más de un archivo para '{coleccion}': {', '.join(existentes)}. "
+            "Deje solo el vigente y vuelva a intentar."
+        )
+    return existentes[0] if existentes else None
+
+
+def cargar(ruta: str, clave: str, formato: Formato) -> List[dict]:
+    # El almacén con diario lee la instantánea y le aplica el diario si existe
+    return AlmacenJournal(ruta, clave, formato=formato)._cargar_desde_disco()
+
+
+def imprimir(etiqueta: str, tamano: int, escritura: float, lectura: float) -> None:
+    print(f"    {etiqueta:<10} {tamano / 1024:>10.1f} KiB | escribir {escritura * 1000:>8.2f} ms"
+            f" | leer {lectura * 1000:>8.2f} ms")
+
+
+def migrar_archivo(origen_ruta: str, clave: str, destino: Formato, etiqueta: str) -> None:
+    origen = detectar_formato(origen_ruta)
+    registros = cargar(origen_ruta, clave, origen)
+    destino_ruta = ruta_para(origen_ruta, destino)
+
+    print(f"{etiqueta}: {len(registros)} registro(s), {nombre_de(origen)} → {nombre_de(destino)}")
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(origen_ruta)) as temporal:
+        imprimir("antes", *medir(origen, registros, os.path.join(temporal, "antes")))
+        nuevo = os.path.join(temporal, "nuevo")
+        imprimir("después", *medir(destino, registros, nuevo))
+        os.replace(nuevo, destino_ruta)
+
+    # El diario ya quedó aplicado en el archivo nuevo
+    for sufijo in (".journal", ".journal.1"):
+        if os.path.exists(origen_ruta + sufijo):
+            os.remove(origen_ruta + sufijo)
+    if destino_ruta != origen_ruta:
+        os.remove(origen_ruta)
+
+
+def particiones_de_tickets(directorio: str) -> List[str]:
+    """Archivos de tickets por mes (motor "particionado"), en cualquier formato."""
+    carpeta = os.path.join(directorio, "tickets")
+    if not os.path.isdir(carpeta):
+        return []
+    extensiones = {f.extension for f in FORMATOS.values()}
+    return [
+        os.path.join(carpeta, nombre) for nombre in sorted(os.listdir(carpeta))
+        if os.path.splitext(nombre)[1] in extensiones and PATRON_MES.match(os.path.splitext(nombre)[0])
+    ]
+
+
+def migrar(directorio: str, destino: Formato) -> None:
+    for coleccion, clave in COLECCIONES.items():
+        origen_ruta = buscar_archivo(directorio, coleccion)
+        if origen_ruta is not None:
+            migrar_archivo(origen_ruta, clave, destino, coleccion)
+    for ruta in particiones_de_tickets(directorio):
+        migrar_archivo(ruta, "codigo_ticket", destino, "tickets/" + os.path.basename(ruta))
+
+
+def solo_medir(directorio: str) -> None:
+    for coleccion, clave in COLECCIONES.items():
+        ruta = buscar_archivo(directorio, coleccion)
+        if ruta is None:
+            continue
+        registros = cargar(ruta, clave, detectar_formato(ruta))
+        print(f"{coleccion}: {len(registros)} registro(s)")
+        with tempfile.TemporaryDirectory() as temporal:
+            for nombre, formato in FORMATOS.items():
+                imprimir(nombre, *medir(formato, registros, os.path.join(temporal, nombre)))
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Convierte los archivos de datos a otro formato.")
+    parser.add_argument("formato", nargs="?", choices=list(FORMATOS), help="formato de destino")
+    parser.add_argument("--directorio", default="data", help="directorio de datos (por defecto: data)")
+    parser.add_argument("--solo-medir", action="store_true",
+                        help="mide los formatos sin modificar los archivos")
+    opciones = parser.parse_args(argumentos)
+
+    if not os.path.isdir(opciones.directorio):
+        sys.exit(f"No existe el directorio '{opciones.directorio}'.")
+    if opciones.formato is None and not opciones.solo_medir:
+        parser.error("indique el formato de destino o --solo-medir")
+    if opciones.solo_medir:
+        solo_medir(opciones.directorio)
+    else:
+        migrar(opciones.directorio, obtener_formato(opciones.formato))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Reparte los tickets de un archivo único en un archivo por mes.
+
+Uso (desde la raíz del proyecto):
+    python -m herramientas.particionar_tickets
+    python -m herramientas.particionar_tickets --directorio data --formato compacto
+
+Lee data/tickets.* en cualquier formato (aplicando el diario pendiente si lo
+hay, motor "journal") y escribe data/tickets/AAAA-MM.<ext>, un archivo por
+mes según la fecha de cada ticket. Al terminar borra el archivo original.
+Por defecto las particiones quedan en el mismo formato que el original.
+
+La aplicación debe estar cerrada durante la conversión. Después hay que
+iniciarla con el motor "particionado" (variable EXTINSIA_MOTOR) y el mismo
+formato (variable EXTINSIA_FORMATO).
+"""
+import argparse
+import os
+import sys
+from typing import Dict, List, Optional
+
+from herramientas.migrar_formato import buscar_archivo, cargar, nombre_de
+from repositories.almacen_particionado import PATRON_MES
+from repositories.formatos import FORMATOS, Formato, detectar_formato, obtener_formato
+
+
+def particionar(directorio: str, destino: Optional[Formato] = None) -> None:
+    origen_ruta = buscar_archivo(directorio, "tickets")
+    if origen_ruta is None:
+        sys.exit(f"No hay archivo de tickets en '{directorio}'.")
+    origen = detectar_formato(origen_ruta)
+    destino = destino or origen
+
+    carpeta = os.path.join(directorio, "tickets")
+    existentes = [
+        nombre for nombre in (os.listdir(carpeta) if os.path.isdir(carpeta) else [])
+        if PATRON_MES.match(os.path.splitext(nombre)[0])
+    ]
+    if existentes:
+        sys.exit(f"'{carpeta}' ya tiene particiones. Muévalas antes de volver a particionar.")
+
+    por_mes: Dict[str, List[dict]] = {}
+    for registro in cargar(origen_ruta, "codigo_ticket", origen):
+        por_mes.setdefault(registro["fecha"][:7], []).append(registro)
+
+    print(f"tickets: {sum(len(r) for r in por_mes.values())} registro(s), {nombre_de(origen)}"
+            f" → {len(por_mes)} partición(es) {nombre_de(destino)}")
+    os.makedirs(carpeta, exist_ok=True)
+    for mes in sorted(por_mes):
+        destino.escribir(os.path.join(carpeta, mes + destino.extension), por_mes[mes])
+        print(f"    {mes}: {len(por_mes[mes])}")
+
+    # El diario ya quedó aplicado en las particiones
+    for sufijo in (".journal", ".journal.1", ""):
+        if os.path.exists(origen_ruta + sufijo):
+            os.remove(origen_ruta + sufijo)
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Reparte los tickets en un archivo por mes.")
+    parser.add_argument("--directorio", default="data", help="directorio de datos (por defecto: data)")
+    parser.add_argument("--formato", choices=list(FORMATOS),
+                        help="formato de las particiones (por defecto: el del archivo actual)")
+    opciones = parser.parse_args(argumentos)
+
+    if not os.path.isdir(opciones.directorio):
+        sys.exit(f"No existe el directorio '{opciones.directorio}'.")
+    particionar(opciones.directorio, obtener_formato(opciones.formato) if opciones.formato else None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Lista los clientes a renovar en los próximos meses, para enviar recordatorios.
+
+Uso (desde la raíz del proyecto):
+    python -m herramientas.recordatorios_renovacion
+    python -m herramientas.recordatorios_renovacion --meses 2 --salida recordatorios.csv
+
+Escribe un CSV (anio, mes, codigo, empresa, encargado, celular) con los
+vencimientos del mes actual y los siguientes, en el orden del plan de
+renovaciones. Usa el mismo motor y formato de datos que la aplicación
+(variables EXTINSIA_MOTOR y EXTINSIA_FORMATO), así puede correr desde una
+tarea programada.
+"""
+import argparse
+import csv
+import sys
+from typing import List, Optional
+
+from config.almacenamiento import FORMATO_ARCHIVOS, MOTOR_ALMACENAMIENTO, crear_repositorios
+from services.renovaciones_service import RenovacionesService
+
+COLUMNAS = ["anio", "mes", "codigo", "empresa", "encargado", "celular"]
+
+
+def escribir(renovaciones: RenovacionesService, meses: int, salida) -> int:
+    """Escribe el plan en `salida` como CSV y devuelve la cantidad de clientes."""
+    escritor = csv.writer(salida)
+    escritor.writerow(COLUMNAS)
+    cantidad = 0
+    for vencimiento in renovaciones.plan(meses):
+        for c in vencimiento.clientes:
+            escritor.writerow([vencimiento.anio, vencimiento.mes, c.codigo, c.nombre_empresa,
+                                c.nombre_encargado, c.celular])
+            cantidad += 1
+    return cantidad
+
+
+def main(argumentos: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Clientes a renovar en los próximos meses (CSV).")
+    parser.add_argument("--meses", type=int, default=1, help="meses a cubrir, desde el actual (por defecto: 1)")
+    parser.add_argument("--salida", help="archivo CSV de salida (por defecto: la salida estándar)")
+    opciones = parser.parse_args(argumentos)
+    if opciones.meses < 1:
+        sys.exit("--meses debe ser al menos 1.")
+
+    clientes_repo = crear_repositorios(MOTOR_ALMACENAMIENTO, FORMATO_ARCHIVOS)[1]
+    renovaciones = RenovacionesService(clientes_repo)
+    if opciones.salida:
+        with open(opciones.salida, "w", newline="", encoding="utf-8") as archivo:
+            cantidad = escribir(renovaciones, opciones.meses, archivo)
+        print(f"{cantidad} cliente(s) → {opciones.salida}")
+    else:
+        escribir(renovaciones, opciones.meses, sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
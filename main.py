@@ -1,24 +1,33 @@
+import os
+
 from api.usuarios_vista import UsuariosVista
 from api.clientes_vista import ClientesVista
 from api.productos_vista import ProductosVista
 from api.extintores_vista import ExtintoresVista
 from api.tickets_vista import TicketsVista
 
-from repositories.usuarios_repo import UsuariosRepo
-from repositories.clientes_repo import ClientesRepo
-from repositories.productos_repo import ProductosRepo
-from repositories.extintores_repo import ExtintoresRepo
-from repositories.tickets_repo import TicketsRepo
+from config.almacenamiento import FORMATO_ARCHIVOS, MOTOR_ALMACENAMIENTO, crear_repositorios
 
 from services.usuarios_service import UsuariosService
 from services.clientes_service import ClientesService
 from services.productos_service import ProductosService
 from services.extintores_service import ExtintoresService
 from services.tickets_service import TicketsService
+from services.importacion_service import ImportacionService
+from services.contrasenas_service import COSTO_POR_DEFECTO, ContrasenasService
+from services.sesiones_service import TTL_POR_DEFECTO, SesionesService
+
+# Costo de bcrypt para las contraseñas nuevas (cada punto duplica el tiempo de
+# un hash). Las contraseñas ya guardadas se verifican con el costo que tengan.
+COSTO_BCRYPT = int(os.environ.get("EXTINSIA_BCRYPT_COSTO", COSTO_POR_DEFECTO))
+
+# Sesiones: duración en segundos y clave para firmar los tokens. Sin clave se
+# usa una al azar y los tokens valen solo mientras la aplicación esté abierta.
+TTL_SESION = float(os.environ.get("EXTINSIA_SESION_TTL", TTL_POR_DEFECTO))
+CLAVE_SESION = os.environ.get("EXTINSIA_CLAVE_SESION", "").encode("utf-8") or None
 
 
 def limpiar():
-    import os
     os.system('cls' if os.name == 'nt' else 'clear')
 
 
@@ -50,31 +59,9 @@ def menu_principal(usuario_actual):
     return input("\nSeleccione: ").strip()
 
 
-def main():
-    # === INICIALIZAR REPOSITORIOS ===
-    usuarios_repo = UsuariosRepo()
-    clientes_repo = ClientesRepo()
-    productos_repo = ProductosRepo()
-    extintores_repo = ExtintoresRepo()
-    tickets_repo = TicketsRepo()
-
-    # === INICIALIZAR SERVICIOS ===
-    usuarios_service = UsuariosService(usuarios_repo)
-    clientes_service = ClientesService(clientes_repo)
-    productos_service = ProductosService(productos_repo)
-    extintores_service = ExtintoresService(extintores_repo)
-    tickets_service = TicketsService(tickets_repo, clientes_repo, productos_repo, extintores_repo)
-
-    # === INICIALIZAR VISTAS ===
-    usuarios_vista = UsuariosVista(usuarios_service)
-    clientes_vista = ClientesVista(clientes_service)
-    productos_vista = ProductosVista(productos_service)
-    extintores_vista = ExtintoresVista(extintores_service)
-    tickets_vista = TicketsVista(tickets_service)
-
+def iniciar_sesion(usuarios_vista: UsuariosVista):
+    """Pantalla de inicio obligatoria: devuelve el usuario que entró, o None si eligió salir."""
     usuario_actual = None
-
-    # === PANTALLA DE INICIO (OBLIGATORIA) ===
     while not usuario_actual:
         opcion = pantalla_inicio()
 
@@ -84,7 +71,7 @@ def main():
             usuario_actual = usuarios_vista.crear_usuario()
         elif opcion == "0":
             print("\n¡Hasta luego!")
-            return  # Sale del programa
+            return None
         else:
             print("Opción inválida.")
         
@@ -92,89 +79,126 @@ def main():
             input("\nPresione Enter para continuar...")
         else:
             print(f"\n¡Bienvenido, {usuario_actual.nombre}!")
+    return usuario_actual
 
-    # === MENÚ PRINCIPAL (SOLO SI ESTÁ LOGUEADO) ===
-    while usuario_actual:
-        opcion = menu_principal(usuario_actual)
-
-        if opcion == "0":
-            print("\n¡Hasta luego!")
-            break
-
-        elif opcion == "6":  # Cerrar sesión
-            confirm = input("\n¿Cerrar sesión? (s/N): ").strip().lower()
-            if confirm == 's':
-                usuario_actual = usuarios_vista.cerrar_sesion(usuario_actual)
-                input("\nPresione Enter para volver al inicio...")
-            usuario_actual = pantalla_inicio()
-
-        elif opcion == "1":
-            while True:
-                op = usuarios_vista.mostrar_menu(usuario_actual)
-                if op == "0": break
-                if op == "1":
-                    usuario_actual = usuarios_vista.actualizar_datos(usuario_actual)
-                elif op == "2":
-                    usuario_actual = usuarios_vista.cambiar_contrasena(usuario_actual)
-                elif op == "3":
-                    usuario_actual = usuarios_vista.eliminar_cuenta(usuario_actual)
-                    if not usuario_actual:
-                        print("Cuenta eliminada. Volviendo al inicio...")
-                        input("\nEnter...")
-                        break
-                input("\nEnter para continuar...")
 
-        elif opcion == "2":
-            while True:
-                op = clientes_vista.mostrar_menu()
-                if op == "0": break
-                if op == "1": clientes_vista.crear_cliente()
-                elif op == "2": clientes_vista.listar_todos()
-                elif op == "3": clientes_vista.buscar_por_nombre()
-                elif op == "4": clientes_vista.clientes_por_vencimiento()
-                elif op == "5": clientes_vista.actualizar_cliente()
-                elif op == "6": clientes_vista.eliminar_cliente()
-                input("\nEnter para continuar...")
+def main():
+    # === INICIALIZAR REPOSITORIOS ===
+    usuarios_repo, clientes_repo, productos_repo, extintores_repo, tickets_repo = \
+        crear_repositorios(MOTOR_ALMACENAMIENTO, FORMATO_ARCHIVOS)
 
-        elif opcion == "3":
-            while True:
-                op = productos_vista.mostrar_menu()
-                if op == "0": break
-                if op == "1": productos_vista.crear_producto()
-                elif op == "2": productos_vista.listar_todos()
-                elif op == "3": productos_vista.buscar_por_nombre()
-                elif op == "4": productos_vista.buscar_por_precio()
-                elif op == "5": productos_vista.actualizar_producto()
-                elif op == "6": productos_vista.eliminar_producto()
-                input("\nEnter para continuar...")
+    # === INICIALIZAR SERVICIOS ===
+    usuarios_service = UsuariosService(usuarios_repo, ContrasenasService(COSTO_BCRYPT))
+    tickets_service = TicketsService(tickets_repo, clientes_repo, productos_repo, extintores_repo)
+    clientes_service = ClientesService(clientes_repo, tickets_service.relaciones)
+    productos_service = ProductosService(productos_repo, tickets_service.relaciones)
+    extintores_service = ExtintoresService(extintores_repo, tickets_service.relaciones)
+    importacion_service = ImportacionService(tickets_service)
+    sesiones_service = SesionesService(usuarios_service, CLAVE_SESION, TTL_SESION)
 
-        elif opcion == "4":
-            while True:
-                op = extintores_vista.mostrar_menu()
-                if op == "0": break
-                if op == "1": extintores_vista.crear_extintor()
-                elif op == "2": extintores_vista.listar_todos()
-                elif op == "3": extintores_vista.buscar_por_tipo()
-                elif op == "4": extintores_vista.buscar_por_capacidad()
-                elif op == "5": extintores_vista.actualizar_extintor()
-                elif op == "6": extintores_vista.eliminar_extintor()
-                input("\nEnter para continuar...")
+    # === INICIALIZAR VISTAS ===
+    usuarios_vista = UsuariosVista(usuarios_service, sesiones_service)
+    clientes_vista = ClientesVista(clientes_service)
+    productos_vista = ProductosVista(productos_service)
+    extintores_vista = ExtintoresVista(extintores_service)
+    tickets_vista = TicketsVista(tickets_service, importacion_service)
 
-        elif opcion == "5":
-            while True:
-                op = tickets_vista.mostrar_menu()
-                if op == "0": break
-                if op == "1": tickets_vista.crear_ticket()
-                elif op == "2": tickets_vista.listar_todos()
-                elif op == "3": tickets_vista.ver_por_cliente()
-                elif op == "4": tickets_vista.actualizar_ticket()
-                elif op == "5": tickets_vista.eliminar_ticket()
+    while True:
+        usuario_actual = iniciar_sesion(usuarios_vista)
+        if not usuario_actual:
+            return  # Eligió salir en la pantalla de inicio
+
+        # === MENÚ PRINCIPAL (SOLO SI ESTÁ LOGUEADO) ===
+        while True:
+            # Cada vuelta al menú revalida la sesión (firma y vencimiento del token);
+            # si ya no vale, se vuelve a la pantalla de inicio
+            usuario_actual = usuarios_vista.usuario_en_sesion()
+            if not usuario_actual:
+                break
+            opcion = menu_principal(usuario_actual)
+
+            if opcion == "0":
+                print("\n¡Hasta luego!")
+                return
+
+            elif opcion == "6":  # Cerrar sesión
+                confirm = input("\n¿Cerrar sesión? (s/N): ").strip().lower()
+                if confirm == 's':
+                    usuarios_vista.cerrar_sesion(usuario_actual)
+                    input("\nPresione Enter para volver al inicio...")
+                    break
+
+            elif opcion == "1":
+                while True:
+                    op = usuarios_vista.mostrar_menu(usuario_actual)
+                    if op == "0": break
+                    if op == "1":
+                        usuario_actual = usuarios_vista.actualizar_datos(usuario_actual)
+                    elif op == "2":
+                        usuario_actual = usuarios_vista.cambiar_contrasena(usuario_actual)
+                    elif op == "3":
+                        usuario_actual = usuarios_vista.eliminar_cuenta(usuario_actual)
+                        if not usuario_actual:
+                            print("Cuenta eliminada. Volviendo al inicio...")
+                            input("\nEnter...")
+                            break
+                    input("\nEnter para continuar...")
+
+            elif opcion == "2":
+                while True:
+                    op = clientes_vista.mostrar_menu()
+                    if op == "0": break
+                    if op == "1": clientes_vista.crear_cliente()
+                    elif op == "2": clientes_vista.listar_todos()
+                    elif op == "3": clientes_vista.buscar_por_nombre()
+                    elif op == "4": clientes_vista.clientes_por_vencimiento()
+                    elif op == "5": clientes_vista.actualizar_cliente()
+                    elif op == "6": clientes_vista.eliminar_cliente()
+                    elif op == "7": clientes_vista.plan_renovaciones()
+                    input("\nEnter para continuar...")
+
+            elif opcion == "3":
+                while True:
+                    op = productos_vista.mostrar_menu()
+                    if op == "0": break
+                    if op == "1": productos_vista.crear_producto()
+                    elif op == "2": productos_vista.listar_todos()
+                    elif op == "3": productos_vista.buscar_por_nombre()
+                    elif op == "4": productos_vista.buscar_por_precio()
+                    elif op == "5": productos_vista.actualizar_producto()
+                    elif op == "6": productos_vista.eliminar_producto()
+                    input("\nEnter para continuar...")
+
+            elif opcion == "4":
+                while True:
+                    op = extintores_vista.mostrar_menu()
+                    if op == "0": break
+                    if op == "1": extintores_vista.crear_extintor()
+                    elif op == "2": extintores_vista.listar_todos()
+                    elif op == "3": extintores_vista.buscar_por_tipo()
+                    elif op == "4": extintores_vista.buscar_por_capacidad()
+                    elif op == "5": extintores_vista.actualizar_extintor()
+                    elif op == "6": extintores_vista.eliminar_extintor()
+                    input("\nEnter para continuar...")
+
+            elif opcion == "5":
+                while True:
+                    op = tickets_vista.mostrar_menu()
+                    if op == "0": break
+                    if op == "1": tickets_vista.crear_ticket()
+                    elif op == "2": tickets_vista.listar_todos()
+                    elif op == "3": tickets_vista.ver_por_cliente()
+                    elif op == "4": tickets_vista.actualizar_ticket()
+                    elif op == "5": tickets_vista.eliminar_ticket()
+                    elif op == "6": tickets_vista.importar_tickets()
+                    elif op == "7": tickets_vista.ver_por_rango()
+                    elif op == "8": tickets_vista.reporte_ingresos()
+                    input("\nEnter para continuar...")
+
+            else:
+                print("Opción inválida.")
                 input("\nEnter para continuar...")
 
-        else:
-            print("Opción inválida.")
-            input("\nEnter para continuar...")
-
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,6 +3,9 @@ from models.productos import Producto
 from models.tickets import Ticket
 
 class Cliente:
+    __slots__ = ("codigo", "nombre_empresa", "nombre_encargado", "direccion", "celular",
+                    "mes_vencimiento", "productos", "tickets")
+
     def __init__(self, codigo: str, nombre_empresa: str, nombre_encargado: str, 
                     direccion: str, celular: str, mes_vencimiento: str,
                     productos: Optional[List[Producto]] = None,
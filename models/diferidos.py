@@ -0,0 +1,50 @@
+from typing import Callable, Generic, Iterator, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class ListaDiferida(Generic[T]):
+    """
+    Lista que se carga recién cuando se usa por primera vez.
+
+    Se comporta como una lista de solo lectura (len, iteración, índices,
+    comparación con listas); `cargar` se llama una sola vez, al primer
+    acceso, y el resultado queda guardado.
+    """
+
+    __slots__ = ("_cargar", "_items")
+
+    def __init__(self, cargar: Callable[[], List[T]]) -> None:
+        self._cargar = cargar
+        self._items: Optional[List[T]] = None
+
+    @property
+    def cargada(self) -> bool:
+        return self._items is not None
+
+    def _lista(self) -> List[T]:
+        if self._items is None:
+            self._items = list(self._cargar())
+        return self._items
+
+    def __len__(self) -> int:
+        return len(self._lista())
+
+    def __iter__(self) -> Iterator[T]:
+        return iter(self._lista())
+
+    def __getitem__(self, indice):
+        return self._lista()[indice]
+
+    def __bool__(self) -> bool:
+        return bool(self._lista())
+
+    def __eq__(self, otra) -> bool:
+        if isinstance(otra, ListaDiferida):
+            otra = otra._lista()
+        return self._lista() == otra
+
+    def __repr__(self) -> str:
+        if self._items is None:
+            return "ListaDiferida(<sin cargar>)"
+        return f"ListaDiferida({self._items!r})"
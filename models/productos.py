@@ -1,10 +1,14 @@
 class Producto:
+    __slots__ = ("codigo", "nombre", "precio")
+
     def __init__(self, codigo, nombre, precio):
         self.codigo = codigo
         self.nombre = nombre
         self.precio = precio
 
 class Extintor(Producto):
+    __slots__ = ("tipo", "capacidad")
+
     def __init__(self, codigo, nombre, precio, tipo, capacidad):
         super().__init__(codigo,nombre, precio)
         self.tipo = tipo
@@ -1,9 +1,72 @@
 from datetime import datetime
-from typing import List, Dict
+from sys import intern
+from typing import Dict, Iterator, List, Union
+
+
+class LineaTicket:
+    """
+    Ítem de un ticket: código, nombre y precio del producto o extintor, y
+    cantidad.
+
+    Se lee igual que el dict con que se guarda (`linea['precio']`,
+    `linea.get('nombre')`, `dict(linea)`), pero sin un dict por línea: con
+    el historial completo en memoria son millones de líneas. Los códigos y
+    nombres se internan, así que las líneas del mismo producto comparten
+    los textos.
+    """
+
+    __slots__ = ("codigo", "nombre", "precio", "cantidad")
+    CAMPOS = __slots__
+
+    def __init__(self, codigo: str, nombre: str, precio: int, cantidad: int) -> None:
+        self.codigo = intern(codigo) if type(codigo) is str else codigo
+        self.nombre = intern(nombre) if type(nombre) is str else nombre
+        self.precio = precio
+        self.cantidad = cantidad
+
+    @classmethod
+    def desde_dict(cls, datos: Union["LineaTicket", Dict]) -> "LineaTicket":
+        if isinstance(datos, LineaTicket):
+            return datos
+        return cls(datos.get('codigo'), datos.get('nombre'), datos.get('precio'), datos.get('cantidad'))
+
+    def __getitem__(self, campo: str):
+        if campo not in self.CAMPOS:
+            raise KeyError(campo)
+        return getattr(self, campo)
+
+    def get(self, campo: str, defecto=None):
+        return getattr(self, campo) if campo in self.CAMPOS else defecto
+
+    def __contains__(self, campo: str) -> bool:
+        return campo in self.CAMPOS
+
+    def keys(self):
+        return self.CAMPOS
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.CAMPOS)
+
+    def como_dict(self) -> Dict[str, Union[str, int]]:
+        return {"codigo": self.codigo, "nombre": self.nombre, "precio": self.precio, "cantidad": self.cantidad}
+
+    def __eq__(self, otra) -> bool:
+        if isinstance(otra, (LineaTicket, dict)):
+            return self.como_dict() == dict(otra)
+        return NotImplemented
+
+    __hash__ = None  # Mutable, como el dict al que reemplaza
+
+    def __repr__(self) -> str:
+        return (f"LineaTicket(codigo={self.codigo!r}, nombre={self.nombre!r}, "
+                f"precio={self.precio!r}, cantidad={self.cantidad!r})")
+
 
 class Ticket:
+    __slots__ = ("codigo_ticket", "servicio", "codigo_cliente", "cliente", "productos", "total", "fecha")
+
     def __init__(self, codigo_ticket: str, servicio: str, codigo_cliente: str,
-                    cliente: str, productos: List[Dict[str, str | int]], total: int,
+                    cliente: str, productos: List[Union[LineaTicket, Dict[str, str | int]]], total: int,
                     fecha: datetime):
         
         # Atributos
@@ -11,7 +74,6 @@ class Ticket:
         self.servicio = servicio
         self.codigo_cliente = codigo_cliente
         self.cliente = cliente
-        self.productos = productos  
+        self.productos: List[LineaTicket] = [LineaTicket.desde_dict(p) for p in productos]
         self.total = total
         self.fecha = fecha
-
@@ -1,4 +1,6 @@
 class Usuario:
+    __slots__ = ("nombre", "email", "contraseña")
+
     def __init__(self, nombre: str, email: str, contraseña: str):
 
         # Atributos
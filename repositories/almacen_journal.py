@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from repositories.almacen_json import AlmacenJson
+from repositories.bloqueo import obtener_bloqueo
+from repositories.escritura_atomica import anexar_sincronizado, escribir_temporal, reemplazar
+from repositories.formatos import Formato
+from config.exceptions import RepositoryError
+
+
+class AlmacenJournal(AlmacenJson):
+    """
+    Almacén de solo-anexado: cada mutación se agrega como una línea JSON al
+    diario (`<archivo>.journal`) en lugar de reescribir el archivo completo.
+
+    El archivo principal conserva el formato configurado del almacén y
+    actúa como instantánea. Cuando el diario acumula `umbral_compactacion`
+    operaciones, un hilo en segundo plano vuelca el estado en una nueva
+    instantánea y descarta el diario. Al cargar se lee la instantánea y se
+    reaplican las operaciones del diario encima.
+    """
+
+    umbral_compactacion = 1000
+
+    def __init__(self, archivo: str, clave: str,
+                    indices: Optional[Dict[str, Callable[[dict], str]]] = None,
+                    formato: Optional[Formato] = None,
+                    indices_multiples: Optional[Dict[str, Callable[[dict], str]]] = None) -> None:
+        super().__init__(archivo, clave, indices, formato, indices_multiples)
+        self.diario = archivo + ".journal"
+        # Diario congelado mientras una compactación escribe la instantánea
+        self.diario_rotado = archivo + ".journal.1"
+        self._operaciones_pendientes = 0
+        self._compactando = False
+        # Una compactación a la vez entre procesos, sin frenar a los escritores
+        self._bloqueo_compactacion = obtener_bloqueo(archivo + ".compactacion")
+
+    def _firma_actual(self):  # type: ignore[override]
+        firmas = []
+        for ruta in (self.archivo, self.diario_rotado, self.diario):
+            try:
+                st = os.stat(ruta)
+                firmas.append((st.st_mtime_ns, st.st_size, st.st_ino))
+            except FileNotFoundError:
+                firmas.append(None)
+        return tuple(firmas)
+
+    def _cargar_desde_disco(self) -> List[dict]:
+        registros = {r.get(self.clave): r for r in super()._cargar_desde_disco()}
+        self._operaciones_pendientes = 0
+        for ruta in (self.diario_rotado, self.diario):
+            for operacion in self._leer_diario(ruta):
+                self._aplicar(registros, operacion)
+                self._operaciones_pendientes += 1
+        return list(registros.values())
+
+    def _iterar_desde_disco(self) -> Iterator[dict]:
+        # El diario está acotado por el umbral de compactación: se resume
+        # en memoria (clave → registro vigente o None si se eliminó) y la
+        # instantánea se recorre en streaming aplicando esos cambios.
+        cambios: Dict[str, Optional[dict]] = {}
+        for ruta in (self.diario_rotado, self.diario):
+            for operacion in self._leer_diario(ruta):
+                clave = operacion.get('clave')
+                registro = operacion.get('registro')
+                if operacion.get('op') == 'eliminar':
+                    cambios[clave] = None
+                elif operacion.get('op') == 'actualizar' and registro.get(self.clave) != clave:
+                    cambios[clave] = None
+                    cambios[registro.get(self.clave)] = registro
+                else:
+                    cambios[clave] = registro
+
+        for registro in super()._iterar_desde_disco():
+            clave = registro.get(self.clave)
+            if clave in cambios:
+                registro = cambios.pop(clave)
+                if registro is None:
+                    continue
+            yield registro
+
+        # Registros que solo existen en el diario
+        for registro in cambios.values():
+            if registro is not None:
+                yield registro
+
+    def _leer_diario(self, ruta: str):
+        try:
+            with open(ruta, 'r', encoding='utf-8') as f:
+                # Solo la última línea puede quedar incompleta por un corte a
+                # mitad de escritura; una ilegible con otras después es daño
+                # del archivo, y saltarla reaplicaría lo posterior sin ella.
+                ilegible: Optional[int] = None
+                for numero, linea in enumerate(f, start=1):
+                    if not linea.strip():
+                        continue
+                    if ilegible is not None:
+                        raise RepositoryError(
+                            f"El diario '{ruta}' está dañado (línea {ilegible}) y no se puede leer."
+                        )
+                    try:
+                        yield json.loads(linea)
+                    except json.JSONDecodeError:
+                        ilegible = numero
+        except FileNotFoundError:
+            return
+
+    def _aplicar(self, registros: Dict[str, dict], operacion: dict) -> None:
+        # Las operaciones son idempotentes: reaplicar un diario que ya está
+        # reflejado en la instantánea deja el mismo estado.
+        tipo = operacion.get('op')
+        clave = operacion.get('clave')
+        if tipo == 'insertar':
+            registros[clave] = operacion['registro']
+        elif tipo == 'actualizar':
+            registro = operacion['registro']
+            if registro.get(self.clave) != clave:
+                registros.pop(clave, None)
+            registros[registro.get(self.clave)] = registro
+        elif tipo == 'eliminar':
+            registros.pop(clave, None)
+
+    def _registrar_lote(self, operaciones: List[Tuple[str, str, Optional[dict]]]) -> None:
+        lineas = "".join(
+            json.dumps({'op': op, 'clave': clave, 'registro': registro}, ensure_ascii=False) + "\n"
+            for op, clave, registro in operaciones
+        )
+        try:
+            anexar_sincronizado(self.diario, lineas.encode('utf-8'))
+        except Exception:
+            self.invalidar()
+            raise
+        self._firma = self._firma_actual()
+        self._operaciones_pendientes += len(operaciones)
+
+        if self._operaciones_pendientes >= self.umbral_compactacion and not self._compactando:
+            self._compactando = True
+            threading.Thread(target=self._compactar_en_segundo_plano, daemon=True).start()
+
+    def _compactar_en_segundo_plano(self) -> None:
+        try:
+            self.compactar()
+        finally:
+            self._compactando = False
+
+    def compactar(self) -> None:
+        """
+        Escribe una instantánea con el estado actual y descarta el diario.
+        Las inserciones que lleguen mientras tanto van a un diario nuevo.
+        """
+        with self._bloqueo_compactacion.exclusivo():
+            self._compactar()
+
+    def _compactar(self) -> None:
+        with self._lock, self._bloqueo.exclusivo():
+            registros = list(self._asegurar_cargado().values())
+            if os.path.exists(self.diario):
+                if os.path.exists(self.diario_rotado):
+                    # Quedó un diario rotado de una compactación interrumpida:
+                    # se le agrega el actual para no perder operaciones.
+                    with open(self.diario, 'r', encoding='utf-8') as origen, \
+                            open(self.diario_rotado, 'a', encoding='utf-8') as destino:
+                        destino.write(origen.read())
+                    os.remove(self.diario)
+                else:
+                    os.replace(self.diario, self.diario_rotado)
+            self._operaciones_pendientes = 0
+            self._firma = self._firma_actual()
+
+        # La reescritura completa (y su fsync) ocurre fuera del candado
+        temporal = escribir_temporal(self.archivo, self.formato.serializar(registros))
+
+        with self._lock, self._bloqueo.exclusivo():
+            reemplazar(temporal, self.archivo)
+            if os.path.exists(self.diario_rotado):
+                os.remove(self.diario_rotado)
+            self._firma = self._firma_actual()
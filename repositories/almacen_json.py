@@ -0,0 +1,411 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Type
+
+from config.exceptions import RepositoryError
+from repositories.bloqueo import obtener_bloqueo
+from repositories.formatos import FORMATOS, Formato
+from repositories.observadores import Observable, Observador
+
+
+class AlmacenJson:
+    """
+    Caché en memoria de un archivo de datos con escritura directa (write-through).
+    El archivo se lee y escribe con un formato de repositories/formatos.py
+    (por defecto, la lista JSON indentada de siempre).
+
+    La colección decodificada se mantiene residente y solo se vuelve a leer
+    del disco cuando cambia la firma del archivo (mtime, tamaño o inodo),
+    por ejemplo si otro proceso lo modificó.
+
+    Los registros se guardan en un diccionario por clave primaria (que
+    conserva el orden del archivo) y, opcionalmente, en índices secundarios
+    definidos como funciones registro → valor: únicos (`indices`, valor →
+    registro) o múltiples (`indices_multiples`, valor → registros en el
+    orden del archivo). Los índices se construyen en la misma pasada que
+    carga el archivo y se mantienen en cada inserción, actualización y
+    eliminación.
+
+    Cada cambio se notifica a los observadores suscritos, que pueden
+    mantener sus propias estructuras derivadas de forma incremental.
+
+    Las escrituras son atómicas (ver repositories/escritura_atomica.py) y,
+    dentro de `agrupar()`, varias mutaciones se llevan a disco juntas.
+
+    Entre procesos, cada mutación toma el bloqueo exclusivo del archivo
+    (repositories/bloqueo.py) y recarga los datos si otro proceso los
+    cambió antes de aplicarse, así no se pierden actualizaciones. Las
+    recargas toman el bloqueo compartido.
+    """
+
+    def __init__(self, archivo: str, clave: str,
+                    indices: Optional[Dict[str, Callable[[dict], str]]] = None,
+                    formato: Optional[Formato] = None,
+                    indices_multiples: Optional[Dict[str, Callable[[dict], str]]] = None) -> None:
+        self.archivo = archivo
+        self.clave = clave
+        self.formato = formato or FORMATOS["json"]
+        self._funciones_indice = dict(indices or {})
+        self._funciones_multiples = dict(indices_multiples or {})
+        self._registros: Optional[Dict[str, dict]] = None
+        self._indices: Dict[str, Dict[str, dict]] = {}
+        # nombre → valor → {clave primaria: registro}; el dict interno conserva el orden
+        self._multiples: Dict[str, Dict[str, Dict[str, dict]]] = {}
+        self._firma: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.RLock()
+        self._bloqueo = obtener_bloqueo(archivo)
+        self._cambios = Observable()
+        self._nivel_grupo = 0
+        self._operaciones_agrupadas: List[Tuple[str, str, Optional[dict]]] = []
+
+    def _firma_actual(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            st = os.stat(self.archivo)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _cargar_desde_disco(self) -> List[dict]:
+        try:
+            return self.formato.leer(self.archivo)
+        except FileNotFoundError:
+            return []
+        except ValueError as e:
+            raise self._archivo_danado() from e
+
+    def _archivo_danado(self) -> RepositoryError:
+        # Con escrituras atómicas, un archivo ilegible no es un corte a mitad
+        # de escritura: se avisa en lugar de tratarlo como vacío y pisarlo.
+        return RepositoryError(f"El archivo '{self.archivo}' está dañado y no se puede leer.")
+
+    def _clave_repetida(self, valor_clave: str) -> RepositoryError:
+        # Insertar no reemplaza: pisar un registro existente perdería datos en silencio
+        return RepositoryError(f"Ya existe un registro con {self.clave} '{valor_clave}' en '{self.archivo}'.")
+
+    def _reconstruir(self, lista: List[dict]) -> None:
+        self._registros = {}
+        self._indices = {nombre: {} for nombre in self._funciones_indice}
+        self._multiples = {nombre: {} for nombre in self._funciones_multiples}
+        for registro in lista:
+            self._registros[registro.get(self.clave)] = registro
+            self._indexar(registro)
+
+    def _indexar(self, registro: dict) -> None:
+        for nombre, funcion in self._funciones_indice.items():
+            self._indices[nombre][funcion(registro)] = registro
+        for nombre, funcion in self._funciones_multiples.items():
+            self._multiples[nombre].setdefault(funcion(registro), {})[registro.get(self.clave)] = registro
+
+    def _desindexar(self, registro: dict) -> None:
+        for nombre, funcion in self._funciones_indice.items():
+            valor = funcion(registro)
+            if self._indices[nombre].get(valor) is registro:
+                del self._indices[nombre][valor]
+        for nombre, funcion in self._funciones_multiples.items():
+            valor = funcion(registro)
+            grupo = self._multiples[nombre].get(valor)
+            if grupo is not None and grupo.get(registro.get(self.clave)) is registro:
+                del grupo[registro.get(self.clave)]
+                if not grupo:
+                    del self._multiples[nombre][valor]
+
+    def _reindexar(self, anterior: dict, registro: dict) -> None:
+        for nombre, funcion in self._funciones_indice.items():
+            valor = funcion(anterior)
+            if self._indices[nombre].get(valor) is anterior:
+                del self._indices[nombre][valor]
+            self._indices[nombre][funcion(registro)] = registro
+        clave_anterior, clave_nueva = anterior.get(self.clave), registro.get(self.clave)
+        for nombre, funcion in self._funciones_multiples.items():
+            valor_anterior, valor_nuevo = funcion(anterior), funcion(registro)
+            if valor_anterior == valor_nuevo and clave_anterior == clave_nueva:
+                # Mismo grupo: se reemplaza en su lugar para conservar el orden
+                self._multiples[nombre][valor_nuevo][clave_nueva] = registro
+                continue
+            grupo = self._multiples[nombre].get(valor_anterior)
+            if grupo is not None:
+                grupo.pop(clave_anterior, None)
+                if not grupo:
+                    del self._multiples[nombre][valor_anterior]
+            self._multiples[nombre].setdefault(valor_nuevo, {})[clave_nueva] = registro
+
+    def _asegurar_cargado(self) -> Dict[str, dict]:
+        # La firma se toma antes de leer: si el archivo cambia durante
+        # la carga, la siguiente llamada detectará la diferencia.
+        if self._registros is not None and self._operaciones_agrupadas:
+            # Hay cambios agrupados aún no escritos: recargar los perdería
+            return self._registros
+        firma = self._firma_actual()
+        if self._registros is None or firma != self._firma:
+            with self._bloqueo.compartido():
+                firma = self._firma_actual()
+                self._reconstruir(self._cargar_desde_disco())
+                self._firma = firma
+            self._cambios.notificar('recargar')
+        return self._registros  # type: ignore
+
+    def _persistir(self) -> None:
+        try:
+            self.formato.escribir(self.archivo, self._registros.values())  # type: ignore
+        except Exception:
+            # Si la escritura falla, la caché ya no es confiable
+            self.invalidar()
+            raise
+        self._firma = self._firma_actual()
+
+    def _registrar(self, operacion: str, valor_clave: str, registro: Optional[dict]) -> None:
+        """Lleva a disco una mutación ya aplicada en memoria."""
+        self._llevar_a_disco([(operacion, valor_clave, registro)])
+
+    def _llevar_a_disco(self, operaciones: List[Tuple[str, str, Optional[dict]]]) -> None:
+        if self._nivel_grupo:
+            self._operaciones_agrupadas.extend(operaciones)
+        else:
+            self._registrar_lote(operaciones)
+
+    def _registrar_lote(self, operaciones: List[Tuple[str, str, Optional[dict]]]) -> None:
+        """
+        Lleva a disco varias mutaciones ya aplicadas en memoria.
+        Este almacén reescribe el archivo completo una sola vez; otros
+        motores pueden registrar solo las operaciones.
+        """
+        self._persistir()
+
+    @contextmanager
+    def agrupar(self) -> Iterator[None]:
+        """
+        Agrupa las mutaciones del bloque `with` en una sola escritura a disco
+        al salir (commit agrupado). Mientras dura, el almacén queda tomado por
+        el hilo que agrupa y el archivo, bloqueado para los demás procesos.
+        Si el bloque falla, lo ya aplicado igual se escribe: la memoria y el
+        disco no deben divergir.
+        """
+        with self._lock, self._bloqueo.exclusivo():
+            self._nivel_grupo += 1
+            try:
+                yield
+            finally:
+                self._nivel_grupo -= 1
+                if self._nivel_grupo == 0 and self._operaciones_agrupadas:
+                    operaciones, self._operaciones_agrupadas = self._operaciones_agrupadas, []
+                    self._registrar_lote(operaciones)
+
+    def suscribir(self, observador: Observador) -> None:
+        """Registra un observador de cambios (ver repositories/observadores.py)."""
+        self._cambios.suscribir(observador)
+
+    def agregar_indices(self, indices: Optional[Dict[str, Callable[[dict], str]]] = None,
+                        indices_multiples: Optional[Dict[str, Callable[[dict], str]]] = None) -> None:
+        """
+        Suma índices a un almacén ya creado (otro repositorio sobre el mismo
+        archivo puede declarar los suyos). Los nombres ya definidos se
+        conservan; si la caché está cargada, los nuevos se construyen ya.
+        """
+        with self._lock:
+            nuevos = {n: f for n, f in (indices or {}).items() if n not in self._funciones_indice}
+            nuevos_multiples = {
+                n: f for n, f in (indices_multiples or {}).items() if n not in self._funciones_multiples
+            }
+            self._funciones_indice.update(nuevos)
+            self._funciones_multiples.update(nuevos_multiples)
+            if self._registros is None:
+                return  # Se construirán con la primera carga
+            for nombre, funcion in nuevos.items():
+                self._indices[nombre] = {funcion(r): r for r in self._registros.values()}
+            for nombre, funcion in nuevos_multiples.items():
+                grupos: Dict[str, Dict[str, dict]] = {}
+                for registro in self._registros.values():
+                    grupos.setdefault(funcion(registro), {})[registro.get(self.clave)] = registro
+                self._multiples[nombre] = grupos
+
+    @property
+    def cargado(self) -> bool:
+        """Indica si los registros están en la caché (aunque el archivo haya cambiado después)."""
+        return self._registros is not None
+
+    def firma(self):
+        """Firma del archivo en disco (None si no existe), sin leerlo."""
+        return self._firma_actual()
+
+    def verificar(self) -> None:
+        """Recarga desde disco si el archivo cambió, avisando a los observadores."""
+        with self._lock:
+            self._asegurar_cargado()
+
+    def leer(self) -> List[dict]:
+        """
+        Devuelve la lista de registros en memoria, en el orden del archivo.
+        Si el archivo cambió desde la última lectura, la recarga.
+        """
+        with self._lock:
+            return list(self._asegurar_cargado().values())
+
+    def iterar(self) -> Iterator[dict]:
+        """
+        Recorre los registros en el orden del archivo sin armar una lista.
+        Si la caché está cargada y vigente, la recorre; si no, lee el archivo
+        en streaming sin poblar la caché, con memoria acotada.
+        """
+        with self._lock:
+            if self._registros is not None and self._firma_actual() == self._firma:
+                # Instantánea de referencias: las mutaciones concurrentes no afectan el recorrido
+                vigentes: Optional[Tuple[dict, ...]] = tuple(self._registros.values())
+            else:
+                vigentes = None
+        if vigentes is not None:
+            yield from vigentes
+        else:
+            yield from self._iterar_desde_disco()
+
+    def _iterar_desde_disco(self) -> Iterator[dict]:
+        try:
+            yield from self.formato.iterar(self.archivo)
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            raise self._archivo_danado() from e
+
+    def buscar(self, valor_clave: str) -> Optional[dict]:
+        """Busca un registro por clave primaria en tiempo constante."""
+        with self._lock:
+            return self._asegurar_cargado().get(valor_clave)
+
+    def buscar_varios(self, valores_clave: Iterable[str]) -> Dict[str, dict]:
+        """
+        Busca varios registros por clave primaria con una sola verificación
+        de la caché. Las claves inexistentes se omiten del resultado.
+        """
+        with self._lock:
+            registros = self._asegurar_cargado()
+            encontrados = {}
+            for valor in valores_clave:
+                registro = registros.get(valor)
+                if registro is not None:
+                    encontrados[valor] = registro
+            return encontrados
+
+    def buscar_por(self, indice: str, valor: str) -> Optional[dict]:
+        """Busca un registro por un índice secundario en tiempo constante."""
+        with self._lock:
+            self._asegurar_cargado()
+            return self._indices[indice].get(valor)
+
+    def buscar_todos_por(self, indice: str, valor: str) -> List[dict]:
+        """
+        Devuelve los registros con ese valor en un índice múltiple, en el
+        orden del archivo (un registro que cambia de valor pasa al final de
+        su nuevo grupo hasta la próxima recarga). El costo depende de
+        cuántos hay, no del total.
+        """
+        with self._lock:
+            self._asegurar_cargado()
+            return list(self._multiples[indice].get(valor, {}).values())
+
+    def insertar(self, registro: dict) -> None:
+        """Agrega un registro nuevo y lo guarda en disco."""
+        with self._lock, self._bloqueo.exclusivo():
+            registros = self._asegurar_cargado()
+            if registro[self.clave] in registros:
+                raise self._clave_repetida(registro[self.clave])
+            registros[registro[self.clave]] = registro
+            self._indexar(registro)
+            self._registrar('insertar', registro[self.clave], registro)
+            self._cambios.notificar('insertar', None, registro)
+
+    def insertar_varios(self, nuevos: List[dict]) -> None:
+        """Agrega varios registros y los guarda en disco con una sola escritura."""
+        if not nuevos:
+            return
+        with self._lock, self._bloqueo.exclusivo():
+            registros = self._asegurar_cargado()
+            # Se controla todo el lote antes de tocar la caché
+            vistas = set()
+            for registro in nuevos:
+                valor_clave = registro[self.clave]
+                if valor_clave in registros or valor_clave in vistas:
+                    raise self._clave_repetida(valor_clave)
+                vistas.add(valor_clave)
+            for registro in nuevos:
+                registros[registro[self.clave]] = registro
+                self._indexar(registro)
+            self._llevar_a_disco([('insertar', r[self.clave], r) for r in nuevos])
+            for registro in nuevos:
+                self._cambios.notificar('insertar', None, registro)
+
+    def actualizar(self, valor_clave: str, registro: dict) -> bool:
+        """
+        Reemplaza el registro con esa clave, conservando su posición.
+        Devuelve False si no existe.
+        """
+        with self._lock, self._bloqueo.exclusivo():
+            registros = self._asegurar_cargado()
+            anterior = registros.get(valor_clave)
+            if anterior is None:
+                return False
+            if registro[self.clave] != valor_clave:
+                # Cambio de clave: se reconstruye el orden sin perder la posición
+                self._registros = {
+                    (registro[self.clave] if k == valor_clave else k): (registro if k == valor_clave else r)
+                    for k, r in registros.items()
+                }
+            else:
+                registros[valor_clave] = registro
+            self._reindexar(anterior, registro)
+            self._registrar('actualizar', valor_clave, registro)
+            self._cambios.notificar('actualizar', anterior, registro)
+            return True
+
+    def eliminar(self, valor_clave: str) -> Optional[dict]:
+        """Elimina el registro con esa clave. Devuelve el registro eliminado o None."""
+        with self._lock, self._bloqueo.exclusivo():
+            registros = self._asegurar_cargado()
+            anterior = registros.pop(valor_clave, None)
+            if anterior is None:
+                return None
+            self._desindexar(anterior)
+            self._registrar('eliminar', valor_clave, None)
+            self._cambios.notificar('eliminar', anterior, None)
+            return anterior
+
+    def invalidar(self) -> None:
+        """Descarta la caché; la próxima lectura irá al disco."""
+        with self._lock:
+            self._registros = None
+            self._indices = {}
+            self._multiples = {}
+            self._operaciones_agrupadas = []
+            self._firma = None
+
+
+_almacenes: Dict[str, AlmacenJson] = {}
+_registro_lock = threading.Lock()
+
+
+def obtener_almacen(archivo: str, clave: str,
+                    indices: Optional[Dict[str, Callable[[dict], str]]] = None,
+                    tipo: Type[AlmacenJson] = AlmacenJson,
+                    formato: Optional[Formato] = None,
+                    indices_multiples: Optional[Dict[str, Callable[[dict], str]]] = None) -> AlmacenJson:
+    """
+    Devuelve el almacén compartido para un archivo.
+    Todos los repositorios que apunten al mismo archivo usan la misma caché.
+    Si el archivo ya estaba abierto, sus índices se suman a los del almacén
+    existente; con otro tipo de almacén, otra clave u otro formato, lanza
+    ValueError en lugar de devolver uno que no se comporta como se pidió.
+    """
+    ruta = os.path.abspath(archivo)
+    with _registro_lock:
+        almacen = _almacenes.get(ruta)
+        if almacen is None:
+            almacen = tipo(archivo, clave, indices, formato, indices_multiples)
+            _almacenes[ruta] = almacen
+            return almacen
+        formato = formato or FORMATOS["json"]
+        if type(almacen) is not tipo or almacen.clave != clave or almacen.formato is not formato:
+            raise ValueError(
+                f"El archivo '{archivo}' ya está abierto con otro tipo de almacén, clave o formato "
+                f"({type(almacen).__name__}, clave '{almacen.clave}')."
+            )
+        almacen.agregar_indices(indices, indices_multiples)
+        return almacen
@@ -0,0 +1,323 @@
+import os
+import re
+import threading
+from contextlib import ExitStack, contextmanager
+from functools import partial
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Type
+
+from repositories.almacen_json import AlmacenJson, obtener_almacen
+from repositories.bloqueo import obtener_bloqueo
+from repositories.formatos import FORMATOS, Formato
+from repositories.observadores import Observador
+from config.exceptions import RepositoryError
+
+# Nombre de archivo de una partición, sin extensión: AAAA-MM
+PATRON_MES = re.compile(r"^\d{4}-\d{2}$")
+
+
+class AlmacenParticionado:
+    """
+    Colección repartida en un archivo por mes dentro de un directorio
+    (data/tickets/2026-10.json, data/tickets/2026-11.json, ...). El mes de
+    cada registro son los primeros siete caracteres de un campo de fecha en
+    formato ISO. Cada partición es un AlmacenJson con su propia caché,
+    índices, bloqueo y escritura atómica, así que un cambio reescribe solo
+    el archivo de su mes.
+
+    Las consultas por rango de fechas abren solo las particiones del rango.
+    La búsqueda por clave usa un mapa clave → mes, armado con una pasada
+    al primer uso y mantenido con los cambios de cada partición, así abre
+    una sola. Las demás (por índice, recorrido completo) pasan por todas.
+
+    Las mutaciones toman además el bloqueo exclusivo del directorio: quien
+    agrupa cambios en varias particiones las bloquea siempre después de
+    este, y dos procesos no pueden cruzarse tomándolas en distinto orden.
+    """
+
+    def __init__(self, directorio: str, clave: str, campo_fecha: str,
+                    formato: Optional[Formato] = None,
+                    indices_multiples: Optional[Dict[str, Callable[[dict], str]]] = None,
+                    tipo: Type[AlmacenJson] = AlmacenJson) -> None:
+        self.directorio = directorio
+        self.clave = clave
+        self.campo_fecha = campo_fecha
+        self.formato = formato or FORMATOS["json"]
+        self.tipo = tipo
+        self._funciones_multiples = dict(indices_multiples or {})
+        self._particiones: Dict[str, AlmacenJson] = {}
+        self._observadores: List[Observador] = []
+        self._lock = threading.RLock()
+        self._bloqueo = obtener_bloqueo(directorio)
+        self._grupo: Optional[ExitStack] = None
+        self._agrupadas: Set[str] = set()
+        # mes → firma de su archivo en la última verificación, de las particiones sin cargar
+        self._firmas: Optional[Dict[str, object]] = None
+        # Ubicación de cada clave: clave → mes y, para recargar un mes, mes → claves
+        self._meses_por_clave: Optional[Dict[str, str]] = None
+        self._claves_por_mes: Dict[str, Set[str]] = {}
+
+    def mes_de(self, registro: dict) -> str:
+        """Partición a la que pertenece un registro (AAAA-MM)."""
+        return registro[self.campo_fecha][:7]
+
+    def _meses_en_disco(self) -> Set[str]:
+        try:
+            nombres = os.listdir(self.directorio)
+        except FileNotFoundError:
+            nombres = []
+        meses = set()
+        for nombre in nombres:
+            base, extension = os.path.splitext(nombre)
+            if extension == self.formato.extension and PATRON_MES.match(base):
+                meses.add(base)
+        return meses
+
+    def meses(self) -> List[str]:
+        """Meses con partición, en orden cronológico."""
+        meses = self._meses_en_disco()
+        with self._lock:
+            # Particiones creadas en memoria que aún no llegaron a disco (commit agrupado)
+            meses.update(self._particiones)
+        return sorted(meses)
+
+    def _particion(self, mes: str) -> AlmacenJson:
+        with self._lock:
+            almacen = self._particiones.get(mes)
+            if almacen is None:
+                ruta = os.path.join(self.directorio, mes + self.formato.extension)
+                almacen = obtener_almacen(
+                    ruta, self.clave, tipo=self.tipo, formato=self.formato,
+                    indices_multiples=self._funciones_multiples
+                )
+                almacen.suscribir(partial(self._al_cambiar, mes))
+                for observador in self._observadores:
+                    almacen.suscribir(observador)
+                self._particiones[mes] = almacen
+            return almacen
+
+    def _para_escribir(self, mes: str) -> AlmacenJson:
+        """Partición a modificar; dentro de agrupar(), entra al grupo la primera vez."""
+        almacen = self._particion(mes)
+        if self._grupo is not None and mes not in self._agrupadas:
+            self._grupo.enter_context(almacen.agrupar())
+            self._agrupadas.add(mes)
+        return almacen
+
+    def _al_cambiar(self, mes: str, evento: str, anterior: Optional[dict], nuevo: Optional[dict]) -> None:
+        """Mantiene el mapa clave → mes con los cambios de la partición `mes`."""
+        if self._meses_por_clave is None:
+            return  # Aún no se construyó; se armará completo al usarse
+        if evento == 'recargar':
+            # La partición se (re)cargó desde disco: se reemplazan solo sus claves
+            self._olvidar_mes(mes)
+            self._recordar_mes(mes, (r.get(self.clave) for r in self._particiones[mes].iterar()))
+            return
+        if anterior is not None:
+            self._olvidar(anterior.get(self.clave), mes)
+        if nuevo is not None:
+            self._recordar(nuevo.get(self.clave), mes)
+
+    def _recordar(self, valor_clave: str, mes: str) -> None:
+        self._meses_por_clave[valor_clave] = mes  # type: ignore[index]
+        self._claves_por_mes.setdefault(mes, set()).add(valor_clave)
+
+    def _recordar_mes(self, mes: str, claves: Iterable[str]) -> None:
+        for valor_clave in claves:
+            self._recordar(valor_clave, mes)
+
+    def _olvidar(self, valor_clave: str, mes: str) -> None:
+        if self._meses_por_clave.get(valor_clave) == mes:  # type: ignore[union-attr]
+            del self._meses_por_clave[valor_clave]  # type: ignore[union-attr]
+        self._claves_por_mes.get(mes, set()).discard(valor_clave)
+
+    def _olvidar_mes(self, mes: str) -> None:
+        for valor_clave in self._claves_por_mes.pop(mes, ()):
+            if self._meses_por_clave.get(valor_clave) == mes:  # type: ignore[union-attr]
+                del self._meses_por_clave[valor_clave]  # type: ignore[union-attr]
+
+    def _mapa_claves(self) -> Dict[str, str]:
+        """Mapa clave → mes; la primera vez recorre las particiones sin cargarlas en caché."""
+        with self._lock:
+            if self._meses_por_clave is None:
+                # Deja las firmas de referencia: lo que cambie después lo detecta verificar()
+                self.verificar()
+                self._meses_por_clave, self._claves_por_mes = {}, {}
+                for mes in self.meses():
+                    self._recordar_mes(mes, (r.get(self.clave) for r in self._particion(mes).iterar()))
+            return self._meses_por_clave
+
+    def _olvidar_mapa(self) -> None:
+        with self._lock:
+            self._meses_por_clave, self._claves_por_mes = None, {}
+
+    def _ubicar(self, valor_clave: str) -> Tuple[Optional[str], Optional[dict]]:
+        """Devuelve (mes, registro) de una clave, abriendo solo la partición de su mes."""
+        for intento in range(2):
+            mes = self._mapa_claves().get(valor_clave)
+            if mes is not None:
+                registro = self._particion(mes).buscar(valor_clave)
+                if registro is not None:
+                    return mes, registro
+            if intento == 0:
+                # Puede que otro proceso la haya agregado o movido: se revisa
+                # el directorio (sin leer particiones) y se vuelve a buscar
+                self.verificar()
+        return None, None
+
+    @contextmanager
+    def agrupar(self) -> Iterator[None]:
+        """
+        Agrupa las mutaciones del bloque `with`: cada partición tocada se
+        escribe una sola vez al salir. Es reentrante.
+        """
+        with self._lock, self._bloqueo.exclusivo():
+            if self._grupo is not None:
+                yield
+                return
+            with ExitStack() as pila:
+                self._grupo = pila
+                try:
+                    yield
+                finally:
+                    self._grupo = None
+                    self._agrupadas = set()
+
+    def suscribir(self, observador: Observador) -> None:
+        """Registra un observador en todas las particiones, actuales y futuras."""
+        with self._lock:
+            self._observadores.append(observador)
+            for almacen in self._particiones.values():
+                almacen.suscribir(observador)
+
+    def verificar(self) -> None:
+        """
+        Detecta cambios hechos por otros procesos sin leer el historial. Las
+        particiones ya cargadas comparan la firma de su archivo y se recargan
+        si cambió. Del resto solo se listan y se comparan las firmas de los
+        archivos: si alguno cambió, apareció o desapareció, los observadores
+        reciben "recargar" y ninguna partición se abre.
+        """
+        with self._lock:
+            cargadas = [mes for mes, almacen in self._particiones.items() if almacen.cargado]
+            for mes in cargadas:
+                self._particiones[mes].verificar()
+            firmas = {
+                mes: self._particion(mes).firma()
+                for mes in self._meses_en_disco() if mes not in cargadas
+            }
+            anteriores, self._firmas = self._firmas, firmas
+            if anteriores is None:
+                return  # Primera verificación: queda como referencia
+            anteriores = {mes: firma for mes, firma in anteriores.items() if mes not in cargadas}
+            if anteriores != firmas:
+                self._olvidar_mapa()
+                for observador in list(self._observadores):
+                    observador('recargar', None, None)
+
+    def leer(self) -> List[dict]:
+        """Devuelve todos los registros, mes por mes."""
+        return [registro for mes in self.meses() for registro in self._particion(mes).leer()]
+
+    def iterar(self) -> Iterator[dict]:
+        """Recorre todos los registros mes por mes, sin armar una lista."""
+        for mes in self.meses():
+            yield from self._particion(mes).iterar()
+
+    def iterar_rango(self, desde: str, hasta: str) -> Iterator[dict]:
+        """
+        Recorre los registros cuyo campo de fecha está entre `desde` y
+        `hasta` (texto ISO, ambos incluidos), abriendo solo las particiones
+        del rango. Las fechas se comparan como texto, sin convertirlas, y
+        solo en el primer y el último mes: los del medio entran completos.
+        """
+        primero, ultimo = desde[:7], hasta[:7]
+        for mes in self.meses():
+            if mes < primero or mes > ultimo:
+                continue
+            if primero < mes < ultimo:
+                yield from self._particion(mes).iterar()
+                continue
+            for registro in self._particion(mes).iterar():
+                if desde <= registro[self.campo_fecha] <= hasta:
+                    yield registro
+
+    def buscar(self, valor_clave: str) -> Optional[dict]:
+        return self._ubicar(valor_clave)[1]
+
+    def buscar_varios(self, valores_clave: Iterable[str]) -> Dict[str, dict]:
+        """Busca varias claves abriendo solo las particiones de sus meses."""
+        mapa = self._mapa_claves()
+        por_mes: Dict[str, List[str]] = {}
+        for valor_clave in valores_clave:
+            mes = mapa.get(valor_clave)
+            if mes is not None:
+                por_mes.setdefault(mes, []).append(valor_clave)
+        encontrados: Dict[str, dict] = {}
+        for mes, claves in por_mes.items():
+            encontrados.update(self._particion(mes).buscar_varios(claves))
+        return encontrados
+
+    def buscar_todos_por(self, indice: str, valor: str) -> List[dict]:
+        """Registros con ese valor en un índice múltiple, mes por mes."""
+        return [
+            registro for mes in self.meses()
+            for registro in self._particion(mes).buscar_todos_por(indice, valor)
+        ]
+
+    def _controlar_claves_nuevas(self, nuevos: List[dict]) -> None:
+        # Cada partición rechaza claves repetidas en su mes; aquí, en cualquier otro
+        mapa = self._mapa_claves()
+        for registro in nuevos:
+            if registro[self.clave] in mapa:
+                raise RepositoryError(
+                    f"Ya existe un registro con {self.clave} '{registro[self.clave]}' en '{self.directorio}'."
+                )
+
+    def insertar(self, registro: dict) -> None:
+        with self._lock, self._bloqueo.exclusivo():
+            self._controlar_claves_nuevas([registro])
+            self._para_escribir(self.mes_de(registro)).insertar(registro)
+
+    def insertar_varios(self, nuevos: List[dict]) -> None:
+        """
+        Agrega varios registros con una escritura por partición. Cada
+        partición se escribe de forma atómica, pero no el lote completo.
+        """
+        por_mes: Dict[str, List[dict]] = {}
+        for registro in nuevos:
+            por_mes.setdefault(self.mes_de(registro), []).append(registro)
+        with self._lock, self._bloqueo.exclusivo():
+            self._controlar_claves_nuevas(nuevos)
+            for mes in sorted(por_mes):
+                self._para_escribir(mes).insertar_varios(por_mes[mes])
+
+    def actualizar(self, valor_clave: str, registro: dict) -> bool:
+        """
+        Reemplaza el registro con esa clave. Si la fecha nueva cae en otro
+        mes, el registro pasa a esa partición (primero se agrega en la
+        nueva y después se quita de la anterior, para no perderlo).
+        """
+        with self._lock, self._bloqueo.exclusivo():
+            mes, anterior = self._ubicar(valor_clave)
+            if anterior is None:
+                return False
+            destino = self.mes_de(registro)
+            if destino == mes:
+                return self._para_escribir(mes).actualizar(valor_clave, registro)
+            self._para_escribir(destino).insertar(registro)
+            self._para_escribir(mes).eliminar(valor_clave)  # type: ignore
+            return True
+
+    def eliminar(self, valor_clave: str) -> Optional[dict]:
+        with self._lock, self._bloqueo.exclusivo():
+            mes, anterior = self._ubicar(valor_clave)
+            if anterior is None:
+                return None
+            return self._para_escribir(mes).eliminar(valor_clave)  # type: ignore
+
+    def invalidar(self) -> None:
+        self._olvidar_mapa()
+        with self._lock:
+            self._firmas = None
+            for almacen in self._particiones.values():
+                almacen.invalidar()
@@ -0,0 +1,143 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: sin bloqueos entre procesos (ver BloqueoArchivo)
+    fcntl = None  # type: ignore
+
+COMPARTIDO = "compartido"
+EXCLUSIVO = "exclusivo"
+
+
+class MetricasBloqueo:
+    """Contadores de espera de un tipo de bloqueo sobre un archivo."""
+
+    def __init__(self) -> None:
+        self.adquisiciones = 0
+        self.esperas = 0  # adquisiciones que encontraron el archivo tomado
+        self.tiempo_espera = 0.0
+        self.espera_maxima = 0.0
+
+    def registrar(self, espera: Optional[float]) -> None:
+        self.adquisiciones += 1
+        if espera is not None:
+            self.esperas += 1
+            self.tiempo_espera += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+
+    def como_dict(self) -> Dict[str, float]:
+        return {
+            "adquisiciones": self.adquisiciones,
+            "esperas": self.esperas,
+            "tiempo_espera": self.tiempo_espera,
+            "espera_maxima": self.espera_maxima,
+        }
+
+
+class BloqueoArchivo:
+    """
+    Bloqueo entre procesos de un archivo de datos, con flock sobre un
+    archivo hermano `<archivo>.lock` (el de datos se reemplaza con rename en
+    cada escritura, así que no sirve para bloquear).
+
+    - compartido(): varios procesos pueden leer a la vez.
+    - exclusivo(): un solo proceso escribe, sin lectores.
+
+    Dentro del proceso los hilos se turnan, y el bloqueo es reentrante: un
+    compartido dentro de un exclusivo no hace nada. Pasar de compartido a
+    exclusivo no está permitido (flock lo haría soltando el bloqueo en el
+    medio): quien va a escribir debe tomar el exclusivo desde el inicio.
+
+    En Windows no hay fcntl y los bloqueos no tienen efecto entre procesos;
+    las métricas se siguen registrando.
+    """
+
+    def __init__(self, archivo: str) -> None:
+        self.ruta = archivo + ".lock"
+        self._lock = threading.RLock()
+        self._fd: Optional[int] = None
+        self._nivel = 0
+        self._modo: Optional[str] = None
+        self.metricas = {COMPARTIDO: MetricasBloqueo(), EXCLUSIVO: MetricasBloqueo()}
+
+    @contextmanager
+    def compartido(self) -> Iterator[None]:
+        with self._tomar(COMPARTIDO):
+            yield
+
+    @contextmanager
+    def exclusivo(self) -> Iterator[None]:
+        with self._tomar(EXCLUSIVO):
+            yield
+
+    @contextmanager
+    def _tomar(self, modo: str) -> Iterator[None]:
+        with self._lock:
+            if self._nivel == 0:
+                self._adquirir(modo)
+            elif modo == EXCLUSIVO and self._modo == COMPARTIDO:
+                raise RuntimeError(
+                    f"No se puede pasar de bloqueo compartido a exclusivo en '{self.ruta}'."
+                )
+            self._nivel += 1
+            try:
+                yield
+            finally:
+                self._nivel -= 1
+                if self._nivel == 0:
+                    self._liberar()
+
+    def _adquirir(self, modo: str) -> None:
+        self._modo = modo
+        if fcntl is None:
+            self.metricas[modo].registrar(None)
+            return
+        if self._fd is None:
+            self._fd = os.open(self.ruta, os.O_RDWR | os.O_CREAT, 0o644)
+        operacion = fcntl.LOCK_SH if modo == COMPARTIDO else fcntl.LOCK_EX
+        try:
+            fcntl.flock(self._fd, operacion | fcntl.LOCK_NB)
+            espera = None
+        except BlockingIOError:
+            # Otro proceso lo tiene: se espera y se mide cuánto
+            inicio = time.perf_counter()
+            fcntl.flock(self._fd, operacion)
+            espera = time.perf_counter() - inicio
+        self.metricas[modo].registrar(espera)
+
+    def _liberar(self) -> None:
+        if fcntl is not None and self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        self._modo = None
+
+
+_bloqueos: Dict[str, BloqueoArchivo] = {}
+_registro_lock = threading.Lock()
+
+
+def obtener_bloqueo(archivo: str) -> BloqueoArchivo:
+    """
+    Devuelve el bloqueo compartido de un archivo. Debe haber uno solo por
+    archivo y proceso: flock trata cada descriptor abierto como un dueño
+    distinto, y dos descriptores del mismo proceso se bloquearían entre sí.
+    """
+    ruta = os.path.abspath(archivo)
+    with _registro_lock:
+        bloqueo = _bloqueos.get(ruta)
+        if bloqueo is None:
+            bloqueo = BloqueoArchivo(archivo)
+            _bloqueos[ruta] = bloqueo
+        return bloqueo
+
+
+def metricas_bloqueos() -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Métricas de espera por archivo y tipo de bloqueo, para diagnóstico."""
+    with _registro_lock:
+        return {
+            ruta: {modo: m.como_dict() for modo, m in bloqueo.metricas.items()}
+            for ruta, bloqueo in _bloqueos.items()
+        }
@@ -1,19 +1,80 @@
 from models.clientes import Cliente
-import json
-from typing import List
+from models.diferidos import ListaDiferida
+from models.productos import Producto
+from repositories.almacen_json import obtener_almacen
+from repositories.formatos import obtener_formato, ruta_para
+from repositories.secuencias import maximo_codigo, obtener_secuencias
+from typing import Dict, Iterable, Iterator, List, Tuple
 import os
 
+
+def productos_de_tickets(tickets) -> List[Producto]:
+    """Productos y extintores distintos que aparecen en los tickets, con el último nombre y precio."""
+    por_codigo: Dict[str, Producto] = {}
+    for t in tickets:
+        for p in t.productos:
+            por_codigo[p['codigo']] = Producto(p['codigo'], p.get('nombre'), p.get('precio'))
+    return list(por_codigo.values())
+
+
+def relaciones_diferidas(tickets_repo, codigo: str) -> Tuple[ListaDiferida, ListaDiferida]:
+    """
+    (productos, tickets) de un cliente, que se cargan del repositorio de
+    tickets recién al usarse. Los productos salen de los mismos tickets.
+    Sin repositorio de tickets, ambas listas quedan vacías.
+    """
+    if tickets_repo is None:
+        tickets = ListaDiferida(list)
+    else:
+        tickets = ListaDiferida(lambda: tickets_repo.cargar_todos_por_cliente(codigo))
+    return ListaDiferida(lambda: productos_de_tickets(tickets)), tickets
+
+
 class ClientesRepo:
-    def __init__(self, cliente="data/clientes.json") -> None:
-        self.cliente = cliente
+    """
+    Clientes en data/clientes.json. Los tickets de un cliente no se guardan
+    en su registro: se enlazan por código de cliente desde los tickets y se
+    cargan recién cuando se usa cliente.tickets o cliente.productos.
+    """
+
+    def __init__(self, cliente="data/clientes.json", formato: str = "json", tickets_repo=None) -> None:
+        self.tickets_repo = tickets_repo
+        self._formato = obtener_formato(formato)
+        self.cliente = ruta_para(cliente, self._formato)
         self._crear_archivo_si_no_existe()
+        self._almacen = obtener_almacen(self.cliente, clave='codigo', formato=self._formato)
+        self._secuencias = obtener_secuencias(os.path.dirname(self.cliente))
 
     def _crear_archivo_si_no_existe(self):
         """Crea el directorio 'data' y el archivo si no existen."""
         os.makedirs(os.path.dirname(self.cliente), exist_ok=True)
         if not os.path.exists(self.cliente):
-            with open(self.cliente, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=4, ensure_ascii=False)
+            self._formato.escribir(self.cliente, [])
+
+    def _a_cliente(self, u: dict) -> Cliente:
+        productos, tickets = relaciones_diferidas(self.tickets_repo, u['codigo'])
+        return Cliente(
+            codigo=u['codigo'],
+            nombre_empresa=u['nombre_empresa'],
+            nombre_encargado=u['nombre_encargado'],
+            direccion=u['direccion'],
+            celular=u['celular'],
+            mes_vencimiento=u['mes_vencimiento'],
+            productos=productos,
+            tickets=tickets
+        )
+
+    def agrupar(self):
+        """Dentro del bloque `with`, los cambios de clientes se escriben a disco una sola vez al final."""
+        return self._almacen.agrupar()
+
+    def suscribir(self, observador):
+        """Registra un observador de cambios en los clientes."""
+        self._almacen.suscribir(observador)
+
+    def verificar_cambios(self):
+        """Detecta cambios hechos por otros procesos y los notifica a los observadores."""
+        self._almacen.verificar()
 
     def guardar_clientes(self, cliente):
 
@@ -23,40 +84,23 @@ class ClientesRepo:
         agregándolo a la lista existente de clientes.
         '''
 
-        try:
-            with open(self.cliente, 'r', encoding='utf-8') as f:
-                lista_clientes = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            lista_clientes = []
-
-        # consultar los codigos en lista_clientes y crear un codigo nuevo sin copiar un existente
-        codigo_generado = None
-
-        if lista_clientes:
-            # Obtener el máximo código existente
-            ultimo_codigo = max(
-                int(p.get('codigo', '0').replace("CLI-", "")) for p in lista_clientes
-                )
-            codigo_generado = ultimo_codigo + 1
-        else:
-            # Si no hay clientes, comenzamos desde 1
-            codigo_generado = 1
+        # El contador persistido evita recorrer todos los clientes para crear el código
+        codigo_generado = self._secuencias.siguiente(
+            "CLI-", lambda: maximo_codigo(self._almacen.leer(), 'codigo', "CLI-"),
+            lambda codigo: self._almacen.buscar(codigo) is not None
+        )
 
         datos_cliente = {
-            'codigo': f"CLI-{codigo_generado}",
+            'codigo': codigo_generado,
             'nombre_empresa': cliente.nombre_empresa,
             'nombre_encargado': cliente.nombre_encargado,
             'direccion': cliente.direccion,
             'celular': cliente.celular,
-            'mes_vencimiento': cliente.mes_vencimiento,
-            'productos': [],
-            'tickets': []
+            'mes_vencimiento': cliente.mes_vencimiento
         }
 
-        lista_clientes.append(datos_cliente)
-
-        with open(self.cliente, 'w', encoding='utf-8') as f:
-            json.dump(lista_clientes, f, indent=4, ensure_ascii=False)
+        self._almacen.insertar(datos_cliente)
+        cliente.codigo = codigo_generado
 
 
     def actualizar_cliente(self, cliente, codigo):
@@ -64,35 +108,16 @@ class ClientesRepo:
         Actualiza los datos de un cliente existente en el archivo JSON,
         buscando por su codigo. Devuelve True si se actualizó, False si no se encontró.
         """
-        try:
-            with open(self.cliente, 'r', encoding='utf-8') as f:
-                lista_clientes = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            lista_clientes = []
-
-        cliente_actualizado = False
-
-        for u in lista_clientes:
-            if u.get('codigo') == codigo:
-                u['codigo'] = cliente.codigo
-                u['nombre_empresa'] = cliente.nombre_empresa
-                u['nombre_encargado'] = cliente.nombre_encargado
-                u['direccion'] = cliente.direccion
-                u['celular'] = cliente.celular
-                u['mes_vencimiento'] = cliente.mes_vencimiento
-                u['productos'] = [
-                    producto.__dict__ for producto in getattr(cliente, 'productos', [])
-                ]
-                u['tickets'] = [
-                    ticket.__dict__ for ticket in getattr(cliente, 'tickets', [])
-                ]
-                cliente_actualizado = True
-                break
-
-        with open(self.cliente, 'w', encoding='utf-8') as f:
-            json.dump(lista_clientes, f, indent=4, ensure_ascii=False)
-
-        return cliente_actualizado
+        datos_cliente = {
+            'codigo': cliente.codigo,
+            'nombre_empresa': cliente.nombre_empresa,
+            'nombre_encargado': cliente.nombre_encargado,
+            'direccion': cliente.direccion,
+            'celular': cliente.celular,
+            'mes_vencimiento': cliente.mes_vencimiento
+        }
+
+        return self._almacen.actualizar(codigo, datos_cliente)
 
     def cargar_por_codigo(self, codigo):
 
@@ -100,46 +125,34 @@ class ClientesRepo:
         Carga un cliente desde el archivo JSON buscando por su codigo.
         '''
 
-        with open(self.cliente, 'r', encoding='utf-8') as f:
-            lista_clientes = json.load(f)
-
-        for u in lista_clientes:
-            if u.get('codigo') == codigo:
-                return Cliente(
-                    codigo=u['codigo'],
-                    nombre_empresa=u['nombre_empresa'],
-                    nombre_encargado=u['nombre_encargado'],
-                    direccion=u['direccion'],
-                    celular=u['celular'],
-                    mes_vencimiento=u['mes_vencimiento'],
-                    productos=u.get('productos', []),
-                    tickets=u.get('tickets', [])
-                )
-        return None
+        u = self._almacen.buscar(codigo)
+        if u is None:
+            return None
+
+        return self._a_cliente(u)
+
+    def cargar_por_codigos(self, codigos: Iterable[str]) -> Dict[str, Cliente]:
+        """
+        Carga varios clientes de una vez.
+        Devuelve un diccionario código → Cliente solo con los que existen.
+        """
+        return {
+            codigo: self._a_cliente(u)
+            for codigo, u in self._almacen.buscar_varios(codigos).items()
+        }
+
+    def existe_cliente(self, codigo) -> bool:
+        """Indica si hay un cliente con ese código, sin armar el objeto."""
+        return self._almacen.buscar(codigo) is not None
     
+    def iterar_todos(self) -> Iterator[Cliente]:
+        """Recorre todos los clientes de a uno, sin armar la lista completa."""
+        for c in self._almacen.iterar():
+            yield self._a_cliente(c)
+
     def cargar_todos(self) -> List[Cliente]:
         """Devuelve todos los clientes. Si no hay archivo → []"""
-        try:
-            with open(self.cliente, 'r', encoding='utf-8') as f:
-                datos = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []  
-
-        clientes = []
-        for c in datos:
-            clientes.append(
-                Cliente(
-                    codigo=c['codigo'],
-                    nombre_empresa=c['nombre_empresa'],
-                    nombre_encargado=c['nombre_encargado'],
-                    direccion=c['direccion'],
-                    celular=c['celular'],
-                    mes_vencimiento=c['mes_vencimiento'],
-                    productos=c.get('productos', []),
-                    tickets=c.get('tickets', [])
-                )
-            )
-        return clientes
+        return list(self.iterar_todos())
     
     def eliminar_cliente(self, codigo):
 
@@ -147,10 +160,4 @@ class ClientesRepo:
         Elimina un cliente del archivo JSON buscando por su codigo.
         '''
 
-        with open(self.cliente, 'r', encoding='utf-8') as f:
-            lista_clientes = json.load(f)
-
-        lista_clientes = [u for u in lista_clientes if u.get('codigo') != codigo]
-
-        with open(self.cliente, 'w', encoding='utf-8') as f:
-            json.dump(lista_clientes, f, indent=4, ensure_ascii=False)
+        self._almacen.eliminar(codigo)
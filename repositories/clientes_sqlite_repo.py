@@ -0,0 +1,111 @@
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models.clientes import Cliente
+from repositories.clientes_repo import relaciones_diferidas
+from repositories.conexion_sqlite import (
+    RUTA_BD, en_bloques, marcadores, obtener_conexion, siguiente_codigo, transaccion, version_datos
+)
+from repositories.observadores import Observable
+
+
+class ClientesSqliteRepo:
+    """
+    Implementación de ClientesRepo sobre SQLite (tabla `clientes`).
+    Las columnas `productos` y `tickets` quedan vacías: los tickets se
+    enlazan por codigo_cliente y se cargan al usarse (ver ClientesRepo).
+    """
+
+    def __init__(self, ruta_bd: str = RUTA_BD, tickets_repo=None) -> None:
+        self.ruta_bd = ruta_bd
+        self.tickets_repo = tickets_repo
+        self.conexion = obtener_conexion(ruta_bd)
+        self._cambios = Observable()
+        self._version_datos = version_datos(self.conexion)
+
+    def _a_cliente(self, fila: sqlite3.Row) -> Cliente:
+        productos, tickets = relaciones_diferidas(self.tickets_repo, fila['codigo'])
+        return Cliente(
+            codigo=fila['codigo'],
+            nombre_empresa=fila['nombre_empresa'],
+            nombre_encargado=fila['nombre_encargado'],
+            direccion=fila['direccion'],
+            celular=fila['celular'],
+            mes_vencimiento=fila['mes_vencimiento'],
+            productos=productos,
+            tickets=tickets
+        )
+
+    def _fila(self, cx: sqlite3.Connection, codigo: str) -> Optional[dict]:
+        fila = cx.execute("SELECT * FROM clientes WHERE codigo = ?", (codigo,)).fetchone()
+        return dict(fila) if fila else None
+
+    def suscribir(self, observador):
+        self._cambios.suscribir(observador)
+
+    def verificar_cambios(self):
+        """Avisa 'recargar' a los observadores si otra conexión modificó la base."""
+        version = version_datos(self.conexion)
+        if version != self._version_datos:
+            self._version_datos = version
+            self._cambios.notificar('recargar')
+
+    def guardar_clientes(self, cliente):
+        """Guarda un nuevo cliente con un código CLI-N generado."""
+        with transaccion(self.conexion) as cx:
+            codigo = siguiente_codigo(cx, 'clientes', 'codigo', 'CLI-')
+            cx.execute(
+                "INSERT INTO clientes (codigo, nombre_empresa, nombre_encargado, direccion,"
+                " celular, mes_vencimiento, productos, tickets) VALUES (?, ?, ?, ?, ?, ?, '[]', '[]')",
+                (codigo, cliente.nombre_empresa, cliente.nombre_encargado, cliente.direccion,
+                    cliente.celular, cliente.mes_vencimiento)
+            )
+            nuevo = self._fila(cx, codigo)
+        cliente.codigo = codigo
+        self._cambios.notificar('insertar', None, nuevo)
+
+    def actualizar_cliente(self, cliente, codigo) -> bool:
+        """Actualiza un cliente por código. Devuelve False si no existe."""
+        with transaccion(self.conexion) as cx:
+            anterior = self._fila(cx, codigo)
+            cursor = cx.execute(
+                "UPDATE clientes SET codigo = ?, nombre_empresa = ?, nombre_encargado = ?,"
+                " direccion = ?, celular = ?, mes_vencimiento = ? WHERE codigo = ?",
+                (cliente.codigo, cliente.nombre_empresa, cliente.nombre_encargado, cliente.direccion,
+                    cliente.celular, cliente.mes_vencimiento, codigo)
+            )
+            nuevo = self._fila(cx, cliente.codigo)
+        if cursor.rowcount > 0:
+            self._cambios.notificar('actualizar', anterior, nuevo)
+        return cursor.rowcount > 0
+
+    def cargar_por_codigo(self, codigo) -> Optional[Cliente]:
+        fila = self.conexion.execute("SELECT * FROM clientes WHERE codigo = ?", (codigo,)).fetchone()
+        return self._a_cliente(fila) if fila else None
+
+    def cargar_por_codigos(self, codigos: Iterable[str]) -> Dict[str, Cliente]:
+        resultado = {}
+        for bloque in en_bloques(set(codigos)):
+            filas = self.conexion.execute(
+                f"SELECT * FROM clientes WHERE codigo IN ({marcadores(len(bloque))})", bloque
+            )
+            for f in filas:
+                resultado[f['codigo']] = self._a_cliente(f)
+        return resultado
+
+    def existe_cliente(self, codigo) -> bool:
+        return self.conexion.execute("SELECT 1 FROM clientes WHERE codigo = ?", (codigo,)).fetchone() is not None
+
+    def iterar_todos(self) -> Iterator[Cliente]:
+        for f in self.conexion.execute("SELECT * FROM clientes ORDER BY rowid"):
+            yield self._a_cliente(f)
+
+    def cargar_todos(self) -> List[Cliente]:
+        return list(self.iterar_todos())
+
+    def eliminar_cliente(self, codigo):
+        with transaccion(self.conexion) as cx:
+            anterior = self._fila(cx, codigo)
+            cx.execute("DELETE FROM clientes WHERE codigo = ?", (codigo,))
+        if anterior is not None:
+            self._cambios.notificar('eliminar', anterior, None)
@@ -0,0 +1,178 @@
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List
+
+RUTA_BD = "data/extinsia.db"
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS clientes (
+    codigo TEXT PRIMARY KEY,
+    nombre_empresa TEXT NOT NULL,
+    nombre_encargado TEXT NOT NULL,
+    direccion TEXT NOT NULL,
+    celular TEXT NOT NULL,
+    mes_vencimiento TEXT NOT NULL,
+    productos TEXT NOT NULL DEFAULT '[]',
+    tickets TEXT NOT NULL DEFAULT '[]'
+);
+CREATE INDEX IF NOT EXISTS idx_clientes_nombre_empresa ON clientes (nombre_empresa);
+
+CREATE TABLE IF NOT EXISTS productos (
+    codigo TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    precio REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_productos_nombre ON productos (nombre);
+
+CREATE TABLE IF NOT EXISTS extintores (
+    codigo TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    precio REAL NOT NULL,
+    tipo TEXT NOT NULL,
+    capacidad REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_extintores_nombre ON extintores (nombre);
+
+CREATE TABLE IF NOT EXISTS tickets (
+    codigo_ticket TEXT PRIMARY KEY,
+    servicio TEXT NOT NULL,
+    codigo_cliente TEXT NOT NULL,
+    cliente TEXT NOT NULL,
+    total REAL NOT NULL,
+    fecha TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_codigo_cliente ON tickets (codigo_cliente);
+CREATE INDEX IF NOT EXISTS idx_tickets_fecha ON tickets (fecha);
+
+CREATE TABLE IF NOT EXISTS ticket_productos (
+    codigo_ticket TEXT NOT NULL REFERENCES tickets (codigo_ticket) ON DELETE CASCADE,
+    posicion INTEGER NOT NULL,
+    codigo TEXT,
+    nombre TEXT,
+    precio REAL,
+    cantidad INTEGER,
+    PRIMARY KEY (codigo_ticket, posicion)
+);
+CREATE INDEX IF NOT EXISTS idx_ticket_productos_codigo ON ticket_productos (codigo);
+
+CREATE TABLE IF NOT EXISTS secuencias (
+    prefijo TEXT PRIMARY KEY,
+    ultimo INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS usuarios (
+    codigo TEXT PRIMARY KEY,
+    nombre TEXT NOT NULL,
+    email TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    contraseña TEXT NOT NULL
+);
+"""
+
+# SQLite limita la cantidad de parámetros por consulta
+MAX_PARAMETROS = 500
+
+_conexiones: Dict[str, sqlite3.Connection] = {}
+_conexiones_lock = threading.Lock()
+
+
+def obtener_conexion(ruta: str = RUTA_BD) -> sqlite3.Connection:
+    """
+    Devuelve la conexión compartida a la base de datos, creando el archivo
+    y el esquema la primera vez.
+    """
+    ruta_abs = os.path.abspath(ruta)
+    with _conexiones_lock:
+        conexion = _conexiones.get(ruta_abs)
+        if conexion is None:
+            directorio = os.path.dirname(ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            # isolation_level=None: las transacciones se abren explícitamente
+            conexion = sqlite3.connect(ruta, isolation_level=None, check_same_thread=False)
+            conexion.row_factory = sqlite3.Row
+            conexion.execute("PRAGMA journal_mode=WAL")
+            conexion.execute("PRAGMA foreign_keys=ON")
+            conexion.executescript(ESQUEMA)
+            _conexiones[ruta_abs] = conexion
+        return conexion
+
+
+_transaccion_lock = threading.RLock()
+
+
+@contextmanager
+def transaccion(conexion: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Ejecuta el bloque en una transacción de escritura (BEGIN IMMEDIATE).
+    Hace COMMIT al terminar o ROLLBACK si ocurre una excepción.
+    """
+    with _transaccion_lock:
+        conexion.execute("BEGIN IMMEDIATE")
+        try:
+            yield conexion
+        except Exception:
+            conexion.execute("ROLLBACK")
+            raise
+        conexion.execute("COMMIT")
+
+
+def version_datos(conexion: sqlite3.Connection) -> int:
+    """Número que cambia cada vez que otra conexión confirma cambios en la base."""
+    return conexion.execute("PRAGMA data_version").fetchone()[0]
+
+
+def en_bloques(valores: Iterable[str], tamano: int = MAX_PARAMETROS) -> Iterator[List[str]]:
+    """Divide los valores en listas de a lo sumo `tamano` elementos para consultas IN (...)."""
+    valores = list(valores)
+    for inicio in range(0, len(valores), tamano):
+        yield valores[inicio:inicio + tamano]
+
+
+def filas_en_bloques(conexion: sqlite3.Connection, sql: str, parametros: tuple = (),
+                    tamano: int = MAX_PARAMETROS) -> Iterator[List[sqlite3.Row]]:
+    """Ejecuta una consulta y entrega sus filas de a bloques, sin traerlas todas a memoria."""
+    cursor = conexion.execute(sql, parametros)
+    try:
+        while True:
+            filas = cursor.fetchmany(tamano)
+            if not filas:
+                return
+            yield filas
+    finally:
+        cursor.close()
+
+
+def marcadores(cantidad: int) -> str:
+    """Devuelve '?, ?, ...' para una cláusula IN con `cantidad` parámetros."""
+    return ', '.join('?' * cantidad)
+
+
+def reservar_codigos(conexion: sqlite3.Connection, tabla: str, columna: str, prefijo: str,
+                        cantidad: int) -> range:
+    """
+    Reserva `cantidad` números consecutivos para el prefijo usando la tabla
+    `secuencias`. Debe llamarse dentro de una transacción.
+    La primera vez se inicializa con el máximo existente en la tabla.
+    """
+    fila = conexion.execute("SELECT ultimo FROM secuencias WHERE prefijo = ?", (prefijo,)).fetchone()
+    if fila is None:
+        maximo = conexion.execute(
+            f"SELECT MAX(CAST(SUBSTR({columna}, {len(prefijo) + 1}) AS INTEGER)) FROM {tabla}"
+        ).fetchone()[0] or 0
+        conexion.execute(
+            "INSERT INTO secuencias (prefijo, ultimo) VALUES (?, ?)", (prefijo, maximo + cantidad)
+        )
+        ultimo = maximo
+    else:
+        ultimo = fila['ultimo']
+        conexion.execute(
+            "UPDATE secuencias SET ultimo = ? WHERE prefijo = ?", (ultimo + cantidad, prefijo)
+        )
+    return range(ultimo + 1, ultimo + cantidad + 1)
+
+
+def siguiente_codigo(conexion: sqlite3.Connection, tabla: str, columna: str, prefijo: str) -> str:
+    """Devuelve el siguiente código PREFIJO-N. Debe llamarse dentro de una transacción."""
+    return f"{prefijo}{reservar_codigos(conexion, tabla, columna, prefijo, 1)[0]}"
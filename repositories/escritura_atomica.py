@@ -0,0 +1,79 @@
+import os
+import tempfile
+
+
+def _sincronizar_directorio(directorio: str) -> None:
+    """Asegura en disco la entrada del directorio (el rename). Windows no lo permite ni lo necesita."""
+    if os.name == 'nt':
+        return
+    fd = os.open(directorio or '.', os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def escribir_temporal(ruta: str, datos: bytes) -> str:
+    """
+    Escribe los datos en un archivo temporal junto a `ruta` y hace fsync.
+    Devuelve la ruta del temporal, listo para reemplazar() al destino.
+    """
+    directorio, nombre = os.path.split(ruta)
+    fd, temporal = tempfile.mkstemp(prefix=nombre + '.', suffix='.tmp', dir=directorio or '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(datos)
+            f.flush()
+            os.fsync(f.fileno())
+    except BaseException:
+        os.remove(temporal)
+        raise
+    return temporal
+
+
+def reemplazar(temporal: str, ruta: str) -> None:
+    """Reemplaza `ruta` por el temporal en un solo paso atómico y lo deja en disco."""
+    os.replace(temporal, ruta)
+    _sincronizar_directorio(os.path.dirname(ruta))
+
+
+def escribir_atomico(ruta: str, datos: bytes) -> None:
+    """
+    Reemplaza el contenido de `ruta` sin ventana de corrupción: temporal en
+    el mismo directorio, fsync y rename. Si el proceso se corta a mitad de
+    camino, el archivo queda con la versión anterior completa o la nueva
+    completa, nunca truncado.
+    """
+    reemplazar(escribir_temporal(ruta, datos), ruta)
+
+
+def _fin_ultima_linea(f, fin: int) -> int:
+    """Posición justo después del último salto de línea antes de `fin` (0 si no hay)."""
+    posicion = fin
+    while posicion > 0:
+        inicio = max(0, posicion - 65536)
+        f.seek(inicio)
+        salto = f.read(posicion - inicio).rfind(b"\n")
+        if salto >= 0:
+            return inicio + salto + 1
+        posicion = inicio
+    return 0
+
+
+def anexar_sincronizado(ruta: str, datos: bytes) -> None:
+    """
+    Agrega los datos (líneas completas) al final de `ruta` y hace fsync
+    antes de volver. Un corte a mitad de escritura solo puede dejar
+    incompleta la última línea: si un corte anterior la dejó así, se
+    descarta antes de agregar, para que no quede pegada a la primera línea
+    nueva ni en medio del archivo.
+    """
+    with open(ruta, 'ab+') as f:
+        fin = f.seek(0, os.SEEK_END)
+        if fin:
+            f.seek(fin - 1)
+            if f.read(1) != b"\n":
+                f.truncate(_fin_ultima_linea(f, fin))
+        f.write(datos)
+        f.flush()
+        os.fsync(f.fileno())
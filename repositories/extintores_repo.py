@@ -1,19 +1,27 @@
-import json
 from models.productos import Extintor
-from typing import List
+from repositories.almacen_json import obtener_almacen
+from repositories.formatos import obtener_formato, ruta_para
+from repositories.secuencias import maximo_codigo, obtener_secuencias
+from typing import Dict, Iterable, Iterator, List
 import os
 
 class ExtintoresRepo:
-    def __init__(self, archivo="data/extintores.json") -> None:
-        self.archivo = archivo
+    def __init__(self, archivo="data/extintores.json", formato: str = "json") -> None:
+        self._formato = obtener_formato(formato)
+        self.archivo = ruta_para(archivo, self._formato)
         self._crear_archivo_si_no_existe()
+        self._almacen = obtener_almacen(self.archivo, clave='codigo', formato=self._formato)
+        self._secuencias = obtener_secuencias(os.path.dirname(self.archivo))
 
     def _crear_archivo_si_no_existe(self):
         """Crea el directorio 'data' y el archivo si no existen."""
         os.makedirs(os.path.dirname(self.archivo), exist_ok=True)
         if not os.path.exists(self.archivo):
-            with open(self.archivo, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=4, ensure_ascii=False)
+            self._formato.escribir(self.archivo, [])
+
+    def agrupar(self):
+        """Dentro del bloque `with`, los cambios de extintores se escriben a disco una sola vez al final."""
+        return self._almacen.agrupar()
 
     def guardar_extintor(self, extintor: Extintor):
         """
@@ -21,118 +29,103 @@ class ExtintoresRepo:
         Si el archivo no existe, lo crea.
         Genera automáticamente un código incremental único (EXT-1, EXT-2, ...).
         """
-        try:
-            with open(self.archivo, "r", encoding="utf-8") as f:
-                lista_extintores = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            lista_extintores = []
-
         # Generar nuevo código incremental
-        if lista_extintores:
-            ultimo_codigo = max(
-                int(e.get("codigo", "0").replace("EXT-", "")) for e in lista_extintores
-            )
-            nuevo_codigo = ultimo_codigo + 1
-        else:
-            nuevo_codigo = 1
+        nuevo_codigo = self._secuencias.siguiente(
+            "EXT-", lambda: maximo_codigo(self._almacen.leer(), "codigo", "EXT-"),
+            lambda codigo: self._almacen.buscar(codigo) is not None
+        )
 
         datos_extintor = {
-            "codigo": f"EXT-{nuevo_codigo}",
+            "codigo": nuevo_codigo,
             "nombre": extintor.nombre,
             "precio": extintor.precio,
             "tipo": extintor.tipo,
             "capacidad": extintor.capacidad
         }
 
-        lista_extintores.append(datos_extintor)
-
-        with open(self.archivo, "w", encoding="utf-8") as f:
-            json.dump(lista_extintores, f, indent=4, ensure_ascii=False)
+        self._almacen.insertar(datos_extintor)
+        extintor.codigo = nuevo_codigo
 
     def actualizar_extintor(self, extintor: Extintor, codigo: str) -> bool:
         """
         Actualiza los datos de un extintor existente en el archivo JSON.
         Devuelve True si se actualizó correctamente, False si no se encontró.
         """
-        try:
-            with open(self.archivo, "r", encoding="utf-8") as f:
-                lista_extintores = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            lista_extintores = []
-
-        actualizado = False
+        e = self._almacen.buscar(codigo)
+        if e is None:
+            return False
 
-        for e in lista_extintores:
-            if e.get("codigo") == codigo:
-                e["nombre"] = extintor.nombre
-                e["precio"] = extintor.precio
-                e["tipo"] = extintor.tipo
-                e["capacidad"] = extintor.capacidad
-                actualizado = True
-                break
+        return self._almacen.actualizar(codigo, {
+            **e,
+            "nombre": extintor.nombre,
+            "precio": extintor.precio,
+            "tipo": extintor.tipo,
+            "capacidad": extintor.capacidad
+        })
 
-        with open(self.archivo, "w", encoding="utf-8") as f:
-            json.dump(lista_extintores, f, indent=4, ensure_ascii=False)
+    def suscribir(self, observador):
+        """Registra un observador de cambios en los extintores."""
+        self._almacen.suscribir(observador)
 
-        return actualizado
+    def verificar_cambios(self):
+        """Detecta cambios hechos por otros procesos y los notifica a los observadores."""
+        self._almacen.verificar()
 
     def cargar_por_codigo(self, codigo: str):
         """
         Carga un extintor desde el archivo JSON buscando por su código.
         Devuelve un objeto Extintor si lo encuentra, o None si no existe.
         """
-        try:
-            with open(self.archivo, "r", encoding="utf-8") as f:
-                lista_extintores = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        e = self._almacen.buscar(codigo)
+        if e is None:
             return None
 
-        for e in lista_extintores:
-            if e.get("codigo") == codigo:
-                return Extintor(
-                    codigo=e["codigo"],
-                    nombre=e["nombre"],
-                    precio=e["precio"],
-                    tipo=e["tipo"],
-                    capacidad=e["capacidad"]
-                )
-        return None
+        return Extintor(
+            codigo=e["codigo"],
+            nombre=e["nombre"],
+            precio=e["precio"],
+            tipo=e["tipo"],
+            capacidad=e["capacidad"]
+        )
     
+    def cargar_por_codigos(self, codigos: Iterable[str]) -> Dict[str, Extintor]:
+        """
+        Carga varios extintores de una vez.
+        Devuelve un diccionario código → Extintor solo con los que existen.
+        """
+        return {
+            codigo: Extintor(
+                codigo=e["codigo"],
+                nombre=e["nombre"],
+                precio=e["precio"],
+                tipo=e["tipo"],
+                capacidad=e["capacidad"]
+            )
+            for codigo, e in self._almacen.buscar_varios(codigos).items()
+        }
+
+    def iterar_todos(self) -> Iterator[Extintor]:
+        """
+        Recorre todos los extintores de a uno, sin armar la lista completa.
+        """
+        for e in self._almacen.iterar():
+            yield Extintor(
+                codigo=e['codigo'],
+                nombre=e['nombre'],
+                precio=e['precio'],
+                tipo=e['tipo'],
+                capacidad=e['capacidad']
+            )
+
     def cargar_todos(self) -> List[Extintor]:
         """
         Devuelve todos los extintores.
         Útil para validaciones y listados.
         """
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                datos = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-        extinores = []
-        for e in datos:
-            extinores.append(
-                Extintor(
-                    codigo=e['codigo'],
-                    nombre=e['nombre'],
-                    precio=e['precio'],
-                    tipo=e['tipo'],
-                    capacidad=e['capacidad']
-                )
-            )
-        return extinores
+        return list(self.iterar_todos())
 
     def eliminar_extintor(self, codigo: str):
         """
         Elimina un extintor del archivo JSON buscando por su código.
         """
-        try:
-            with open(self.archivo, "r", encoding="utf-8") as f:
-                lista_extintores = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            lista_extintores = []
-
-        lista_extintores = [e for e in lista_extintores if e.get("codigo") != codigo]
-
-        with open(self.archivo, "w", encoding="utf-8") as f:
-            json.dump(lista_extintores, f, indent=4, ensure_ascii=False)
+        self._almacen.eliminar(codigo)
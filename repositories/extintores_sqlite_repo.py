@@ -0,0 +1,102 @@
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models.productos import Extintor
+from repositories.conexion_sqlite import (
+    RUTA_BD, en_bloques, marcadores, obtener_conexion, siguiente_codigo, transaccion, version_datos
+)
+from repositories.observadores import Observable
+
+
+class ExtintoresSqliteRepo:
+    """Implementación de ExtintoresRepo sobre SQLite (tabla `extintores`)."""
+
+    def __init__(self, ruta_bd: str = RUTA_BD) -> None:
+        self.ruta_bd = ruta_bd
+        self.conexion = obtener_conexion(ruta_bd)
+        self._cambios = Observable()
+        self._version_datos = version_datos(self.conexion)
+
+    def _a_extintor(self, fila: sqlite3.Row) -> Extintor:
+        return Extintor(
+            codigo=fila['codigo'],
+            nombre=fila['nombre'],
+            precio=fila['precio'],
+            tipo=fila['tipo'],
+            capacidad=fila['capacidad']
+        )
+
+    def _fila(self, cx: sqlite3.Connection, codigo: str) -> Optional[dict]:
+        fila = cx.execute("SELECT * FROM extintores WHERE codigo = ?", (codigo,)).fetchone()
+        return dict(fila) if fila else None
+
+    def _a_registro(self, extintor: Extintor, codigo: str) -> dict:
+        return {
+            'codigo': codigo,
+            'nombre': extintor.nombre,
+            'precio': extintor.precio,
+            'tipo': extintor.tipo,
+            'capacidad': extintor.capacidad
+        }
+
+    def guardar_extintor(self, extintor: Extintor):
+        """Guarda un nuevo extintor con un código EXT-N generado."""
+        with transaccion(self.conexion) as cx:
+            codigo = siguiente_codigo(cx, 'extintores', 'codigo', 'EXT-')
+            cx.execute(
+                "INSERT INTO extintores (codigo, nombre, precio, tipo, capacidad) VALUES (?, ?, ?, ?, ?)",
+                (codigo, extintor.nombre, extintor.precio, extintor.tipo, extintor.capacidad)
+            )
+        extintor.codigo = codigo
+        self._cambios.notificar('insertar', None, self._a_registro(extintor, codigo))
+
+    def actualizar_extintor(self, extintor: Extintor, codigo: str) -> bool:
+        """Actualiza un extintor por código. Devuelve False si no existe."""
+        with transaccion(self.conexion) as cx:
+            anterior = self._fila(cx, codigo)
+            if anterior is None:
+                return False
+            cx.execute(
+                "UPDATE extintores SET nombre = ?, precio = ?, tipo = ?, capacidad = ? WHERE codigo = ?",
+                (extintor.nombre, extintor.precio, extintor.tipo, extintor.capacidad, codigo)
+            )
+        self._cambios.notificar('actualizar', anterior, self._a_registro(extintor, codigo))
+        return True
+
+    def suscribir(self, observador):
+        self._cambios.suscribir(observador)
+
+    def verificar_cambios(self):
+        """Avisa 'recargar' a los observadores si otra conexión modificó la base."""
+        version = version_datos(self.conexion)
+        if version != self._version_datos:
+            self._version_datos = version
+            self._cambios.notificar('recargar')
+
+    def cargar_por_codigo(self, codigo: str) -> Optional[Extintor]:
+        fila = self.conexion.execute("SELECT * FROM extintores WHERE codigo = ?", (codigo,)).fetchone()
+        return self._a_extintor(fila) if fila else None
+
+    def cargar_por_codigos(self, codigos: Iterable[str]) -> Dict[str, Extintor]:
+        resultado = {}
+        for bloque in en_bloques(set(codigos)):
+            filas = self.conexion.execute(
+                f"SELECT * FROM extintores WHERE codigo IN ({marcadores(len(bloque))})", bloque
+            )
+            for f in filas:
+                resultado[f['codigo']] = self._a_extintor(f)
+        return resultado
+
+    def iterar_todos(self) -> Iterator[Extintor]:
+        for f in self.conexion.execute("SELECT * FROM extintores ORDER BY rowid"):
+            yield self._a_extintor(f)
+
+    def cargar_todos(self) -> List[Extintor]:
+        return list(self.iterar_todos())
+
+    def eliminar_extintor(self, codigo: str):
+        with transaccion(self.conexion) as cx:
+            anterior = self._fila(cx, codigo)
+            cx.execute("DELETE FROM extintores WHERE codigo = ?", (codigo,))
+        if anterior is not None:
+            self._cambios.notificar('eliminar', anterior, None)
@@ -0,0 +1,211 @@
+import json
+import marshal
+import os
+import struct
+from typing import Dict, Iterable, Iterator, List, Union
+
+from repositories.escritura_atomica import escribir_atomico
+
+TAMANO_BLOQUE = 64 * 1024
+
+
+def iterar_arreglo_json(ruta: str, tamano_bloque: int = TAMANO_BLOQUE) -> Iterator[dict]:
+    """
+    Recorre un archivo con una lista JSON (`[{...}, {...}]`) elemento por
+    elemento, leyendo de a bloques. Nunca decodifica la lista completa:
+    en memoria solo están el bloque actual y el elemento que se entrega.
+    Lanza json.JSONDecodeError si el contenido no es una lista válida.
+    """
+    decodificador = json.JSONDecoder()
+    with open(ruta, 'r', encoding='utf-8') as f:
+        buffer = ""
+        pos = 0
+        inicio = True
+        fin_archivo = False
+
+        def saltar(caracteres: str) -> None:
+            nonlocal pos
+            while pos < len(buffer) and buffer[pos] in caracteres:
+                pos += 1
+
+        while True:
+            saltar(" \t\r\n")
+            if pos >= len(buffer) and not fin_archivo:
+                bloque = f.read(tamano_bloque)
+                fin_archivo = not bloque
+                buffer = buffer[pos:] + bloque
+                pos = 0
+                continue
+            if inicio:
+                if buffer[pos:pos + 1] != "[":
+                    raise json.JSONDecodeError("Se esperaba una lista JSON", buffer, pos)
+                pos += 1
+                inicio = False
+                continue
+            if pos >= len(buffer):
+                raise json.JSONDecodeError("Lista JSON sin cerrar", buffer, pos)
+            if buffer[pos] == "]":
+                return
+            if buffer[pos] == ",":
+                pos += 1
+                continue
+            try:
+                elemento, fin = decodificador.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                if fin_archivo:
+                    raise
+                # El elemento quedó cortado entre dos bloques
+                bloque = f.read(tamano_bloque)
+                fin_archivo = not bloque
+                buffer = buffer[pos:] + bloque
+                pos = 0
+                continue
+            pos = fin
+            yield elemento
+
+
+class FormatoJson:
+    """
+    Lista JSON en un solo archivo. Con `indentado` se escribe como siempre
+    (indent=4, legible a mano); sin él, sin espacios ni saltos de línea,
+    que ocupa la mitad y se escribe varias veces más rápido (la indentación
+    obliga a usar el codificador en Python puro). Ambas variantes se leen igual.
+    """
+
+    extension = ".json"
+
+    def __init__(self, indentado: bool = True) -> None:
+        self.indentado = indentado
+
+    def serializar(self, registros: Iterable[dict]) -> bytes:
+        # json.dumps arma el texto de una vez (con el codificador en C cuando
+        # no hay indentación); json.dump haría miles de escrituras pequeñas.
+        if self.indentado:
+            texto = json.dumps(list(registros), indent=4, ensure_ascii=False)
+        else:
+            texto = json.dumps(list(registros), separators=(',', ':'), ensure_ascii=False)
+        return texto.encode('utf-8')
+
+    def escribir(self, ruta: str, registros: Iterable[dict]) -> None:
+        escribir_atomico(ruta, self.serializar(registros))
+
+    def leer(self, ruta: str) -> List[dict]:
+        with open(ruta, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def iterar(self, ruta: str) -> Iterator[dict]:
+        return iterar_arreglo_json(ruta)
+
+
+class FormatoBinario:
+    """
+    Archivo de registros con prefijo de longitud, solo con la biblioteca
+    estándar:
+
+        EXTB1\n | <uint32 big-endian: largo> <registro en marshal v4> | ...
+
+    marshal codifica y decodifica en C sin analizar texto, y el prefijo de
+    longitud permite recorrer el archivo registro por registro. Los registros
+    solo contienen tipos de JSON, así que la conversión con los formatos JSON
+    es exacta. La versión de marshal se fija en 4 (estable desde Python 3.4);
+    es un formato local de la aplicación, no de intercambio.
+    """
+
+    extension = ".bin"
+    MAGIA = b"EXTB1\n"
+    VERSION_MARSHAL = 4
+    _LARGO = struct.Struct(">I")
+
+    def serializar(self, registros: Iterable[dict]) -> bytes:
+        empaquetar = self._LARGO.pack
+        partes = [self.MAGIA]
+        for registro in registros:
+            datos = marshal.dumps(registro, self.VERSION_MARSHAL)
+            partes.append(empaquetar(len(datos)))
+            partes.append(datos)
+        return b"".join(partes)
+
+    def escribir(self, ruta: str, registros: Iterable[dict]) -> None:
+        escribir_atomico(ruta, self.serializar(registros))
+
+    def _decodificar(self, ruta: str, datos) -> dict:
+        try:
+            return marshal.loads(datos)
+        except (EOFError, TypeError, ValueError):
+            raise ValueError(f"Registro dañado en '{ruta}'.")
+
+    def leer(self, ruta: str) -> List[dict]:
+        # Lectura completa: un solo read y cortes sin copia sobre el buffer
+        with open(ruta, 'rb') as f:
+            datos = f.read()
+        if not datos.startswith(self.MAGIA):
+            raise ValueError(f"'{ruta}' no es un archivo de registros binario.")
+        vista = memoryview(datos)
+        desempaquetar = self._LARGO.unpack_from
+        tamano_largo = self._LARGO.size
+        registros = []
+        pos = len(self.MAGIA)
+        while pos < len(datos):
+            if pos + tamano_largo > len(datos):
+                raise ValueError(f"Registro truncado en '{ruta}'.")
+            (largo,) = desempaquetar(datos, pos)
+            pos += tamano_largo
+            if pos + largo > len(datos):
+                raise ValueError(f"Registro truncado en '{ruta}'.")
+            registros.append(self._decodificar(ruta, vista[pos:pos + largo]))
+            pos += largo
+        return registros
+
+    def iterar(self, ruta: str) -> Iterator[dict]:
+        tamano_largo = self._LARGO.size
+        desempaquetar = self._LARGO.unpack
+        with open(ruta, 'rb') as f:
+            if f.read(len(self.MAGIA)) != self.MAGIA:
+                raise ValueError(f"'{ruta}' no es un archivo de registros binario.")
+            while True:
+                cabecera = f.read(tamano_largo)
+                if not cabecera:
+                    return
+                if len(cabecera) < tamano_largo:
+                    raise ValueError(f"Registro truncado en '{ruta}'.")
+                (largo,) = desempaquetar(cabecera)
+                datos = f.read(largo)
+                if len(datos) < largo:
+                    raise ValueError(f"Registro truncado en '{ruta}'.")
+                yield self._decodificar(ruta, datos)
+
+
+Formato = Union[FormatoJson, FormatoBinario]
+
+# Formatos disponibles para los almacenes de archivo:
+#   "json"     → lista JSON indentada (el formato histórico).
+#   "compacto" → lista JSON sin espacios.
+#   "binario"  → registros con prefijo de longitud (.bin).
+FORMATOS: Dict[str, Formato] = {
+    "json": FormatoJson(indentado=True),
+    "compacto": FormatoJson(indentado=False),
+    "binario": FormatoBinario(),
+}
+
+
+def obtener_formato(nombre: str) -> Formato:
+    """Devuelve el formato con ese nombre o lanza ValueError."""
+    if nombre not in FORMATOS:
+        raise ValueError(f"Formato '{nombre}' inválido. Use uno de: {', '.join(FORMATOS)}")
+    return FORMATOS[nombre]
+
+
+def ruta_para(archivo: str, formato: Formato) -> str:
+    """Ajusta la extensión del archivo a la del formato (tickets.json → tickets.bin)."""
+    base, extension = os.path.splitext(archivo)
+    return archivo if extension == formato.extension else base + formato.extension
+
+
+def detectar_formato(ruta: str) -> Formato:
+    """Deduce el formato de un archivo existente por su contenido."""
+    with open(ruta, 'rb') as f:
+        inicio = f.read(len(FormatoBinario.MAGIA))
+    if inicio == FormatoBinario.MAGIA:
+        return FORMATOS["binario"]
+    # Las dos variantes JSON se leen igual; se distingue solo para informar
+    return FORMATOS["json"] if inicio[:2] in (b"[\n", b"[\r") else FORMATOS["compacto"]
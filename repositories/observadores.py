@@ -0,0 +1,22 @@
+from typing import Callable, List, Optional
+
+# observador(evento, anterior, nuevo)
+#   evento: "insertar" | "actualizar" | "eliminar" | "recargar"
+#   anterior / nuevo: registros (dict) antes y después del cambio.
+#   "recargar" indica que los datos cambiaron fuera de este proceso y llega
+#   sin registros: quien lo recibe debe reconstruir lo que derive de ellos.
+Observador = Callable[[str, Optional[dict], Optional[dict]], None]
+
+
+class Observable:
+    """Lista de observadores que reciben los cambios de un repositorio."""
+
+    def __init__(self) -> None:
+        self._observadores: List[Observador] = []
+
+    def suscribir(self, observador: Observador) -> None:
+        self._observadores.append(observador)
+
+    def notificar(self, evento: str, anterior: Optional[dict] = None, nuevo: Optional[dict] = None) -> None:
+        for observador in list(self._observadores):
+            observador(evento, anterior, nuevo)
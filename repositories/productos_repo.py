@@ -1,19 +1,27 @@
-import json
 from models.productos import Producto
-from typing import List
+from repositories.almacen_json import obtener_almacen
+from repositories.formatos import obtener_formato, ruta_para
+from repositories.secuencias import maximo_codigo, obtener_secuencias
+from typing import Dict, Iterable, Iterator, List
 import os
 
 class ProductosRepo:
-    def __init__(self, archivo="data/productos.json") -> None:
-        self.archivo = archivo
+    def __init__(self, archivo="data/productos.json", formato: str = "json") -> None:
+        self._formato = obtener_formato(formato)
+        self.archivo = ruta_para(archivo, self._formato)
         self._crear_archivo_si_no_existe()
+        self._almacen = obtener_almacen(self.archivo, clave='codigo', formato=self._formato)
+        self._secuencias = obtener_secuencias(os.path.dirname(self.archivo))
 
     def _crear_archivo_si_no_existe(self):
         """Crea el directorio 'data' y el archivo si no existen."""
         os.makedirs(os.path.dirname(self.archivo), exist_ok=True)
         if not os.path.exists(self.archivo):
-            with open(self.archivo, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=4, ensure_ascii=False)
+            self._formato.escribir(self.archivo, [])
+
+    def agrupar(self):
+        """Dentro del bloque `with`, los cambios de productos se escriben a disco una sola vez al final."""
+        return self._almacen.agrupar()
 
     def guardar_producto(self, producto: Producto):
         """
@@ -22,31 +30,20 @@ class ProductosRepo:
         Asigna automáticamente un código incremental único.
         """
 
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista_productos = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            lista_productos = []
-
         # Generar un nuevo código automáticamente
-        if lista_productos:
-            ultimo_codigo = max(
-                int(p.get('codigo', '0').replace("PRO-", "")) for p in lista_productos
-            )
-            nuevo_codigo = ultimo_codigo + 1
-        else:
-            nuevo_codigo = 1
+        nuevo_codigo = self._secuencias.siguiente(
+            "PRO-", lambda: maximo_codigo(self._almacen.leer(), 'codigo', "PRO-"),
+            lambda codigo: self._almacen.buscar(codigo) is not None
+        )
 
         datos_producto = {
-            "codigo": f"PRO-{nuevo_codigo}",
+            "codigo": nuevo_codigo,
             "nombre": producto.nombre,
             "precio": producto.precio
         }
 
-        lista_productos.append(datos_producto)
-
-        with open(self.archivo, 'w', encoding='utf-8') as f:
-            json.dump(lista_productos, f, indent=4, ensure_ascii=False)
+        self._almacen.insertar(datos_producto)
+        producto.codigo = nuevo_codigo
 
     def actualizar_producto(self, producto: Producto, codigo: str) -> bool:
         """
@@ -54,25 +51,23 @@ class ProductosRepo:
         Devuelve True si se actualizó correctamente, False si no se encontró.
         """
 
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista_productos = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            lista_productos = []
-
-        producto_actualizado = False
+        p = self._almacen.buscar(codigo)
+        if p is None:
+            return False
 
-        for p in lista_productos:
-            if p.get('codigo') == codigo:
-                p['nombre'] = producto.nombre
-                p['precio'] = producto.precio
-                producto_actualizado = True
-                break
+        return self._almacen.actualizar(codigo, {
+            **p,
+            'nombre': producto.nombre,
+            'precio': producto.precio
+        })
 
-        with open(self.archivo, 'w', encoding='utf-8') as f:
-            json.dump(lista_productos, f, indent=4, ensure_ascii=False)
+    def suscribir(self, observador):
+        """Registra un observador de cambios en los productos."""
+        self._almacen.suscribir(observador)
 
-        return producto_actualizado
+    def verificar_cambios(self):
+        """Detecta cambios hechos por otros procesos y los notifica a los observadores."""
+        self._almacen.verificar()
 
     def cargar_por_codigo(self, codigo: str):
         """
@@ -80,55 +75,51 @@ class ProductosRepo:
         Devuelve un objeto Producto si lo encuentra, o None si no existe.
         """
 
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista_productos = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        p = self._almacen.buscar(codigo)
+        if p is None:
             return None
 
-        for p in lista_productos:
-            if p.get('codigo') == codigo:
-                return Producto(
-                    codigo=p['codigo'],
-                    nombre=p['nombre'],
-                    precio=p['precio']
-                )
-        return None
+        return Producto(
+            codigo=p['codigo'],
+            nombre=p['nombre'],
+            precio=p['precio']
+        )
     
+    def cargar_por_codigos(self, codigos: Iterable[str]) -> Dict[str, Producto]:
+        """
+        Carga varios productos de una vez.
+        Devuelve un diccionario código → Producto solo con los que existen.
+        """
+        return {
+            codigo: Producto(
+                codigo=p['codigo'],
+                nombre=p['nombre'],
+                precio=p['precio']
+            )
+            for codigo, p in self._almacen.buscar_varios(codigos).items()
+        }
+
+    def iterar_todos(self) -> Iterator[Producto]:
+        """
+        Recorre todos los productos de a uno, sin armar la lista completa.
+        """
+        for p in self._almacen.iterar():
+            yield Producto(
+                codigo=p['codigo'],
+                nombre=p['nombre'],
+                precio=p['precio']
+            )
+
     def cargar_todos(self) -> List[Producto]:
         """
         Devuelve todos los productos.
         Útil para validaciones y listados.
         """
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                datos = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-        productos = []
-        for p in datos:
-            productos.append(
-                Producto(
-                    codigo=p['codigo'],
-                    nombre=p['nombre'],
-                    precio=p['precio']
-                )
-            )
-        return productos
+        return list(self.iterar_todos())
 
     def eliminar_producto(self, codigo: str):
         """
         Elimina un producto del archivo JSON buscando por su código.
         """
 
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista_productos = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            lista_productos = []
-
-        lista_productos = [p for p in lista_productos if p.get('codigo') != codigo]
-
-        with open(self.archivo, 'w', encoding='utf-8') as f:
-            json.dump(lista_productos, f, indent=4, ensure_ascii=False)
+        self._almacen.eliminar(codigo)
@@ -0,0 +1,91 @@
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from models.productos import Producto
+from repositories.conexion_sqlite import (
+    RUTA_BD, en_bloques, marcadores, obtener_conexion, siguiente_codigo, transaccion, version_datos
+)
+from repositories.observadores import Observable
+
+
+class ProductosSqliteRepo:
+    """Implementación de ProductosRepo sobre SQLite (tabla `productos`)."""
+
+    def __init__(self, ruta_bd: str = RUTA_BD) -> None:
+        self.ruta_bd = ruta_bd
+        self.conexion = obtener_conexion(ruta_bd)
+        self._cambios = Observable()
+        self._version_datos = version_datos(self.conexion)
+
+    def _a_producto(self, fila: sqlite3.Row) -> Producto:
+        return Producto(codigo=fila['codigo'], nombre=fila['nombre'], precio=fila['precio'])
+
+    def _fila(self, cx: sqlite3.Connection, codigo: str) -> Optional[dict]:
+        fila = cx.execute("SELECT * FROM productos WHERE codigo = ?", (codigo,)).fetchone()
+        return dict(fila) if fila else None
+
+    def guardar_producto(self, producto: Producto):
+        """Guarda un nuevo producto con un código PRO-N generado."""
+        with transaccion(self.conexion) as cx:
+            codigo = siguiente_codigo(cx, 'productos', 'codigo', 'PRO-')
+            cx.execute(
+                "INSERT INTO productos (codigo, nombre, precio) VALUES (?, ?, ?)",
+                (codigo, producto.nombre, producto.precio)
+            )
+        producto.codigo = codigo
+        self._cambios.notificar(
+            'insertar', None, {'codigo': codigo, 'nombre': producto.nombre, 'precio': producto.precio}
+        )
+
+    def actualizar_producto(self, producto: Producto, codigo: str) -> bool:
+        """Actualiza nombre y precio. Devuelve False si no existe."""
+        with transaccion(self.conexion) as cx:
+            anterior = self._fila(cx, codigo)
+            if anterior is None:
+                return False
+            cx.execute(
+                "UPDATE productos SET nombre = ?, precio = ? WHERE codigo = ?",
+                (producto.nombre, producto.precio, codigo)
+            )
+        self._cambios.notificar(
+            'actualizar', anterior, {'codigo': codigo, 'nombre': producto.nombre, 'precio': producto.precio}
+        )
+        return True
+
+    def suscribir(self, observador):
+        self._cambios.suscribir(observador)
+
+    def verificar_cambios(self):
+        """Avisa 'recargar' a los observadores si otra conexión modificó la base."""
+        version = version_datos(self.conexion)
+        if version != self._version_datos:
+            self._version_datos = version
+            self._cambios.notificar('recargar')
+
+    def cargar_por_codigo(self, codigo: str) -> Optional[Producto]:
+        fila = self.conexion.execute("SELECT * FROM productos WHERE codigo = ?", (codigo,)).fetchone()
+        return self._a_producto(fila) if fila else None
+
+    def cargar_por_codigos(self, codigos: Iterable[str]) -> Dict[str, Producto]:
+        resultado = {}
+        for bloque in en_bloques(set(codigos)):
+            filas = self.conexion.execute(
+                f"SELECT * FROM productos WHERE codigo IN ({marcadores(len(bloque))})", bloque
+            )
+            for f in filas:
+                resultado[f['codigo']] = self._a_producto(f)
+        return resultado
+
+    def iterar_todos(self) -> Iterator[Producto]:
+        for f in self.conexion.execute("SELECT * FROM productos ORDER BY rowid"):
+            yield self._a_producto(f)
+
+    def cargar_todos(self) -> List[Producto]:
+        return list(self.iterar_todos())
+
+    def eliminar_producto(self, codigo: str):
+        with transaccion(self.conexion) as cx:
+            anterior = self._fila(cx, codigo)
+            cx.execute("DELETE FROM productos WHERE codigo = ?", (codigo,))
+        if anterior is not None:
+            self._cambios.notificar('eliminar', anterior, None)
@@ -0,0 +1,106 @@
+import json
+import os
+import threading
+from typing import Callable, Dict, Iterable, Optional
+
+from repositories.bloqueo import obtener_bloqueo
+from config.exceptions import RepositoryError
+from repositories.escritura_atomica import escribir_atomico
+
+
+def maximo_codigo(registros: Iterable[dict], campo: str, prefijo: str) -> int:
+    """Número más alto entre los códigos PREFIJO-N de los registros (0 si no hay)."""
+    return max(
+        (int(r.get(campo, f"{prefijo}0").replace(prefijo, "")) for r in registros),
+        default=0
+    )
+
+
+class Secuencias:
+    """
+    Asignador de códigos incrementales por entidad (CLI-, PRO-, EXT-, USR-, TIC-).
+
+    Guarda el último número entregado de cada prefijo en un archivo pequeño
+    junto a los datos, así generar un código no depende del tamaño de la
+    colección. La primera vez que se usa un prefijo se inicializa con el
+    máximo existente en los datos.
+    """
+
+    def __init__(self, archivo: str = "data/secuencias.json") -> None:
+        self.archivo = archivo
+        self._lock = threading.Lock()
+        self._bloqueo = obtener_bloqueo(archivo)
+
+    def _leer(self) -> Dict[str, int]:
+        try:
+            with open(self.archivo, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            # Como en AlmacenJson: tratarlo como vacío volvería a entregar códigos ya usados
+            raise RepositoryError(f"El archivo '{self.archivo}' está dañado y no se puede leer.") from e
+
+    def _escribir(self, contadores: Dict[str, int]) -> None:
+        escribir_atomico(self.archivo, json.dumps(contadores, indent=4, ensure_ascii=False).encode('utf-8'))
+
+    def reservar(self, prefijo: str, cantidad: int,
+                    inicializar: Optional[Callable[[], int]] = None,
+                    existe: Optional[Callable[[str], bool]] = None) -> range:
+        """
+        Reserva un bloque de `cantidad` números consecutivos para el prefijo
+        y devuelve el rango reservado.
+        `inicializar` devuelve el máximo actual en los datos y solo se llama
+        si el prefijo aún no tiene contador, o si `existe` indica que alguno
+        de los códigos reservados ya está en los datos: el contador quedó
+        atrás (por ejemplo, tras restaurar un respaldo de data/) y se vuelve
+        a sembrar con ese máximo.
+        """
+        if cantidad < 1:
+            raise ValueError("La cantidad a reservar debe ser al menos 1.")
+        rango = self._reservar(prefijo, cantidad, None)
+        if rango is None:
+            # Prefijo sin contador: el máximo de los datos se calcula sin
+            # retener el bloqueo de este archivo, que otro proceso puede
+            # necesitar mientras tiene tomado el archivo de datos.
+            rango = self._reservar(prefijo, cantidad, inicializar() if inicializar else 0)
+        if existe is not None and any(existe(f"{prefijo}{numero}") for numero in rango):
+            rango = self._reservar(prefijo, cantidad, inicializar() if inicializar else 0, resembrar=True)
+        return rango
+
+    def _reservar(self, prefijo: str, cantidad: int, inicial: Optional[int],
+                    resembrar: bool = False) -> Optional[range]:
+        with self._lock, self._bloqueo.exclusivo():
+            # Se relee el archivo en cada reserva: es pequeño y así se respeta
+            # lo que otro proceso haya reservado.
+            contadores = self._leer()
+            ultimo = contadores.get(prefijo, inicial)
+            if resembrar:
+                ultimo = max(ultimo or 0, inicial or 0)
+            if ultimo is None:
+                return None
+            contadores[prefijo] = ultimo + cantidad
+            self._escribir(contadores)
+        return range(ultimo + 1, ultimo + cantidad + 1)
+
+    def siguiente(self, prefijo: str, inicializar: Optional[Callable[[], int]] = None,
+                    existe: Optional[Callable[[str], bool]] = None) -> str:
+        """Devuelve el siguiente código completo, por ejemplo 'CLI-8'."""
+        numero = self.reservar(prefijo, 1, inicializar, existe)[0]
+        return f"{prefijo}{numero}"
+
+
+_secuencias: Dict[str, Secuencias] = {}
+_registro_lock = threading.Lock()
+
+
+def obtener_secuencias(directorio: str) -> Secuencias:
+    """Devuelve el asignador compartido para el archivo secuencias.json del directorio."""
+    archivo = os.path.join(directorio, "secuencias.json")
+    ruta = os.path.abspath(archivo)
+    with _registro_lock:
+        secuencias = _secuencias.get(ruta)
+        if secuencias is None:
+            secuencias = Secuencias(archivo)
+            _secuencias[ruta] = secuencias
+        return secuencias
@@ -1,199 +1,204 @@
-import json
 from datetime import datetime
-from typing import List, Optional
+from typing import Iterator, List, Optional
 from models.tickets import Ticket
+from repositories.almacen_json import AlmacenJson, obtener_almacen
+from repositories.almacen_journal import AlmacenJournal
+from repositories.almacen_particionado import AlmacenParticionado
+from repositories.formatos import obtener_formato, ruta_para
+from repositories.secuencias import maximo_codigo, obtener_secuencias
 import os
 
 
+# Motores de almacenamiento disponibles para los tickets:
+#   "json"    → reescribe tickets.json completo en cada cambio.
+#   "journal" → agrega cada cambio a tickets.json.journal y compacta en segundo plano.
+MOTORES = {
+    "json": AlmacenJson,
+    "journal": AlmacenJournal,
+}
+# Además, "particionado" guarda un archivo por mes en data/tickets/ (AAAA-MM.json):
+# cada cambio reescribe solo su mes y las consultas por fechas leen solo los meses del rango.
+ALMACENAMIENTOS = (*MOTORES, "particionado")
+
+
 class TicketsRepo:
-    def __init__(self, archivo="data/tickets.json") -> None:
-        self.archivo = archivo
-        self._crear_archivo_si_no_existe()
+    def __init__(self, archivo="data/tickets.json", almacenamiento: str = "json",
+                    formato: str = "json") -> None:
+        if almacenamiento not in ALMACENAMIENTOS:
+            raise ValueError(
+                f"Almacenamiento '{almacenamiento}' inválido. Use uno de: {', '.join(ALMACENAMIENTOS)}"
+            )
+        self._formato = obtener_formato(formato)
+        # Índice codigo_cliente → tickets: el historial de un cliente no recorre todos los tickets
+        indices_multiples = {'codigo_cliente': lambda t: t.get('codigo_cliente')}
+        if almacenamiento == "particionado":
+            # data/tickets.json → directorio data/tickets/
+            self.archivo = os.path.splitext(archivo)[0]
+            os.makedirs(self.archivo, exist_ok=True)
+            self._almacen = AlmacenParticionado(
+                self.archivo, 'codigo_ticket', 'fecha', formato=self._formato,
+                indices_multiples=indices_multiples
+            )
+        else:
+            self.archivo = ruta_para(archivo, self._formato)
+            self._crear_archivo_si_no_existe()
+            self._almacen = obtener_almacen(
+                self.archivo, clave='codigo_ticket', tipo=MOTORES[almacenamiento], formato=self._formato,
+                indices_multiples=indices_multiples
+            )
+        self._secuencias = obtener_secuencias(os.path.dirname(self.archivo))
 
     def _crear_archivo_si_no_existe(self):
         """Crea el directorio 'data' y el archivo si no existen."""
         os.makedirs(os.path.dirname(self.archivo), exist_ok=True)
         if not os.path.exists(self.archivo):
-            with open(self.archivo, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=4, ensure_ascii=False)
+            self._formato.escribir(self.archivo, [])
 
-    def crear(self, ticket: Ticket):
-        """
-        Guarda un nuevo ticket en el archivo JSON.
-        Genera un código único incremental.
-        """
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista_tickets = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            lista_tickets = []
+    def agrupar(self):
+        """Dentro del bloque `with`, los cambios de tickets se escriben a disco una sola vez al final."""
+        return self._almacen.agrupar()
 
-        # Generar código automático
-        if lista_tickets:
-            ultimo_codigo = max(
-                int(t.get('codigo_ticket', 'TIC-0').replace("TIC-", "")) for t in lista_tickets
-            )
-            nuevo_codigo = ultimo_codigo + 1
-        else:
-            nuevo_codigo = 1
-
-        # Serializar productos (que ya son dicts con str/int)
-        productos_serializados = [
-            {
-                "codigo": p.get("codigo"),
-                "nombre": p.get("nombre"),
-                "precio": p.get("precio"),
-                "cantidad": p.get("cantidad")
-            } for p in ticket.productos
-        ]
+    def suscribir(self, observador):
+        """Registra un observador de cambios en los tickets (ver repositories/observadores.py)."""
+        self._almacen.suscribir(observador)
+
+    def verificar_cambios(self):
+        """Detecta cambios hechos por otros procesos y los notifica a los observadores."""
+        self._almacen.verificar()
+
+    def _a_registro(self, ticket: Ticket, codigo_ticket: str) -> dict:
+        # Serializar productos (LineaTicket → dicts con str/int)
+        productos_serializados = [p.como_dict() for p in ticket.productos]
 
-        datos_ticket = {
-            "codigo_ticket": f"TIC-{nuevo_codigo}",
+        return {
+            "codigo_ticket": codigo_ticket,
             "servicio": ticket.servicio,
             "codigo_cliente": ticket.codigo_cliente,
             "cliente": ticket.cliente,
             "productos": productos_serializados,
             "total": ticket.total,
-            "fecha": ticket.fecha.isoformat() 
+            "fecha": ticket.fecha.isoformat()
         }
 
-        lista_tickets.append(datos_ticket)
+    def _reservar_codigos(self, cantidad: int) -> range:
+        return self._secuencias.reservar(
+            "TIC-", cantidad, lambda: maximo_codigo(self._almacen.leer(), 'codigo_ticket', "TIC-"),
+            lambda codigo: self._almacen.buscar(codigo) is not None
+        )
+
+    def crear(self, ticket: Ticket):
+        """
+        Guarda un nuevo ticket en el archivo JSON.
+        Genera un código único incremental.
+        """
+        # Generar código automático
+        nuevo_codigo = f"TIC-{self._reservar_codigos(1)[0]}"
 
-        with open(self.archivo, 'w', encoding='utf-8') as f:
-            json.dump(lista_tickets, f, indent=4, ensure_ascii=False)
+        self._almacen.insertar(self._a_registro(ticket, nuevo_codigo))
 
         # Actualizamos el código en el objeto original para consistencia
-        ticket.codigo_ticket = datos_ticket["codigo_ticket"]
+        ticket.codigo_ticket = nuevo_codigo
+
+    def crear_varios(self, tickets: List[Ticket]):
+        """
+        Guarda varios tickets nuevos con una sola escritura.
+        Los códigos se reservan en bloque y se asignan a cada objeto.
+        """
+        if not tickets:
+            return
+        numeros = self._reservar_codigos(len(tickets))
+        registros = [
+            self._a_registro(ticket, f"TIC-{numero}") for ticket, numero in zip(tickets, numeros)
+        ]
+
+        self._almacen.insertar_varios(registros)
+
+        for ticket, registro in zip(tickets, registros):
+            ticket.codigo_ticket = registro["codigo_ticket"]
 
     def actualizar_por_codigo(self, ticket: Ticket, codigo_ticket: str) -> bool:
         """
         Actualiza un ticket existente por su código.
         Devuelve True si se actualizó, False si no se encontró.
         """
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista_tickets = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        t = self._almacen.buscar(codigo_ticket)
+        if t is None:
             return False
 
-        actualizado = False
-        productos_serializados = [
-            {
-                "codigo": p.get("codigo"),
-                "nombre": p.get("nombre"),
-                "precio": p.get("precio"),
-                "cantidad": p.get("cantidad")
-            } for p in ticket.productos
-        ]
+        return self._almacen.actualizar(codigo_ticket, {**t, **self._a_registro(ticket, codigo_ticket)})
 
-        for t in lista_tickets:
-            if t.get('codigo_ticket') == codigo_ticket:
-                t.update({
-                    "servicio": ticket.servicio,
-                    "codigo_cliente": ticket.codigo_cliente,
-                    "cliente": ticket.cliente,
-                    "productos": productos_serializados,
-                    "total": ticket.total,
-                    "fecha": ticket.fecha.isoformat()
-                })
-                actualizado = True
-                break
-
-        if actualizado:
-            with open(self.archivo, 'w', encoding='utf-8') as f:
-                json.dump(lista_tickets, f, indent=4, ensure_ascii=False)
-
-        return actualizado
+    def _a_ticket(self, t: dict) -> Ticket:
+        return Ticket(
+            codigo_ticket=t['codigo_ticket'],
+            servicio=t['servicio'],
+            codigo_cliente=t['codigo_cliente'],
+            cliente=t['cliente'],
+            productos=t['productos'],
+            total=t['total'],
+            fecha=datetime.fromisoformat(t['fecha'])
+        )
 
     def cargar_por_codigo(self, codigo_ticket: str) -> Optional[Ticket]:
         """
         Carga un ticket por su código_ticket.
         Devuelve un objeto Ticket o None si no existe.
         """
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista_tickets = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        t = self._almacen.buscar(codigo_ticket)
+        if t is None:
             return None
 
-        for t in lista_tickets:
-            if t.get('codigo_ticket') == codigo_ticket:
-                return Ticket(
-                    codigo_ticket=t['codigo_ticket'],
-                    servicio=t['servicio'],
-                    codigo_cliente=t['codigo_cliente'],
-                    cliente=t['cliente'],
-                    productos=t['productos'],
-                    total=t['total'],
-                    fecha=datetime.fromisoformat(t['fecha'])
-                )
-        return None
-    
+        return self._a_ticket(t)
+
+    def iterar_todos(self) -> Iterator[Ticket]:
+        """
+        Recorre todos los tickets de a uno, sin armar la lista completa.
+        Si la caché no está cargada, el archivo se lee en streaming.
+        """
+        for t in self._almacen.iterar():
+            yield self._a_ticket(t)
+
     def cargar_todos(self) -> List[Ticket]:
         """Devuelve todos los tickets."""
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                datos = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-        tickets = []
-        for t in datos:
-            tickets.append(
-                Ticket(
-                    codigo_ticket=t['codigo_ticket'],
-                    servicio=t['servicio'],
-                    codigo_cliente=t['codigo_cliente'],
-                    cliente=t['cliente'],
-                    productos=t['productos'],
-                    total=t['total'],
-                    fecha=datetime.fromisoformat(t['fecha'])
-                )
-            )
-        return tickets
+        return list(self.iterar_todos())
+
+    def iterar_por_rango(self, desde: datetime, hasta: datetime) -> Iterator[Ticket]:
+        """
+        Recorre los tickets con fecha entre `desde` y `hasta`, ambos incluidos.
+        Las fechas se comparan como texto ISO y solo se convierten las de los
+        tickets que entran. Con almacenamiento particionado se leen solo los
+        meses del rango; con un archivo único se recorre completo.
+        """
+        desde_iso, hasta_iso = desde.isoformat(), hasta.isoformat()
+        if isinstance(self._almacen, AlmacenParticionado):
+            registros = self._almacen.iterar_rango(desde_iso, hasta_iso)
+        else:
+            registros = (t for t in self._almacen.iterar() if desde_iso <= t['fecha'] <= hasta_iso)
+        for t in registros:
+            yield self._a_ticket(t)
+
+    def codigos_por_cliente(self, codigo_cliente: str) -> List[str]:
+        """Códigos de los tickets de un cliente, sin armar los objetos."""
+        return [t['codigo_ticket'] for t in self._almacen.buscar_todos_por('codigo_cliente', codigo_cliente)]
+
+    def iterar_por_cliente(self, codigo_cliente: str) -> Iterator[Ticket]:
+        """Recorre los tickets de un cliente usando el índice por cliente."""
+        for t in self._almacen.buscar_todos_por('codigo_cliente', codigo_cliente):
+            yield self._a_ticket(t)
 
     def cargar_todos_por_cliente(self, codigo_cliente: str) -> List[Ticket]:
         """
         Devuelve todos los tickets asociados a un código de cliente.
         """
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista_tickets = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
-
-        tickets_cliente = []
-        for t in lista_tickets:
-            if t.get('codigo_cliente') == codigo_cliente:
-                tickets_cliente.append(
-                    Ticket(
-                        codigo_ticket=t['codigo_ticket'],
-                        servicio=t['servicio'],
-                        codigo_cliente=t['codigo_cliente'],
-                        cliente=t['cliente'],
-                        productos=t['productos'],
-                        total=t['total'],
-                        fecha=datetime.fromisoformat(t['fecha'])
-                    )
-                )
-        return tickets_cliente
+        return list(self.iterar_por_cliente(codigo_cliente))
 
     def eliminar_por_codigo(self, codigo_ticket: str) -> bool:
         """
         Elimina un ticket por su código_ticket.
         Devuelve True si se eliminó, False si no se encontró.
         """
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista_tickets = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return False
-
-        original_len = len(lista_tickets)
-        lista_tickets = [t for t in lista_tickets if t.get('codigo_ticket') != codigo_ticket]
+        return self._almacen.eliminar(codigo_ticket) is not None
 
-        if len(lista_tickets) < original_len:
-            with open(self.archivo, 'w', encoding='utf-8') as f:
-                json.dump(lista_tickets, f, indent=4, ensure_ascii=False)
-            return True
-        return False
\ No newline at end of file
+    def eliminar_varios(self, codigos_ticket: List[str]) -> int:
+        """Elimina varios tickets con una sola escritura. Devuelve cuántos se eliminaron."""
+        with self.agrupar():
+            return sum(self._almacen.eliminar(codigo) is not None for codigo in codigos_ticket)
\ No newline at end of file
@@ -0,0 +1,205 @@
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from models.tickets import LineaTicket, Ticket
+from repositories.conexion_sqlite import (
+    RUTA_BD, en_bloques, filas_en_bloques, marcadores, obtener_conexion, reservar_codigos,
+    siguiente_codigo, transaccion, version_datos
+)
+from repositories.observadores import Observable
+
+
+class TicketsSqliteRepo:
+    """
+    Implementación de TicketsRepo sobre SQLite.
+    La cabecera va en `tickets` y los ítems en `ticket_productos`.
+    """
+
+    def __init__(self, ruta_bd: str = RUTA_BD) -> None:
+        self.ruta_bd = ruta_bd
+        self.conexion = obtener_conexion(ruta_bd)
+        self._cambios = Observable()
+        self._version_datos = version_datos(self.conexion)
+
+    def _a_registro(self, ticket: Ticket, codigo_ticket: str) -> dict:
+        """Ticket en la forma de registro que reciben los observadores (la de TicketsRepo)."""
+        return {
+            "codigo_ticket": codigo_ticket,
+            "servicio": ticket.servicio,
+            "codigo_cliente": ticket.codigo_cliente,
+            "cliente": ticket.cliente,
+            "productos": [p.como_dict() for p in ticket.productos],
+            "total": ticket.total,
+            "fecha": ticket.fecha.isoformat()
+        }
+
+    def _registro(self, codigo_ticket: str) -> Optional[dict]:
+        ticket = self.cargar_por_codigo(codigo_ticket)
+        return self._a_registro(ticket, codigo_ticket) if ticket else None
+
+    def suscribir(self, observador):
+        self._cambios.suscribir(observador)
+
+    def verificar_cambios(self):
+        """Avisa 'recargar' a los observadores si otra conexión modificó la base."""
+        version = version_datos(self.conexion)
+        if version != self._version_datos:
+            self._version_datos = version
+            self._cambios.notificar('recargar')
+
+    def _insertar_productos(self, cx: sqlite3.Connection, codigo_ticket: str, productos: List[LineaTicket]) -> None:
+        cx.executemany(
+            "INSERT INTO ticket_productos (codigo_ticket, posicion, codigo, nombre, precio, cantidad)"
+            " VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (codigo_ticket, i, p.get("codigo"), p.get("nombre"), p.get("precio"), p.get("cantidad"))
+                for i, p in enumerate(productos)
+            ]
+        )
+
+    def _productos_de(self, codigos: List[str]) -> Dict[str, List[LineaTicket]]:
+        """Carga los ítems de varios tickets agrupados por código de ticket."""
+        productos: Dict[str, List[LineaTicket]] = {codigo: [] for codigo in codigos}
+        for bloque in en_bloques(codigos):
+            filas = self.conexion.execute(
+                f"SELECT * FROM ticket_productos WHERE codigo_ticket IN ({marcadores(len(bloque))})"
+                " ORDER BY codigo_ticket, posicion",
+                bloque
+            )
+            for f in filas:
+                productos[f['codigo_ticket']].append(
+                    LineaTicket(f['codigo'], f['nombre'], f['precio'], f['cantidad'])
+                )
+        return productos
+
+    def _a_tickets(self, filas: List[sqlite3.Row]) -> List[Ticket]:
+        productos = self._productos_de([f['codigo_ticket'] for f in filas])
+        return [
+            Ticket(
+                codigo_ticket=f['codigo_ticket'],
+                servicio=f['servicio'],
+                codigo_cliente=f['codigo_cliente'],
+                cliente=f['cliente'],
+                productos=productos[f['codigo_ticket']],
+                total=f['total'],
+                fecha=datetime.fromisoformat(f['fecha'])
+            )
+            for f in filas
+        ]
+
+    def crear(self, ticket: Ticket):
+        """Guarda un nuevo ticket con un código TIC-N generado."""
+        with transaccion(self.conexion) as cx:
+            codigo = siguiente_codigo(cx, 'tickets', 'codigo_ticket', 'TIC-')
+            cx.execute(
+                "INSERT INTO tickets (codigo_ticket, servicio, codigo_cliente, cliente, total, fecha)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (codigo, ticket.servicio, ticket.codigo_cliente, ticket.cliente,
+                    ticket.total, ticket.fecha.isoformat())
+            )
+            self._insertar_productos(cx, codigo, ticket.productos)
+
+        ticket.codigo_ticket = codigo
+        self._cambios.notificar('insertar', None, self._a_registro(ticket, codigo))
+
+    def crear_varios(self, tickets: List[Ticket]):
+        """Guarda varios tickets nuevos en una sola transacción, con códigos reservados en bloque."""
+        if not tickets:
+            return
+        with transaccion(self.conexion) as cx:
+            numeros = reservar_codigos(cx, 'tickets', 'codigo_ticket', 'TIC-', len(tickets))
+            codigos = [f"TIC-{numero}" for numero in numeros]
+            cx.executemany(
+                "INSERT INTO tickets (codigo_ticket, servicio, codigo_cliente, cliente, total, fecha)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (codigo, t.servicio, t.codigo_cliente, t.cliente, t.total, t.fecha.isoformat())
+                    for codigo, t in zip(codigos, tickets)
+                ]
+            )
+            for codigo, t in zip(codigos, tickets):
+                self._insertar_productos(cx, codigo, t.productos)
+
+        for codigo, t in zip(codigos, tickets):
+            t.codigo_ticket = codigo
+            self._cambios.notificar('insertar', None, self._a_registro(t, codigo))
+
+    def actualizar_por_codigo(self, ticket: Ticket, codigo_ticket: str) -> bool:
+        """Actualiza cabecera e ítems de un ticket. Devuelve False si no existe."""
+        anterior = self._registro(codigo_ticket)
+        if anterior is None:
+            return False
+        with transaccion(self.conexion) as cx:
+            cursor = cx.execute(
+                "UPDATE tickets SET servicio = ?, codigo_cliente = ?, cliente = ?, total = ?, fecha = ?"
+                " WHERE codigo_ticket = ?",
+                (ticket.servicio, ticket.codigo_cliente, ticket.cliente, ticket.total,
+                    ticket.fecha.isoformat(), codigo_ticket)
+            )
+            if cursor.rowcount == 0:
+                return False
+            cx.execute("DELETE FROM ticket_productos WHERE codigo_ticket = ?", (codigo_ticket,))
+            self._insertar_productos(cx, codigo_ticket, ticket.productos)
+        self._cambios.notificar('actualizar', anterior, self._a_registro(ticket, codigo_ticket))
+        return True
+
+    def cargar_por_codigo(self, codigo_ticket: str) -> Optional[Ticket]:
+        fila = self.conexion.execute(
+            "SELECT * FROM tickets WHERE codigo_ticket = ?", (codigo_ticket,)
+        ).fetchone()
+        return self._a_tickets([fila])[0] if fila else None
+
+    def iterar_todos(self) -> Iterator[Ticket]:
+        # De a bloques: los ítems de cada bloque se traen con una sola consulta
+        for filas in filas_en_bloques(self.conexion, "SELECT * FROM tickets ORDER BY rowid"):
+            yield from self._a_tickets(filas)
+
+    def cargar_todos(self) -> List[Ticket]:
+        return list(self.iterar_todos())
+
+    def iterar_por_rango(self, desde: datetime, hasta: datetime) -> Iterator[Ticket]:
+        # idx_tickets_fecha: las fechas ISO se ordenan como texto
+        for filas in filas_en_bloques(
+            self.conexion, "SELECT * FROM tickets WHERE fecha BETWEEN ? AND ? ORDER BY fecha, rowid",
+            (desde.isoformat(), hasta.isoformat())
+        ):
+            yield from self._a_tickets(filas)
+
+    def codigos_por_cliente(self, codigo_cliente: str) -> List[str]:
+        filas = self.conexion.execute(
+            "SELECT codigo_ticket FROM tickets WHERE codigo_cliente = ? ORDER BY rowid", (codigo_cliente,)
+        )
+        return [f["codigo_ticket"] for f in filas]
+
+    def iterar_por_cliente(self, codigo_cliente: str) -> Iterator[Ticket]:
+        for filas in filas_en_bloques(
+            self.conexion, "SELECT * FROM tickets WHERE codigo_cliente = ? ORDER BY rowid", (codigo_cliente,)
+        ):
+            yield from self._a_tickets(filas)
+
+    def cargar_todos_por_cliente(self, codigo_cliente: str) -> List[Ticket]:
+        return list(self.iterar_por_cliente(codigo_cliente))
+
+    def eliminar_por_codigo(self, codigo_ticket: str) -> bool:
+        anterior = self._registro(codigo_ticket)
+        with transaccion(self.conexion) as cx:
+            cursor = cx.execute("DELETE FROM tickets WHERE codigo_ticket = ?", (codigo_ticket,))
+        if cursor.rowcount > 0 and anterior is not None:
+            self._cambios.notificar('eliminar', anterior, None)
+        return cursor.rowcount > 0
+
+    def eliminar_varios(self, codigos_ticket: List[str]) -> int:
+        """Elimina varios tickets en una sola transacción. Devuelve cuántos se eliminaron."""
+        anteriores = []
+        for bloque in en_bloques(list(dict.fromkeys(codigos_ticket))):
+            filas = self.conexion.execute(
+                f"SELECT * FROM tickets WHERE codigo_ticket IN ({marcadores(len(bloque))})", bloque
+            ).fetchall()
+            anteriores.extend(self._a_registro(t, t.codigo_ticket) for t in self._a_tickets(filas))
+        with transaccion(self.conexion) as cx:
+            for bloque in en_bloques([a['codigo_ticket'] for a in anteriores]):
+                cx.execute(f"DELETE FROM tickets WHERE codigo_ticket IN ({marcadores(len(bloque))})", bloque)
+        for anterior in anteriores:
+            self._cambios.notificar('eliminar', anterior, None)
+        return len(anteriores)
@@ -1,32 +1,48 @@
-import json
 from models.usuarios import Usuario
-from typing import Optional
+from repositories.almacen_json import obtener_almacen
+from repositories.formatos import obtener_formato, ruta_para
+from repositories.secuencias import maximo_codigo, obtener_secuencias
+from typing import Iterator, List, Optional
 import os
 
 class UsuariosRepo:
-    def __init__(self, archivo="data/usuarios.json"):
-        self.archivo = archivo
+    def __init__(self, archivo="data/usuarios.json", formato: str = "json"):
+        self._formato = obtener_formato(formato)
+        self.archivo = ruta_para(archivo, self._formato)
         self._crear_archivo_si_no_existe()
+        self._almacen = obtener_almacen(
+            self.archivo, clave='codigo', indices={'email': lambda u: u['email'].lower()},
+            formato=self._formato
+        )
+        self._secuencias = obtener_secuencias(os.path.dirname(self.archivo))
 
     def _crear_archivo_si_no_existe(self):
         """Crea el directorio 'data' y el archivo si no existen."""
         os.makedirs(os.path.dirname(self.archivo), exist_ok=True)
         if not os.path.exists(self.archivo):
-            with open(self.archivo, 'w', encoding='utf-8') as f:
-                json.dump([], f, indent=4, ensure_ascii=False)
+            self._formato.escribir(self.archivo, [])
+
+    def agrupar(self):
+        """Dentro del bloque `with`, los cambios de usuarios se escriben a disco una sola vez al final."""
+        return self._almacen.agrupar()
+
+    def suscribir(self, observador):
+        """Registra un observador de cambios en los usuarios."""
+        self._almacen.suscribir(observador)
+
+    def verificar_cambios(self):
+        """Detecta cambios hechos por otros procesos y los notifica a los observadores."""
+        self._almacen.verificar()
 
     def guardar_usuarios(self, usuario: Usuario):
         """Guarda un nuevo usuario en el archivo JSON."""
         self._crear_archivo_si_no_existe()
-        with open(self.archivo, 'r', encoding='utf-8') as f:
-            lista = json.load(f)
-        
+
         # Generar código
-        if lista:
-            ultimo = max(int(u['codigo'].replace("USR-", "")) for u in lista)
-            codigo = f"USR-{ultimo + 1}"
-        else:
-            codigo = "USR-1"
+        codigo = self._secuencias.siguiente(
+            "USR-", lambda: maximo_codigo(self._almacen.leer(), 'codigo', "USR-"),
+            lambda codigo: self._almacen.buscar(codigo) is not None
+        )
         
         datos = {
             "codigo": codigo,
@@ -34,70 +50,58 @@ class UsuariosRepo:
             "email": usuario.email,
             "contraseña": usuario.contraseña
         }
-        lista.append(datos)
+        self._almacen.insertar(datos)
 
-        with open(self.archivo, 'w', encoding='utf-8') as f:
-            json.dump(lista, f, indent=4, ensure_ascii=False)
+    def guardar_varios(self, usuarios: List[Usuario]):
+        """Guarda varios usuarios nuevos con una sola escritura."""
+        with self.agrupar():
+            for usuario in usuarios:
+                self.guardar_usuarios(usuario)
 
     def existe_usuario(self, email: str) -> bool:
         """Verifica si ya existe un usuario con ese email."""
         self._crear_archivo_si_no_existe()
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return False
-        return any(u['email'].lower() == email.lower() for u in lista)
+        return self._almacen.buscar_por('email', email.lower()) is not None
 
     def cargar_por_email(self, email: str) -> Optional[Usuario]:
         """Carga un usuario por email."""
         self._crear_archivo_si_no_existe()
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        u = self._almacen.buscar_por('email', email.lower())
+        if u is None:
             return None
-        
-        for u in lista:
-            if u['email'].lower() == email.lower():
-                return Usuario(
-                    nombre=u['nombre'],
-                    email=u['email'],
-                    contraseña=u['contraseña']
-                )
-        return None
+
+        return Usuario(
+            nombre=u['nombre'],
+            email=u['email'],
+            contraseña=u['contraseña']
+        )
+
+    def iterar_todos(self) -> Iterator[Usuario]:
+        """Recorre todos los usuarios de a uno, sin armar la lista completa."""
+        for u in self._almacen.iterar():
+            yield Usuario(
+                nombre=u['nombre'],
+                email=u['email'],
+                contraseña=u['contraseña']
+            )
 
     def actualizar_usuario(self, usuario_actualizado: Usuario, email_anterior: str) -> bool:
         """Actualiza un usuario existente."""
         self._crear_archivo_si_no_existe()
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+        u = self._almacen.buscar_por('email', email_anterior.lower())
+        if u is None:
             return False
 
-        for i, u in enumerate(lista):
-            if u['email'].lower() == email_anterior.lower():
-                lista[i] = {
-                    "codigo": u['codigo'],
-                    "nombre": usuario_actualizado.nombre,
-                    "email": usuario_actualizado.email,
-                    "contraseña": usuario_actualizado.contraseña
-                }
-                with open(self.archivo, 'w', encoding='utf-8') as f:
-                    json.dump(lista, f, indent=4, ensure_ascii=False)
-                return True
-        return False
+        return self._almacen.actualizar(u['codigo'], {
+            "codigo": u['codigo'],
+            "nombre": usuario_actualizado.nombre,
+            "email": usuario_actualizado.email,
+            "contraseña": usuario_actualizado.contraseña
+        })
 
     def eliminar_usuario(self, email: str):
         """Elimina un usuario por email."""
         self._crear_archivo_si_no_existe()
-        try:
-            with open(self.archivo, 'r', encoding='utf-8') as f:
-                lista = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return
-
-        lista = [u for u in lista if u['email'].lower() != email.lower()]
-        with open(self.archivo, 'w', encoding='utf-8') as f:
-            json.dump(lista, f, indent=4, ensure_ascii=False)
\ No newline at end of file
+        u = self._almacen.buscar_por('email', email.lower())
+        if u is not None:
+            self._almacen.eliminar(u['codigo'])
\ No newline at end of file
@@ -0,0 +1,93 @@
+import sqlite3
+from typing import Iterator, List, Optional
+
+from models.usuarios import Usuario
+from repositories.conexion_sqlite import RUTA_BD, obtener_conexion, siguiente_codigo, transaccion, version_datos
+from repositories.observadores import Observable
+
+
+class UsuariosSqliteRepo:
+    """
+    Implementación de UsuariosRepo sobre SQLite (tabla `usuarios`).
+    El email es único y se compara sin distinguir mayúsculas (COLLATE NOCASE).
+    """
+
+    def __init__(self, ruta_bd: str = RUTA_BD) -> None:
+        self.ruta_bd = ruta_bd
+        self.conexion = obtener_conexion(ruta_bd)
+        self._cambios = Observable()
+        self._version_datos = version_datos(self.conexion)
+
+    def _a_usuario(self, fila: sqlite3.Row) -> Usuario:
+        return Usuario(nombre=fila['nombre'], email=fila['email'], contraseña=fila['contraseña'])
+
+    def _fila(self, cx: sqlite3.Connection, columna: str, valor: str) -> Optional[dict]:
+        fila = cx.execute(f"SELECT * FROM usuarios WHERE {columna} = ?", (valor,)).fetchone()
+        return dict(fila) if fila else None
+
+    def suscribir(self, observador):
+        self._cambios.suscribir(observador)
+
+    def verificar_cambios(self):
+        """Avisa 'recargar' a los observadores si otra conexión modificó la base."""
+        version = version_datos(self.conexion)
+        if version != self._version_datos:
+            self._version_datos = version
+            self._cambios.notificar('recargar')
+
+    def guardar_usuarios(self, usuario: Usuario):
+        """Guarda un nuevo usuario con un código USR-N generado."""
+        with transaccion(self.conexion) as cx:
+            codigo = siguiente_codigo(cx, 'usuarios', 'codigo', 'USR-')
+            cx.execute(
+                "INSERT INTO usuarios (codigo, nombre, email, contraseña) VALUES (?, ?, ?, ?)",
+                (codigo, usuario.nombre, usuario.email, usuario.contraseña)
+            )
+            nuevo = self._fila(cx, 'codigo', codigo)
+        self._cambios.notificar('insertar', None, nuevo)
+
+    def guardar_varios(self, usuarios: List[Usuario]):
+        """Guarda varios usuarios nuevos en una sola transacción."""
+        nuevos = []
+        with transaccion(self.conexion) as cx:
+            for usuario in usuarios:
+                codigo = siguiente_codigo(cx, 'usuarios', 'codigo', 'USR-')
+                cx.execute(
+                    "INSERT INTO usuarios (codigo, nombre, email, contraseña) VALUES (?, ?, ?, ?)",
+                    (codigo, usuario.nombre, usuario.email, usuario.contraseña)
+                )
+                nuevos.append(self._fila(cx, 'codigo', codigo))
+        for nuevo in nuevos:
+            self._cambios.notificar('insertar', None, nuevo)
+
+    def existe_usuario(self, email: str) -> bool:
+        fila = self.conexion.execute("SELECT 1 FROM usuarios WHERE email = ?", (email,)).fetchone()
+        return fila is not None
+
+    def cargar_por_email(self, email: str) -> Optional[Usuario]:
+        fila = self.conexion.execute("SELECT * FROM usuarios WHERE email = ?", (email,)).fetchone()
+        return self._a_usuario(fila) if fila else None
+
+    def iterar_todos(self) -> Iterator[Usuario]:
+        for f in self.conexion.execute("SELECT * FROM usuarios ORDER BY rowid"):
+            yield self._a_usuario(f)
+
+    def actualizar_usuario(self, usuario_actualizado: Usuario, email_anterior: str) -> bool:
+        with transaccion(self.conexion) as cx:
+            anterior = self._fila(cx, 'email', email_anterior)
+            cursor = cx.execute(
+                "UPDATE usuarios SET nombre = ?, email = ?, contraseña = ? WHERE email = ?",
+                (usuario_actualizado.nombre, usuario_actualizado.email,
+                    usuario_actualizado.contraseña, email_anterior)
+            )
+            nuevo = self._fila(cx, 'codigo', anterior['codigo']) if anterior else None
+        if cursor.rowcount > 0:
+            self._cambios.notificar('actualizar', anterior, nuevo)
+        return cursor.rowcount > 0
+
+    def eliminar_usuario(self, email: str):
+        with transaccion(self.conexion) as cx:
+            anterior = self._fila(cx, 'email', email)
+            cx.execute("DELETE FROM usuarios WHERE email = ?", (email,))
+        if anterior is not None:
+            self._cambios.notificar('eliminar', anterior, None)
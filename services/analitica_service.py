@@ -0,0 +1,218 @@
+from array import array
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from models.tickets import Ticket
+from repositories.tickets_repo import TicketsRepo
+from config.exceptions import ValidacionError
+
+try:
+    import numpy as np
+except ImportError:  # NumPy es opcional: sin él se calcula con bucles sobre las columnas
+    np = None  # type: ignore
+
+
+class FilaProducto(NamedTuple):
+    codigo: str
+    monto: float
+    unidades: int
+
+
+class DistribucionCliente(NamedTuple):
+    """Distribución de los totales de ticket de un cliente."""
+    codigo: str
+    tickets: int
+    total: float
+    promedio: float
+    minimo: float
+    mediana: float
+    maximo: float
+
+
+class Diccionario:
+    """Codifica valores de texto como enteros consecutivos (0, 1, 2, ...)."""
+
+    def __init__(self) -> None:
+        self.valores: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id_de(self, valor: str) -> int:
+        identificador = self._ids.get(valor)
+        if identificador is None:
+            identificador = self._ids[valor] = len(self.valores)
+            self.valores.append(valor)
+        return identificador
+
+    def __len__(self) -> int:
+        return len(self.valores)
+
+
+class ColumnasTickets:
+    """
+    Tickets cargados en columnas: una fila por ticket y otra por línea de
+    producto, con los textos (clientes, productos, meses) codificados como
+    enteros. Los agregados se calculan sobre columnas enteras de una vez.
+
+    Las columnas se arman con el módulo `array` (tipos C contiguos, sin un
+    objeto Python por valor). Si NumPy está instalado se ven como arreglos
+    de NumPy sin copiarlas y los cálculos son vectorizados; si no, se
+    recorren con bucles simples que dan el mismo resultado.
+    """
+
+    def __init__(self, vectorizado: Optional[bool] = None) -> None:
+        if vectorizado and np is None:
+            raise ValueError("El cálculo vectorizado necesita NumPy instalado.")
+        self.vectorizado = np is not None if vectorizado is None else vectorizado
+        self.clientes = Diccionario()
+        self.productos = Diccionario()
+        self.meses = Diccionario()
+        # Por ticket
+        self.ticket_cliente = array('i')
+        self.ticket_mes = array('i')
+        self.ticket_total = array('d')
+        # Por línea de producto
+        self.linea_producto = array('i')
+        self.linea_cliente = array('i')
+        self.linea_cantidad = array('q')
+        self.linea_monto = array('d')
+
+    @classmethod
+    def desde_tickets(cls, tickets: Iterable[Ticket], vectorizado: Optional[bool] = None) -> "ColumnasTickets":
+        columnas = cls(vectorizado)
+        columnas.agregar(tickets)
+        return columnas
+
+    def agregar(self, tickets: Iterable[Ticket]) -> None:
+        # Métodos ligados a variables locales: es el bucle caliente de la carga
+        id_cliente, id_producto, id_mes = self.clientes.id_de, self.productos.id_de, self.meses.id_de
+        ticket_cliente, ticket_mes, ticket_total = (
+            self.ticket_cliente.append, self.ticket_mes.append, self.ticket_total.append
+        )
+        linea_producto, linea_cliente, linea_cantidad, linea_monto = (
+            self.linea_producto.append, self.linea_cliente.append,
+            self.linea_cantidad.append, self.linea_monto.append
+        )
+        for t in tickets:
+            cliente = id_cliente(t.codigo_cliente)
+            ticket_cliente(cliente)
+            ticket_mes(id_mes(f"{t.fecha.year:04d}-{t.fecha.month:02d}"))
+            ticket_total(t.total)
+            for p in t.productos:
+                cantidad = p['cantidad']
+                linea_producto(id_producto(p['codigo']))
+                linea_cliente(cliente)
+                linea_cantidad(cantidad)
+                linea_monto(p['precio'] * cantidad)
+
+    def _np(self, columna: array):
+        # Vista de NumPy sobre el mismo buffer, sin copia
+        return np.frombuffer(columna, dtype=columna.typecode)
+
+    def _sumar_por(self, ids: array, valores: array, cantidad: int) -> List[float]:
+        """Suma `valores` agrupando por `ids` (0..cantidad-1)."""
+        if self.vectorizado:
+            if not ids:
+                return [0.0] * cantidad
+            return np.bincount(self._np(ids), weights=self._np(valores), minlength=cantidad).tolist()
+        sumas = [0.0] * cantidad
+        for identificador, valor in zip(ids, valores):
+            sumas[identificador] += valor
+        return sumas
+
+    def ingresos(self) -> float:
+        if self.vectorizado:
+            return float(self._np(self.ticket_total).sum())
+        return float(sum(self.ticket_total))
+
+    def unidades(self) -> int:
+        if self.vectorizado:
+            return int(self._np(self.linea_cantidad).sum())
+        return sum(self.linea_cantidad)
+
+    def por_mes(self) -> Dict[str, float]:
+        """Ingresos por mes (AAAA-MM), en orden cronológico."""
+        sumas = self._sumar_por(self.ticket_mes, self.ticket_total, len(self.meses))
+        return dict(sorted(zip(self.meses.valores, sumas)))
+
+    def top_productos(self, n: int = 10, por: str = "monto") -> List[FilaProducto]:
+        """Los `n` productos con más ingresos (por="monto") o más unidades (por="unidades")."""
+        if por not in ("monto", "unidades"):
+            raise ValidacionError("El orden debe ser 'monto' o 'unidades'.")
+        cantidad = len(self.productos)
+        montos = self._sumar_por(self.linea_producto, self.linea_monto, cantidad)
+        unidades = self._sumar_por(self.linea_producto, self.linea_cantidad, cantidad)
+        criterio = montos if por == "monto" else unidades
+        if self.vectorizado and cantidad > n:
+            # Solo se ordenan los n candidatos, no todo el catálogo
+            valores = np.asarray(criterio)
+            candidatos = np.argpartition(-valores, n)[:n]
+            orden = sorted(candidatos.tolist(), key=lambda i: (-criterio[i], i))
+        else:
+            orden = sorted(range(cantidad), key=lambda i: (-criterio[i], i))[:n]
+        return [FilaProducto(self.productos.valores[i], montos[i], int(unidades[i])) for i in orden]
+
+    def por_cliente(self) -> Dict[str, DistribucionCliente]:
+        """Cantidad de tickets, total, promedio, mínimo, mediana y máximo de cada cliente."""
+        cantidad = len(self.clientes)
+        if self.vectorizado:
+            clientes = self._np(self.ticket_cliente)
+            totales = self._np(self.ticket_total)
+            # Totales ordenados dentro de cada cliente: los estadísticos de orden salen por índice
+            orden = np.lexsort((totales, clientes))
+            ordenados = totales[orden]
+            conteos = np.bincount(clientes, minlength=cantidad)
+            inicios = np.concatenate(([0], np.cumsum(conteos)[:-1]))
+            con_tickets = conteos > 0
+            sumas = np.bincount(clientes, weights=totales, minlength=cantidad)
+            minimos = np.zeros(cantidad)
+            maximos = np.zeros(cantidad)
+            medianas = np.zeros(cantidad)
+            primeros = inicios[con_tickets]
+            ultimos = primeros + conteos[con_tickets] - 1
+            minimos[con_tickets] = ordenados[primeros]
+            maximos[con_tickets] = ordenados[ultimos]
+            medianas[con_tickets] = (ordenados[(primeros + ultimos) // 2] + ordenados[(primeros + ultimos + 1) // 2]) / 2
+            filas = zip(conteos.tolist(), sumas.tolist(), minimos.tolist(), medianas.tolist(), maximos.tolist())
+        else:
+            por_cliente: List[List[float]] = [[] for _ in range(cantidad)]
+            for cliente, total in zip(self.ticket_cliente, self.ticket_total):
+                por_cliente[cliente].append(total)
+            filas = []
+            for valores in por_cliente:
+                valores.sort()
+                medio = len(valores) - 1
+                filas.append((len(valores), sum(valores), valores[0], (valores[medio // 2] + valores[(medio + 1) // 2]) / 2,
+                                valores[-1]))
+        return {
+            codigo: DistribucionCliente(codigo, tickets, total, total / tickets, minimo, mediana, maximo)
+            for codigo, (tickets, total, minimo, mediana, maximo) in zip(self.clientes.valores, filas)
+            if tickets
+        }
+
+
+class AnaliticaService:
+    """
+    Análisis del historial de tickets (ingresos por mes, productos más
+    vendidos, distribución por cliente) calculado en bloque sobre columnas.
+    A diferencia de ReportesService, que responde totales fijos al instante,
+    aquí cada análisis carga los tickets del período pedido.
+    """
+
+    def __init__(self, tickets_repo: TicketsRepo):
+        self.tickets_repo = tickets_repo
+
+    def cargar(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None,
+                vectorizado: Optional[bool] = None) -> ColumnasTickets:
+        """
+        Carga en columnas los tickets entre `desde` y `hasta` (ambos
+        incluidos), o todos si no se indican.
+        """
+        if desde is None and hasta is None:
+            tickets = self.tickets_repo.iterar_todos()
+        else:
+            tickets = self.tickets_repo.iterar_por_rango(desde or datetime.min, hasta or datetime.max)
+        return ColumnasTickets.desde_tickets(tickets, vectorizado)
+
+    def cargar_anio(self, anio: int, vectorizado: Optional[bool] = None) -> ColumnasTickets:
+        """Carga en columnas los tickets de un año calendario."""
+        return self.cargar(datetime(anio, 1, 1), datetime(anio, 12, 31, 23, 59, 59, 999999), vectorizado)
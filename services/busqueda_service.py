@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+from services.indice_texto import Coincidencia, IndiceTrigramas
+
+
+class BusquedaService:
+    """
+    Búsqueda aproximada (tolerante a errores de tipeo) sobre un campo de
+    texto de un repositorio de catálogo, por ejemplo el nombre de los
+    productos o el tipo de los extintores.
+
+    El índice de trigramas se construye al primer uso y luego se mantiene
+    con los cambios que notifica el repositorio; si el repositorio avisa que
+    los datos cambiaron por fuera ("recargar"), se reconstruye al siguiente
+    uso. Cada búsqueda puntúa solo los registros que comparten trigramas
+    con el texto buscado.
+    """
+
+    def __init__(self, repo, campo: str):
+        self.repo = repo
+        self.campo = campo
+        self._indice: Optional[IndiceTrigramas] = None
+        repo.suscribir(self._al_cambiar)
+
+    def _al_cambiar(self, evento: str, anterior: Optional[dict], nuevo: Optional[dict]) -> None:
+        indice = self._indice
+        if indice is None:
+            return  # Aún no se construyó; se armará completo al usarse
+        if evento == 'recargar':
+            self._indice = None
+            return
+        if anterior is not None and (nuevo is None or nuevo['codigo'] != anterior['codigo']):
+            indice.quitar(anterior['codigo'])
+        if nuevo is not None:
+            indice.agregar(nuevo['codigo'], str(nuevo[self.campo]))
+
+    def _indice_actual(self) -> IndiceTrigramas:
+        self.repo.verificar_cambios()
+        indice = self._indice
+        if indice is None:
+            indice = IndiceTrigramas()
+            for item in self.repo.iterar_todos():
+                indice.agregar(item.codigo, str(getattr(item, self.campo)))
+            self._indice = indice
+        return indice
+
+    def buscar(self, texto: str, limite: Optional[int] = None) -> List[Coincidencia]:
+        """Códigos que coinciden con el texto, de mejor a peor; con `limite`, solo los mejores."""
+        return self._indice_actual().buscar(texto, limite)
+
+    def buscar_items(self, texto: str, limite: Optional[int] = None) -> list:
+        """Como buscar(), pero devuelve los objetos del repositorio en el mismo orden."""
+        codigos = [c.clave for c in self.buscar(texto, limite)]
+        encontrados = self.repo.cargar_por_codigos(codigos)
+        return [encontrados[codigo] for codigo in codigos if codigo in encontrados]
@@ -0,0 +1,104 @@
+from functools import partial
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from repositories.productos_repo import ProductosRepo
+from repositories.extintores_repo import ExtintoresRepo
+from services.busqueda_service import BusquedaService
+from services.indice_texto import mejores
+
+
+class EntradaCatalogo(NamedTuple):
+    """Lo que un ticket necesita de un ítem del catálogo."""
+    tipo: str  # "producto" o "extintor"
+    codigo: str
+    nombre: str
+    precio: float
+
+
+# Prefijo de código → catálogo donde vive
+PREFIJOS = {
+    "PRO-": "producto",
+    "EXT-": "extintor",
+}
+
+
+class CatalogoService:
+    """
+    Índice único del catálogo (productos y extintores): código → EntradaCatalogo.
+
+    Cada código se busca solo en el catálogo que indica su prefijo. El índice
+    de cada catálogo se construye al primer uso y luego se mantiene con los
+    cambios que notifica su repositorio; si el repositorio avisa que los
+    datos cambiaron por fuera ("recargar"), solo ese catálogo se reconstruye.
+    """
+
+    def __init__(self, productos_repo: ProductosRepo, extintores_repo: ExtintoresRepo):
+        self.productos_repo = productos_repo
+        self.extintores_repo = extintores_repo
+        self._repos = {"producto": productos_repo, "extintor": extintores_repo}
+        self._indices: Dict[str, Optional[Dict[str, EntradaCatalogo]]] = {
+            tipo: None for tipo in self._repos
+        }
+        for tipo, repo in self._repos.items():
+            repo.suscribir(partial(self._al_cambiar, tipo))
+        # Búsqueda por nombre en ambos catálogos, para cargar tickets sin saber el código
+        self._busquedas = {tipo: BusquedaService(repo, 'nombre') for tipo, repo in self._repos.items()}
+
+    def _al_cambiar(self, tipo: str, evento: str, anterior: Optional[dict], nuevo: Optional[dict]) -> None:
+        indice = self._indices[tipo]
+        if indice is None:
+            return  # Aún no se construyó; se armará completo al usarse
+        if evento == 'recargar':
+            self._indices[tipo] = None
+            return
+        if anterior is not None:
+            indice.pop(anterior['codigo'], None)
+        if nuevo is not None:
+            indice[nuevo['codigo']] = EntradaCatalogo(tipo, nuevo['codigo'], nuevo['nombre'], nuevo['precio'])
+
+    def _indice(self, tipo: str) -> Dict[str, EntradaCatalogo]:
+        repo = self._repos[tipo]
+        repo.verificar_cambios()
+        indice = self._indices[tipo]
+        if indice is None:
+            indice = {
+                item.codigo: EntradaCatalogo(tipo, item.codigo, item.nombre, item.precio)
+                for item in repo.cargar_todos()
+            }
+            self._indices[tipo] = indice
+        return indice
+
+    def _tipos_para(self, codigo: str) -> Tuple[str, ...]:
+        for prefijo, tipo in PREFIJOS.items():
+            if codigo.startswith(prefijo):
+                return (tipo,)
+        # Código sin prefijo conocido: se mantiene el orden histórico
+        return ("producto", "extintor")
+
+    def resolver(self, codigos: Iterable[str]) -> Dict[str, EntradaCatalogo]:
+        """
+        Devuelve código → EntradaCatalogo para los códigos que existen.
+        Todos los códigos de un ticket se resuelven en una sola pasada.
+        """
+        indices: Dict[str, Dict[str, EntradaCatalogo]] = {}
+        encontrados: Dict[str, EntradaCatalogo] = {}
+        for codigo in set(codigos):
+            for tipo in self._tipos_para(codigo):
+                if tipo not in indices:
+                    indices[tipo] = self._indice(tipo)
+                entrada = indices[tipo].get(codigo)
+                if entrada is not None:
+                    encontrados[codigo] = entrada
+                    break
+        return encontrados
+
+    def buscar(self, texto: str, limite: int = 10) -> List[EntradaCatalogo]:
+        """
+        Los `limite` ítems de ambos catálogos con el nombre más parecido al
+        texto (tolerante a errores de tipeo), del mejor al peor.
+        """
+        coincidencias = []
+        for busqueda in self._busquedas.values():
+            coincidencias.extend(busqueda.buscar(texto, limite))
+        elegidas = mejores(coincidencias, limite)
+        entradas = self.resolver(c.clave for c in elegidas)
+        return [entradas[c.clave] for c in elegidas if c.clave in entradas]
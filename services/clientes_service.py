@@ -1,13 +1,70 @@
-from typing import List
+from datetime import date
+from typing import Dict, Iterator, List, Optional
 from models.clientes import Cliente
 from repositories.clientes_repo import ClientesRepo
+from services.indice_texto import IndiceInvertido, IndiceTrigramas
+from services.renovaciones_service import MESES, RenovacionesService, VencimientoMes
+from services.relaciones_service import RelacionesService
 from config.exceptions import ValidacionError, NotFoundError, ConflictError, RepositoryError
 import re
 
 
 class ClientesService:
-    def __init__(self, repo: ClientesRepo):
+    def __init__(self, repo: ClientesRepo, relaciones: Optional[RelacionesService] = None):
         self.repo = repo
+        # Tickets que referencian a cada cliente; sin él no se controlan al eliminar
+        self.relaciones = relaciones
+        # Índice de palabras de empresa y encargado (prefijos) y, por campo,
+        # de subcadenas para buscar_por_nombre. Se arman al primer uso y se
+        # mantienen con los cambios del repositorio.
+        self._indice: Optional[IndiceInvertido] = None
+        self._subcadenas: Dict[str, IndiceTrigramas] = {}
+        repo.suscribir(self._al_cambiar)
+        # Vencimientos por mes y plan de renovaciones
+        self.renovaciones = RenovacionesService(repo)
+
+    def _al_cambiar(self, evento: str, anterior: Optional[dict], nuevo: Optional[dict]) -> None:
+        indice = self._indice
+        if indice is None:
+            return  # Aún no se construyó; se armará completo al usarse
+        if evento == 'recargar':
+            self._indice = None
+            self._subcadenas = {}
+            return
+        if anterior is not None and (nuevo is None or nuevo['codigo'] != anterior['codigo']):
+            indice.quitar(anterior['codigo'])
+            for subcadenas in self._subcadenas.values():
+                subcadenas.quitar(anterior['codigo'])
+        if nuevo is not None:
+            indice.agregar(nuevo['codigo'], f"{nuevo['nombre_empresa']} {nuevo['nombre_encargado']}")
+            for campo, subcadenas in self._subcadenas.items():
+                subcadenas.agregar(nuevo['codigo'], nuevo[campo])
+
+    def _indice_nombres(self) -> IndiceInvertido:
+        self.repo.verificar_cambios()
+        indice = self._indice
+        if indice is None:
+            indice = IndiceInvertido()
+            subcadenas = {campo: IndiceTrigramas() for campo in ('nombre_empresa', 'nombre_encargado')}
+            for c in self.repo.iterar_todos():
+                indice.agregar(c.codigo, f"{c.nombre_empresa} {c.nombre_encargado}")
+                for campo, trigramas in subcadenas.items():
+                    trigramas.agregar(c.codigo, getattr(c, campo))
+            self._indice, self._subcadenas = indice, subcadenas
+        return indice
+
+    def _otro_con_empresa(self, nombre_empresa: str, codigo: Optional[str] = None) -> bool:
+        """Indica si otro cliente (distinto de `codigo`) ya usa ese nombre de empresa."""
+        # Solo se comparan los candidatos del índice, no todos los clientes
+        candidatos = self._indice_nombres().buscar(nombre_empresa)
+        if candidatos is None:
+            clientes = self.repo.iterar_todos()
+        else:
+            clientes = (self.repo.cargar_por_codigo(c) for c in candidatos if c != codigo)
+        return any(
+            c is not None and c.codigo != codigo and c.nombre_empresa.lower() == nombre_empresa.lower()
+            for c in clientes
+        )
 
     def _validar_nombre_empresa(self, nombre: str) -> None:
         if not nombre or not nombre.strip():
@@ -31,12 +88,8 @@ class ClientesService:
             raise ValidacionError("La dirección es obligatoria.")
 
     def _validar_mes_vencimiento(self, mes: str) -> None:
-        meses_validos = [
-            "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
-            "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
-        ]
-        if mes not in meses_validos:
-            raise ValidacionError(f"Mes inválido. Use uno de: {', '.join(meses_validos)}")
+        if mes not in MESES:
+            raise ValidacionError(f"Mes inválido. Use uno de: {', '.join(MESES)}")
 
     def crear(
         self,
@@ -63,7 +116,7 @@ class ClientesService:
         mes_vencimiento = mes_vencimiento.strip().title()
 
         # Evitar duplicado por nombre de empresa
-        if any(c.nombre_empresa.lower() == nombre_empresa.lower() for c in self.listar_todos()):
+        if self._otro_con_empresa(nombre_empresa):
             raise ConflictError(f"Ya existe un cliente con el nombre '{nombre_empresa}'.")
 
         cliente = Cliente(
@@ -116,10 +169,8 @@ class ClientesService:
         self._validar_mes_vencimiento(mes_vencimiento)
 
         # Evitar duplicado de nombre (excepto si es el mismo cliente)
-        todos = self.listar_todos()
-        for c in todos:
-            if c.codigo != codigo and c.nombre_empresa.lower() == nombre_empresa.lower():
-                raise ConflictError(f"Ya existe otro cliente con el nombre '{nombre_empresa}'.")
+        if self._otro_con_empresa(nombre_empresa, codigo):
+            raise ConflictError(f"Ya existe otro cliente con el nombre '{nombre_empresa}'.")
 
         cliente_actualizado = Cliente(
             codigo=codigo,
@@ -148,12 +199,25 @@ class ClientesService:
             raise NotFoundError(f"Cliente con código '{codigo}' no encontrado.")
         return cliente
 
-    def eliminar(self, codigo: str) -> None:
-        """Elimina un cliente por código."""
-        if not self.repo.cargar_por_codigo(codigo):
+    def eliminar(self, codigo: str, en_cascada: bool = False) -> None:
+        """
+        Elimina un cliente por código.
+        Si tiene tickets, lanza ConflictError; con `en_cascada` elimina
+        primero sus tickets y después el cliente.
+        """
+        if not self.repo.existe_cliente(codigo):
             raise NotFoundError(f"Cliente con código '{codigo}' no encontrado.")
 
+        tickets = self.relaciones.tickets_de_cliente(codigo) if self.relaciones else []
+        if tickets and not en_cascada:
+            raise ConflictError(
+                f"El cliente '{codigo}' tiene {len(tickets)} ticket(s); elimínelos o elimine en cascada.",
+                details=tickets
+            )
+
         try:
+            if tickets:
+                self.relaciones.tickets_repo.eliminar_varios(tickets)  # type: ignore
             self.repo.eliminar_cliente(codigo)
         except Exception as e:
             raise RepositoryError("Error al eliminar el cliente.") from e
@@ -162,17 +226,38 @@ class ClientesService:
         """Devuelve todos los clientes."""
         return self.repo.cargar_todos()
 
+    def iterar_todos(self) -> Iterator[Cliente]:
+        """Recorre todos los clientes de a uno, sin cargarlos todos en memoria."""
+        return self.repo.iterar_todos()
+
     def buscar_por_nombre(self, texto: str) -> List[Cliente]:
-        """Búsqueda parcial por nombre de empresa o encargado."""
-        todos = self.listar_todos()
-        texto = texto.lower().strip()
-        return [
-            c for c in todos
-            if texto in c.nombre_empresa.lower() or texto in c.nombre_encargado.lower()
-        ]
+        """
+        Búsqueda por nombre de empresa o encargado, sin distinguir
+        mayúsculas ni tildes: coincide el cliente en el que el texto aparece
+        dentro de uno de los dos nombres ("gota" encuentra "Bogotá") o en el
+        que cada palabra del texto es el comienzo de alguna palabra de esos
+        nombres ("extin bog" encuentra "Extinción Bogotá"). Los resultados
+        van en orden de alta. Sin palabras, devuelve todos los clientes.
+        """
+        indice = self._indice_nombres()
+        codigos = indice.buscar(texto)
+        if codigos is None:
+            return self.repo.cargar_todos()
+        for subcadenas in self._subcadenas.values():
+            codigos.extend(subcadenas.con_subcadena(texto))
+        codigos = indice.ordenar(codigos)
+        clientes = []
+        for codigo in codigos:
+            cliente = self.repo.cargar_por_codigo(codigo)
+            if cliente is not None:
+                clientes.append(cliente)
+        return clientes
 
     def obtener_por_vencimiento(self, mes: str) -> List[Cliente]:
         """Clientes cuyo contrato vence en un mes específico."""
         self._validar_mes_vencimiento(mes)
-        mes = mes.strip().title()
-        return [c for c in self.listar_todos() if c.mes_vencimiento == mes]
\ No newline at end of file
+        return self.renovaciones.clientes_por_mes(mes.strip().title())
+
+    def plan_renovaciones(self, meses: int = 3, hoy: Optional[date] = None) -> List[VencimientoMes]:
+        """Clientes a renovar en cada uno de los próximos `meses` meses, empezando por el actual."""
+        return self.renovaciones.plan(meses, hoy)
\ No newline at end of file
@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import bcrypt
+
+# Factor de costo de bcrypt: cada punto duplica el tiempo de un hash.
+# 12 es el valor por defecto de bcrypt.gensalt().
+COSTO_POR_DEFECTO = 12
+COSTO_MINIMO = 4
+COSTO_MAXIMO = 31
+
+HASH = "hash"
+VERIFICACION = "verificacion"
+
+
+class MetricasContrasenas:
+    """Contadores de latencia de un tipo de operación (hash o verificación)."""
+
+    def __init__(self) -> None:
+        self.operaciones = 0
+        self.tiempo_total = 0.0  # solo bcrypt
+        self.tiempo_maximo = 0.0
+        self.espera_total = 0.0  # en la cola del pool, antes de empezar
+        self.espera_maxima = 0.0
+
+    def registrar(self, espera: float, duracion: float) -> None:
+        self.operaciones += 1
+        self.tiempo_total += duracion
+        self.tiempo_maximo = max(self.tiempo_maximo, duracion)
+        self.espera_total += espera
+        self.espera_maxima = max(self.espera_maxima, espera)
+
+    def como_dict(self) -> Dict[str, float]:
+        return {
+            "operaciones": self.operaciones,
+            "tiempo_total": self.tiempo_total,
+            "tiempo_promedio": self.tiempo_total / self.operaciones if self.operaciones else 0.0,
+            "tiempo_maximo": self.tiempo_maximo,
+            "espera_total": self.espera_total,
+            "espera_maxima": self.espera_maxima,
+        }
+
+
+class ContrasenasService:
+    """
+    Hash y verificación de contraseñas con bcrypt en un pool acotado de hilos.
+
+    bcrypt libera el GIL mientras calcula, así que varios hilos hashean en
+    paralelo (hasta un núcleo cada uno) y el resto de la aplicación sigue
+    respondiendo durante una ráfaga de inicios de sesión. El pool tiene
+    `trabajadores` hilos y admite hasta `max_pendientes` operaciones
+    encoladas: pasado ese límite, quien pide una operación espera a que se
+    libere lugar en vez de acumular trabajo sin fin.
+
+    Las variantes *_async devuelven un concurrent.futures.Future (con asyncio
+    se espera con `await asyncio.wrap_future(futuro)`); las *_varios
+    reparten una lista entera en el pool, para altas masivas de usuarios.
+    """
+
+    def __init__(self, costo: int = COSTO_POR_DEFECTO, trabajadores: Optional[int] = None,
+                    max_pendientes: Optional[int] = None) -> None:
+        if not COSTO_MINIMO <= costo <= COSTO_MAXIMO:
+            raise ValueError(f"El costo de bcrypt debe estar entre {COSTO_MINIMO} y {COSTO_MAXIMO}.")
+        self.costo = costo
+        self.trabajadores = trabajadores or min(4, os.cpu_count() or 1)
+        self._pendientes = threading.BoundedSemaphore(max_pendientes or self.trabajadores * 8)
+        self._pool = ThreadPoolExecutor(self.trabajadores, thread_name_prefix="bcrypt")
+        self._metricas = {HASH: MetricasContrasenas(), VERIFICACION: MetricasContrasenas()}
+        self._metricas_lock = threading.Lock()
+
+    def _enviar(self, operacion: str, funcion: Callable, *argumentos) -> Future:
+        self._pendientes.acquire()
+        encolado = time.perf_counter()
+
+        def medir():
+            inicio = time.perf_counter()
+            try:
+                return funcion(*argumentos)
+            finally:
+                fin = time.perf_counter()
+                with self._metricas_lock:
+                    self._metricas[operacion].registrar(inicio - encolado, fin - inicio)
+
+        try:
+            futuro = self._pool.submit(medir)
+        except BaseException:
+            self._pendientes.release()
+            raise
+        futuro.add_done_callback(lambda _: self._pendientes.release())
+        return futuro
+
+    def _hashear(self, password: str) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(self.costo)).decode('utf-8')
+
+    @staticmethod
+    def _verificar(password: str, hashed: str) -> bool:
+        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+
+    def hashear_async(self, password: str) -> "Future[str]":
+        return self._enviar(HASH, self._hashear, password)
+
+    def verificar_async(self, password: str, hashed: str) -> "Future[bool]":
+        return self._enviar(VERIFICACION, self._verificar, password, hashed)
+
+    def hashear(self, password: str) -> str:
+        """Hash bcrypt de la contraseña con el costo configurado."""
+        return self.hashear_async(password).result()
+
+    def verificar(self, password: str, hashed: str) -> bool:
+        """Indica si la contraseña coincide con el hash (de cualquier costo)."""
+        return self.verificar_async(password, hashed).result()
+
+    def hashear_varios(self, passwords: Iterable[str]) -> List[str]:
+        """Hashes de varias contraseñas, en el mismo orden, calculados en paralelo."""
+        futuros = [self.hashear_async(password) for password in passwords]
+        return [futuro.result() for futuro in futuros]
+
+    def verificar_varios(self, pares: Iterable[tuple]) -> List[bool]:
+        """Verifica varios pares (contraseña, hash) en paralelo; resultados en el mismo orden."""
+        futuros = [self.verificar_async(password, hashed) for password, hashed in pares]
+        return [futuro.result() for futuro in futuros]
+
+    def metricas(self) -> Dict[str, Dict[str, float]]:
+        """Latencias acumuladas por tipo de operación, para diagnóstico."""
+        with self._metricas_lock:
+            return {operacion: m.como_dict() for operacion, m in self._metricas.items()}
+
+    def cerrar(self) -> None:
+        """Espera las operaciones en curso y libera los hilos del pool."""
+        self._pool.shutdown(wait=True)
@@ -1,12 +1,20 @@
-from typing import List
+from typing import Iterator, List, Optional
 from models.productos import Extintor
 from repositories.extintores_repo import ExtintoresRepo
+from services.busqueda_service import BusquedaService
+from services.rango_service import RangoService
+from services.relaciones_service import RelacionesService
 from config.exceptions import ValidacionError, NotFoundError, ConflictError, RepositoryError
 
 
 class ExtintoresService:
-    def __init__(self, repo: ExtintoresRepo):
+    def __init__(self, repo: ExtintoresRepo, relaciones: Optional[RelacionesService] = None):
         self.repo = repo
+        # Tickets que usan cada código; sin él no se controlan al eliminar
+        self.relaciones = relaciones
+        self.busqueda = BusquedaService(repo, 'nombre')
+        self.busqueda_tipo = BusquedaService(repo, 'tipo')
+        self.por_capacidad = RangoService(repo, 'capacidad')
 
     def _validar_nombre(self, nombre: str) -> str:
         if not nombre or not nombre.strip():
@@ -41,7 +49,7 @@ class ExtintoresService:
         capacidad = self._validar_capacidad(capacidad)
 
         # Evitar duplicado por nombre
-        todos = self.repo.cargar_todos()
+        todos = self.repo.iterar_todos()
         if any(e.nombre.lower() == nombre.lower() for e in todos):
             raise ConflictError(f"Ya existe un extintor con el nombre '{nombre}'.")
 
@@ -68,7 +76,7 @@ class ExtintoresService:
             raise NotFoundError(f"Extintor con código '{codigo}' no encontrado.")
 
         # Evitar duplicado de nombre (excepto si es el mismo)
-        todos = self.repo.cargar_todos()
+        todos = self.repo.iterar_todos()
         for e in todos:
             if e.codigo != codigo and e.nombre.lower() == nombre.lower():
                 raise ConflictError(f"Ya existe otro extintor con el nombre '{nombre}'.")
@@ -98,10 +106,19 @@ class ExtintoresService:
         return extintor
 
     def eliminar(self, codigo: str) -> None:
-        """Elimina un extintor por código."""
+        """Elimina un extintor por código. Lanza ConflictError si algún ticket lo usa."""
         if not self.repo.cargar_por_codigo(codigo):
             raise NotFoundError(f"Extintor con código '{codigo}' no encontrado.")
 
+        # No se elimina un código que figura en tickets: quedarían sin su ítem del catálogo
+        if self.relaciones is not None:
+            tickets = self.relaciones.tickets_con_producto(codigo)
+            if tickets:
+                raise ConflictError(
+                    f"El extintor '{codigo}' figura en {len(tickets)} ticket(s); no se puede eliminar.",
+                    details=tickets
+                )
+
         try:
             self.repo.eliminar_extintor(codigo)
         except Exception as e:
@@ -111,33 +128,40 @@ class ExtintoresService:
         """Devuelve todos los extintores."""
         return self.repo.cargar_todos()
 
-    def buscar_por_tipo(self, tipo: str) -> List[Extintor]:
-        """Busca extintores por tipo (insensible a mayúsculas)."""
+    def iterar_todos(self) -> Iterator[Extintor]:
+        """Recorre todos los extintores de a uno, sin cargarlos todos en memoria."""
+        return self.repo.iterar_todos()
+
+    def buscar_por_tipo(self, tipo: str, limite: Optional[int] = None) -> List[Extintor]:
+        """
+        Busca extintores por tipo, sin distinguir mayúsculas ni tildes:
+        primero los que contienen el texto y después los de tipo parecido
+        (errores de tipeo). Con `limite`, solo los `limite` mejores.
+        """
         if not tipo or not tipo.strip():
             raise ValidacionError("El tipo de búsqueda no puede estar vacío.")
-        tipo = tipo.lower().strip()
-        return [e for e in self.listar_todos() if tipo in e.tipo.lower()]
+        return self.busqueda_tipo.buscar_items(tipo, limite)
+
+    def buscar_por_rango_capacidad(self, capacidad_min: float, capacidad_max: Optional[float], desde: int = 0,
+                                    cantidad: Optional[int] = None, descendente: bool = False) -> List[Extintor]:
+        """
+        Busca extintores por rango de capacidad, ordenados por capacidad (de
+        menor a mayor, o de mayor a menor con `descendente`).
+        Si capacidad_max es None, busca >= capacidad_min.
+        `desde` y `cantidad` permiten pedir el resultado por páginas.
+        """
+        return self.por_capacidad.buscar_items(capacidad_min, capacidad_max, desde, cantidad, descendente)
+
+    def contar_por_rango_capacidad(self, capacidad_min: float, capacidad_max: Optional[float]) -> int:
+        """Cantidad de extintores en el rango de capacidad, sin cargarlos."""
+        return self.por_capacidad.contar(capacidad_min, capacidad_max)
 
-    def buscar_por_rango_capacidad(self, capacidad_min: float, capacidad_max: float) -> List[Extintor]:
+    def buscar_por_nombre(self, texto: str, limite: Optional[int] = None) -> List[Extintor]:
         """
-        Busca extintores por rango de capacidad.
+        Búsqueda por nombre sin distinguir mayúsculas ni tildes: primero los
+        que contienen el texto y después los parecidos (errores de tipeo).
+        Con `limite`, solo los `limite` mejores; por defecto, todos.
         """
-        if capacidad_max is not None and capacidad_max < capacidad_min:
-            raise ValidacionError("capacidad_max debe ser mayor o igual a capacidad_min.")
-
-        resultados = []
-        for e in self.listar_todos():
-            if capacidad_max is None:
-                if e.capacidad >= capacidad_min:
-                    resultados.append(e)
-            else:
-                if capacidad_min <= e.capacidad <= capacidad_max:
-                    resultados.append(e)
-        return resultados
-
-    def buscar_por_nombre(self, texto: str) -> List[Extintor]:
-        """Búsqueda parcial por nombre."""
         if not texto or not texto.strip():
             raise ValidacionError("El texto de búsqueda no puede estar vacío.")
-        texto = texto.lower().strip()
-        return [e for e in self.listar_todos() if texto in e.nombre.lower()]
\ No newline at end of file
+        return self.busqueda.buscar_items(texto, limite)
\ No newline at end of file
@@ -0,0 +1,135 @@
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Tuple, Union
+from models.tickets import Ticket
+from services.tickets_service import TicketsService
+from config.exceptions import BaseAppException, ValidacionError, RepositoryError
+
+
+class ResultadoImportacion:
+    def __init__(self):
+        self.importados: List[Ticket] = []
+        self.errores: List[Tuple[int, str]] = []  # (número de fila, mensaje)
+
+
+class ImportacionService:
+    """
+    Importación masiva de tickets históricos desde CSV o JSONL.
+
+    CSV (con encabezado), una fila por ticket:
+        servicio,codigo_cliente,productos,fecha
+        Recarga,CLI-1,PRO-1:2;EXT-3:1,2024-05-10T09:30:00
+
+    JSONL, un objeto por línea:
+        {"servicio": "Recarga", "codigo_cliente": "CLI-1",
+         "productos": [{"codigo": "PRO-1", "cantidad": 2}], "fecha": "2024-05-10T09:30:00"}
+
+    La fecha es opcional (por defecto, el momento de la importación).
+    El archivo se lee fila por fila y cada ticket se valida y valoriza contra
+    el índice del catálogo en memoria. Las filas válidas se guardan todas
+    juntas, con una sola escritura y códigos TIC- reservados en bloque; las
+    inválidas quedan en el reporte de errores con su número de fila.
+    """
+
+    def __init__(self, tickets_service: TicketsService):
+        self.tickets_service = tickets_service
+
+    def _filas_csv(self, f) -> Iterator[Tuple[int, Union[Dict, ValidacionError]]]:
+        # La fila 1 es el encabezado
+        for numero, fila in enumerate(csv.DictReader(f), start=2):
+            productos = []
+            for parte in (fila.get('productos') or '').split(';'):
+                if not parte.strip():
+                    continue
+                codigo, _, cantidad = parte.partition(':')
+                try:
+                    cantidad = int(cantidad)
+                except ValueError:
+                    yield numero, ValidacionError(f"Cantidad inválida en '{parte.strip()}'.")
+                    break
+                productos.append({'codigo': codigo.strip(), 'cantidad': cantidad})
+            else:
+                yield numero, {
+                    'servicio': fila.get('servicio') or '',
+                    'codigo_cliente': (fila.get('codigo_cliente') or '').strip(),
+                    'productos': productos,
+                    'fecha': fila.get('fecha')
+                }
+
+    def _filas_jsonl(self, f) -> Iterator[Tuple[int, Union[Dict, ValidacionError]]]:
+        for numero, linea in enumerate(f, start=1):
+            if not linea.strip():
+                continue
+            try:
+                entrada = json.loads(linea)
+            except json.JSONDecodeError:
+                yield numero, ValidacionError("JSON inválido.")
+                continue
+            if not isinstance(entrada, dict):
+                yield numero, ValidacionError("Cada línea debe ser un objeto JSON.")
+                continue
+            yield numero, entrada
+
+    def _preparar(self, entrada: Dict) -> Ticket:
+        fecha = entrada.get('fecha')
+        if fecha:
+            try:
+                fecha = datetime.fromisoformat(fecha)
+            except (TypeError, ValueError):
+                raise ValidacionError(f"Fecha inválida: '{fecha}'.")
+        # JSONL admite cualquier tipo: se rechazan aquí para que la fila
+        # quede en el reporte en lugar de cortar la importación completa
+        servicio = entrada.get('servicio') or ''
+        if not isinstance(servicio, str):
+            raise ValidacionError("'servicio' debe ser texto.")
+        codigo_cliente = entrada.get('codigo_cliente') or ''
+        if not isinstance(codigo_cliente, str):
+            raise ValidacionError("'codigo_cliente' debe ser texto.")
+        productos = entrada.get('productos')
+        if not isinstance(productos, list) or not all(isinstance(p, dict) for p in productos):
+            raise ValidacionError("'productos' debe ser una lista de ítems.")
+        for item in productos:
+            if not isinstance(item.get('codigo'), str):
+                raise ValidacionError("El código de cada producto debe ser texto.")
+            cantidad = item.get('cantidad')
+            if not isinstance(cantidad, int) or isinstance(cantidad, bool):
+                raise ValidacionError(f"Cantidad inválida para '{item['codigo']}': debe ser un entero.")
+        return self.tickets_service.preparar(servicio, codigo_cliente, productos, fecha=fecha or None)
+
+    def importar(self, ruta: str) -> ResultadoImportacion:
+        """
+        Importa los tickets del archivo (.csv o .jsonl).
+        Devuelve los tickets creados y los errores por fila.
+        """
+        extension = os.path.splitext(ruta)[1].lower()
+        if extension == '.csv':
+            lector = self._filas_csv
+        elif extension in ('.jsonl', '.ndjson'):
+            lector = self._filas_jsonl
+        else:
+            raise ValidacionError("Formato no soportado. Use un archivo .csv o .jsonl.")
+
+        resultado = ResultadoImportacion()
+        validos: List[Ticket] = []
+        try:
+            with open(ruta, 'r', encoding='utf-8', newline='') as f:
+                for numero, entrada in lector(f):
+                    if isinstance(entrada, BaseAppException):
+                        resultado.errores.append((numero, entrada.message))
+                        continue
+                    try:
+                        validos.append(self._preparar(entrada))
+                    except BaseAppException as e:
+                        resultado.errores.append((numero, e.message))
+        except FileNotFoundError:
+            raise ValidacionError(f"No existe el archivo '{ruta}'.")
+
+        try:
+            self.tickets_service.tickets_repo.crear_varios(validos)
+        except Exception as e:
+            raise RepositoryError("Error al guardar los tickets importados.") from e
+
+        resultado.importados = validos
+        return resultado
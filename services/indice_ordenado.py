@@ -0,0 +1,78 @@
+from bisect import bisect_left, bisect_right, insort
+from typing import Dict, List, Optional, Tuple
+
+_INFINITO = float("inf")
+
+
+class IndiceOrdenado:
+    """
+    Índice secundario valor → claves, ordenado por valor para consultas por
+    rango.
+
+    Las entradas (valor, orden de alta, clave) se guardan en una lista
+    ordenada: los extremos de un rango se ubican con búsqueda binaria y el
+    resultado es el tramo contiguo entre ambos, así una consulta cuesta
+    O(log n + k) para k resultados. A igual valor, las claves quedan en el
+    orden en que se agregaron.
+    """
+
+    def __init__(self) -> None:
+        self._entradas: List[Tuple[float, int, str]] = []  # ordenada
+        self._por_clave: Dict[str, Tuple[float, int, str]] = {}
+        self._siguiente = 0
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+    def agregar(self, clave: str, valor: float) -> None:
+        """Indexa el valor de una clave. Si ya estaba, lo reemplaza y conserva su orden."""
+        anterior = self._por_clave.get(clave)
+        if anterior is not None:
+            if anterior[0] == valor:
+                return
+            self._quitar_entrada(anterior)
+            orden = anterior[1]
+        else:
+            orden = self._siguiente
+            self._siguiente += 1
+        entrada = (valor, orden, clave)
+        self._por_clave[clave] = entrada
+        insort(self._entradas, entrada)
+
+    def quitar(self, clave: str) -> None:
+        entrada = self._por_clave.pop(clave, None)
+        if entrada is not None:
+            self._quitar_entrada(entrada)
+
+    def _quitar_entrada(self, entrada: Tuple[float, int, str]) -> None:
+        del self._entradas[bisect_left(self._entradas, entrada)]
+
+    def _tramo(self, minimo: float, maximo: Optional[float]) -> Tuple[int, int]:
+        """Posiciones [inicio, fin) de las entradas con minimo <= valor <= maximo."""
+        inicio = bisect_left(self._entradas, (minimo,))
+        fin = len(self._entradas) if maximo is None else bisect_right(self._entradas, (maximo, _INFINITO))
+        return inicio, max(inicio, fin)
+
+    def contar(self, minimo: float, maximo: Optional[float] = None) -> int:
+        """Cantidad de claves con valor en [minimo, maximo] (maximo None = sin límite)."""
+        inicio, fin = self._tramo(minimo, maximo)
+        return fin - inicio
+
+    def rango(self, minimo: float, maximo: Optional[float] = None, desde: int = 0,
+                cantidad: Optional[int] = None, descendente: bool = False) -> List[str]:
+        """
+        Claves con valor en [minimo, maximo], de menor a mayor valor (o de
+        mayor a menor con `descendente`). `desde` y `cantidad` eligen una
+        página del resultado sin recorrer las anteriores.
+        """
+        inicio, fin = self._tramo(minimo, maximo)
+        entradas = self._entradas
+        if descendente:
+            fin -= desde
+            if cantidad is not None:
+                inicio = max(inicio, fin - cantidad)
+            return [entradas[i][2] for i in range(fin - 1, inicio - 1, -1)]
+        inicio += desde
+        if cantidad is not None:
+            fin = min(fin, inicio + cantidad)
+        return [entradas[i][2] for i in range(inicio, fin)]
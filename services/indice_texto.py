@@ -0,0 +1,254 @@
+import heapq
+import re
+import unicodedata
+from bisect import bisect_left
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+_PALABRA = re.compile(r"\w+")
+
+
+def normalizar(texto: str) -> str:
+    """Minúsculas y sin tildes ni diéresis: 'Extinción Ñandú' → 'extincion nandu'."""
+    descompuesto = unicodedata.normalize("NFKD", texto.casefold())
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def tokenizar(texto: str) -> List[str]:
+    """Palabras normalizadas de un texto, en orden y sin repetir."""
+    return list(dict.fromkeys(_PALABRA.findall(normalizar(texto))))
+
+
+def _compactar(texto: str) -> str:
+    """Texto normalizado con los espacios colapsados, para comparar subcadenas."""
+    return " ".join(normalizar(texto).split())
+
+
+def trigramas(texto: str) -> Set[str]:
+    """
+    Trigramas de las palabras normalizadas, con un espacio de relleno a
+    cada lado: 'abc' → {' ab', 'abc', 'bc '}.
+    """
+    resultado: Set[str] = set()
+    for palabra in tokenizar(texto):
+        relleno = f" {palabra} "
+        resultado.update(relleno[i:i + 3] for i in range(len(relleno) - 2))
+    return resultado
+
+
+class IndiceInvertido:
+    """
+    Índice invertido palabra → claves, con búsqueda por prefijo.
+
+    Cada texto se parte en palabras normalizadas (ver normalizar). El
+    vocabulario se mantiene ordenado, así las palabras que empiezan con un
+    prefijo quedan contiguas y se ubican con búsqueda binaria. Una consulta
+    devuelve las claves en las que cada palabra de la consulta es prefijo de
+    alguna palabra indexada, en el orden en que se agregaron las claves.
+    """
+
+    def __init__(self) -> None:
+        self._publicaciones: Dict[str, Set[str]] = {}
+        self._vocabulario: List[str] = []  # ordenado
+        self._palabras: Dict[str, List[str]] = {}  # clave → sus palabras
+        self._orden: Dict[str, int] = {}
+        self._siguiente = 0
+
+    def __len__(self) -> int:
+        return len(self._palabras)
+
+    def agregar(self, clave: str, texto: str) -> None:
+        """Indexa el texto de una clave. Si ya estaba, reemplaza sus palabras y conserva su orden."""
+        if clave in self._palabras:
+            self._quitar_palabras(clave)
+        else:
+            self._orden[clave] = self._siguiente
+            self._siguiente += 1
+        palabras = tokenizar(texto)
+        self._palabras[clave] = palabras
+        for palabra in palabras:
+            claves = self._publicaciones.get(palabra)
+            if claves is None:
+                claves = self._publicaciones[palabra] = set()
+                self._vocabulario.insert(bisect_left(self._vocabulario, palabra), palabra)
+            claves.add(clave)
+
+    def quitar(self, clave: str) -> None:
+        if clave not in self._palabras:
+            return
+        self._quitar_palabras(clave)
+        del self._palabras[clave]
+        del self._orden[clave]
+
+    def _quitar_palabras(self, clave: str) -> None:
+        for palabra in self._palabras[clave]:
+            claves = self._publicaciones[palabra]
+            claves.discard(clave)
+            if not claves:
+                del self._publicaciones[palabra]
+                del self._vocabulario[bisect_left(self._vocabulario, palabra)]
+
+    def ordenar(self, claves: Iterable[str]) -> List[str]:
+        """Las claves indexadas de `claves`, sin repetir y en orden de alta."""
+        return sorted(set(claves) & self._orden.keys(), key=self._orden.__getitem__)
+
+    def _con_prefijo(self, prefijo: str) -> Set[str]:
+        claves: Set[str] = set()
+        vocabulario = self._vocabulario
+        i = bisect_left(vocabulario, prefijo)
+        while i < len(vocabulario) and vocabulario[i].startswith(prefijo):
+            claves |= self._publicaciones[vocabulario[i]]
+            i += 1
+        return claves
+
+    def buscar(self, consulta: str) -> Optional[List[str]]:
+        """
+        Claves que coinciden con todas las palabras de la consulta (como
+        prefijos), en orden de alta. Devuelve None si la consulta no tiene
+        palabras: quien llama decide si eso significa "todas".
+        """
+        prefijos = tokenizar(consulta)
+        if not prefijos:
+            return None
+        # Primero el prefijo más largo: suele ser el más selectivo
+        resultado: Optional[Set[str]] = None
+        for prefijo in sorted(prefijos, key=len, reverse=True):
+            claves = self._con_prefijo(prefijo)
+            resultado = claves if resultado is None else resultado & claves
+            if not resultado:
+                return []
+        return sorted(resultado, key=self._orden.__getitem__)  # type: ignore
+
+
+class Coincidencia(NamedTuple):
+    clave: str
+    cobertura: float  # fracción de los trigramas de la consulta presentes en el texto
+    similitud: float  # trigramas compartidos sobre la unión (Jaccard)
+    exacta: bool = False  # la consulta aparece tal cual (normalizada) dentro del texto
+
+
+class IndiceTrigramas:
+    """
+    Índice trigrama → claves para búsqueda aproximada.
+
+    Dos textos parecidos comparten la mayoría de sus trigramas aunque
+    tengan errores de tipeo ('extntor' y 'extintor' comparten 5 de 7), así
+    que solo se puntúan las claves que comparten alguno con la consulta, sin
+    recorrer el resto. Se ordena por cobertura de la consulta y, a igual
+    cobertura, por similitud: ante 'polvo', 'Polvo Abc' queda antes que
+    'Extintor De Polvo Químico Seco'.
+
+    Los textos que contienen la consulta tal cual (normalizada) coinciden
+    siempre y van antes que los aproximados, aunque no lleguen al umbral:
+    'ngu' encuentra 'Manguera' y una consulta de una o dos letras, que no
+    alcanza a formar trigramas, busca solo por subcadena.
+    """
+
+    # Cobertura mínima para considerar que un texto coincide con la consulta
+    UMBRAL = 0.45
+
+    def __init__(self) -> None:
+        self._publicaciones: Dict[str, Set[str]] = {}
+        self._trigramas: Dict[str, Set[str]] = {}  # clave → sus trigramas
+        self._textos: Dict[str, str] = {}  # clave → texto normalizado, para subcadenas
+        self._orden: Dict[str, int] = {}
+        self._siguiente = 0
+
+    def __len__(self) -> int:
+        return len(self._trigramas)
+
+    def agregar(self, clave: str, texto: str) -> None:
+        """Indexa el texto de una clave. Si ya estaba, lo reemplaza y conserva su orden."""
+        if clave in self._trigramas:
+            self._quitar_trigramas(clave)
+        else:
+            self._orden[clave] = self._siguiente
+            self._siguiente += 1
+        grupos = trigramas(texto)
+        self._trigramas[clave] = grupos
+        self._textos[clave] = _compactar(texto)
+        for trigrama in grupos:
+            self._publicaciones.setdefault(trigrama, set()).add(clave)
+
+    def quitar(self, clave: str) -> None:
+        if clave not in self._trigramas:
+            return
+        self._quitar_trigramas(clave)
+        del self._trigramas[clave]
+        del self._textos[clave]
+        del self._orden[clave]
+
+    def _quitar_trigramas(self, clave: str) -> None:
+        for trigrama in self._trigramas[clave]:
+            claves = self._publicaciones[trigrama]
+            claves.discard(clave)
+            if not claves:
+                del self._publicaciones[trigrama]
+
+    def _con_subcadena(self, subcadena: str) -> List[str]:
+        """Claves cuyo texto normalizado contiene `subcadena` (ya normalizada)."""
+        # Los trigramas internos de cada palabra de la subcadena también
+        # están en el texto que la contiene: solo se verifican esas claves.
+        # Con palabras de menos de tres letras no hay por dónde filtrar.
+        internos = [
+            palabra[i:i + 3] for palabra in _PALABRA.findall(subcadena) for i in range(len(palabra) - 2)
+        ]
+        if internos:
+            candidatos = set(self._publicaciones.get(internos[0], ()))
+            for trigrama in internos[1:]:
+                candidatos &= self._publicaciones.get(trigrama, set())
+                if not candidatos:
+                    return []
+        else:
+            candidatos = self._textos.keys()
+        return [clave for clave in candidatos if subcadena in self._textos[clave]]
+
+    def con_subcadena(self, texto: str) -> List[str]:
+        """Claves cuyo texto contiene `texto` (sin distinguir mayúsculas ni tildes), en orden de alta."""
+        subcadena = _compactar(texto)
+        if not subcadena:
+            return []
+        return sorted(self._con_subcadena(subcadena), key=self._orden.__getitem__)
+
+    def buscar(self, consulta: str, limite: Optional[int] = None,
+                umbral: float = UMBRAL) -> List[Coincidencia]:
+        """
+        Claves que coinciden con la consulta, de mejor a peor: primero las
+        que la contienen tal cual y después las aproximadas. Con `limite`,
+        solo las mejores `limite` (sin ordenar el resto).
+        """
+        subcadena = _compactar(consulta)
+        if not subcadena:
+            return []
+        buscados = trigramas(consulta)
+        compartidos: Dict[str, int] = {}
+        for trigrama in buscados:
+            for clave in self._publicaciones.get(trigrama, ()):
+                compartidos[clave] = compartidos.get(clave, 0) + 1
+
+        def coincidencia(clave: str, exacta: bool) -> Coincidencia:
+            n = compartidos.get(clave, 0)
+            if not buscados:
+                return Coincidencia(clave, 1.0, 0.0, exacta)
+            return Coincidencia(
+                clave, n / len(buscados), n / (len(buscados) + len(self._trigramas[clave]) - n), exacta
+            )
+
+        exactas = set(self._con_subcadena(subcadena))
+        minimo = umbral * len(buscados)
+        coincidencias = [coincidencia(clave, True) for clave in exactas]
+        coincidencias.extend(
+            coincidencia(clave, False)
+            for clave, n in compartidos.items() if n >= minimo and clave not in exactas
+        )
+        return mejores(coincidencias, limite, self._orden.__getitem__)
+
+
+def mejores(coincidencias: List[Coincidencia], limite: Optional[int],
+            orden=lambda clave: 0) -> List[Coincidencia]:
+    """Ordena de mejor a peor (a igual puntaje, por `orden` ascendente) y corta en `limite`."""
+    def puntaje(c: Coincidencia):
+        return (c.exacta, c.cobertura, c.similitud, -orden(c.clave))
+
+    if limite is None:
+        return sorted(coincidencias, key=puntaje, reverse=True)
+    return heapq.nlargest(limite, coincidencias, key=puntaje)
@@ -1,12 +1,19 @@
-from typing import List
+from typing import Iterator, List, Optional
 from models.productos import Producto
 from repositories.productos_repo import ProductosRepo
+from services.busqueda_service import BusquedaService
+from services.rango_service import RangoService
+from services.relaciones_service import RelacionesService
 from config.exceptions import ValidacionError, NotFoundError, ConflictError, RepositoryError
 
 
 class ProductosService:
-    def __init__(self, repo: ProductosRepo):
+    def __init__(self, repo: ProductosRepo, relaciones: Optional[RelacionesService] = None):
         self.repo = repo
+        # Tickets que usan cada código; sin él no se controlan al eliminar
+        self.relaciones = relaciones
+        self.busqueda = BusquedaService(repo, 'nombre')
+        self.por_precio = RangoService(repo, 'precio')
 
     def _validar_nombre(self, nombre: str) -> str:
         if not nombre or not nombre.strip():
@@ -29,7 +36,7 @@ class ProductosService:
         precio = self._validar_precio(precio)
 
         # Evitar duplicado por nombre
-        todos = self.repo.cargar_todos()
+        todos = self.repo.iterar_todos()
         if any(p.nombre.lower() == nombre.lower() for p in todos):
             raise ConflictError(f"Ya existe un producto con el nombre '{nombre}'.")
 
@@ -54,7 +61,7 @@ class ProductosService:
             raise NotFoundError(f"Producto con código '{codigo}' no encontrado.")
 
         # Evitar duplicado de nombre (excepto si es el mismo)
-        todos = self.repo.cargar_todos()
+        todos = self.repo.iterar_todos()
         for p in todos:
             if p.codigo != codigo and p.nombre.lower() == nombre.lower():
                 raise ConflictError(f"Ya existe otro producto con el nombre '{nombre}'.")
@@ -78,10 +85,19 @@ class ProductosService:
         return producto
 
     def eliminar(self, codigo: str) -> None:
-        """Elimina un producto por código."""
+        """Elimina un producto por código. Lanza ConflictError si algún ticket lo usa."""
         if not self.repo.cargar_por_codigo(codigo):
             raise NotFoundError(f"Producto con código '{codigo}' no encontrado.")
 
+        # No se elimina un código que figura en tickets: quedarían sin su ítem del catálogo
+        if self.relaciones is not None:
+            tickets = self.relaciones.tickets_con_producto(codigo)
+            if tickets:
+                raise ConflictError(
+                    f"El producto '{codigo}' figura en {len(tickets)} ticket(s); no se puede eliminar.",
+                    details=tickets
+                )
+
         try:
             self.repo.eliminar_producto(codigo)
         except Exception as e:
@@ -91,27 +107,30 @@ class ProductosService:
         """Devuelve todos los productos."""
         return self.repo.cargar_todos()
 
-    def buscar_por_nombre(self, texto: str) -> List[Producto]:
-        """Búsqueda parcial por nombre (insensible a mayúsculas)."""
+    def iterar_todos(self) -> Iterator[Producto]:
+        """Recorre todos los productos de a uno, sin cargarlos todos en memoria."""
+        return self.repo.iterar_todos()
+
+    def buscar_por_nombre(self, texto: str, limite: Optional[int] = None) -> List[Producto]:
+        """
+        Búsqueda por nombre sin distinguir mayúsculas ni tildes: primero los
+        que contienen el texto y después los parecidos (errores de tipeo).
+        Con `limite`, solo los `limite` mejores; por defecto, todos.
+        """
         if not texto or not texto.strip():
             raise ValidacionError("El texto de búsqueda no puede estar vacío.")
-        texto = texto.lower().strip()
-        return [p for p in self.listar_todos() if texto in p.nombre.lower()]
+        return self.busqueda.buscar_items(texto, limite)
 
-    def buscar_por_precio(self, precio_min: float, precio_max: float) -> List[Producto]:
+    def buscar_por_precio(self, precio_min: float, precio_max: Optional[float], desde: int = 0,
+                            cantidad: Optional[int] = None, descendente: bool = False) -> List[Producto]:
         """
-        Busca productos por rango de precio.
+        Busca productos por rango de precio, ordenados por precio (de menor a
+        mayor, o de mayor a menor con `descendente`).
         Si precio_max es None, busca >= precio_min.
+        `desde` y `cantidad` permiten pedir el resultado por páginas.
         """
-        if precio_max is not None and precio_max < precio_min:
-            raise ValidacionError("precio_max debe ser mayor o igual a precio_min.")
-
-        resultados = []
-        for p in self.listar_todos():
-            if precio_max is None:
-                if p.precio >= precio_min:
-                    resultados.append(p)
-            else:
-                if precio_min <= p.precio <= precio_max:
-                    resultados.append(p)
-        return resultados
\ No newline at end of file
+        return self.por_precio.buscar_items(precio_min, precio_max, desde, cantidad, descendente)
+
+    def contar_por_precio(self, precio_min: float, precio_max: Optional[float]) -> int:
+        """Cantidad de productos en el rango de precio, sin cargarlos."""
+        return self.por_precio.contar(precio_min, precio_max)
\ No newline at end of file
@@ -0,0 +1,67 @@
+from typing import Optional
+
+from services.indice_ordenado import IndiceOrdenado
+from config.exceptions import ValidacionError
+
+
+class RangoService:
+    """
+    Consultas por rango sobre un campo numérico de un repositorio de
+    catálogo, por ejemplo el precio de los productos o la capacidad de los
+    extintores.
+
+    El índice ordenado se construye al primer uso y luego se mantiene con
+    los cambios que notifica el repositorio; si el repositorio avisa que los
+    datos cambiaron por fuera ("recargar"), se reconstruye al siguiente uso.
+    """
+
+    def __init__(self, repo, campo: str):
+        self.repo = repo
+        self.campo = campo
+        self._indice: Optional[IndiceOrdenado] = None
+        repo.suscribir(self._al_cambiar)
+
+    def _al_cambiar(self, evento: str, anterior: Optional[dict], nuevo: Optional[dict]) -> None:
+        indice = self._indice
+        if indice is None:
+            return  # Aún no se construyó; se armará completo al usarse
+        if evento == 'recargar':
+            self._indice = None
+            return
+        if anterior is not None and (nuevo is None or nuevo['codigo'] != anterior['codigo']):
+            indice.quitar(anterior['codigo'])
+        if nuevo is not None:
+            indice.agregar(nuevo['codigo'], float(nuevo[self.campo]))
+
+    def _indice_actual(self) -> IndiceOrdenado:
+        self.repo.verificar_cambios()
+        indice = self._indice
+        if indice is None:
+            indice = IndiceOrdenado()
+            for item in self.repo.iterar_todos():
+                indice.agregar(item.codigo, float(getattr(item, self.campo)))
+            self._indice = indice
+        return indice
+
+    def _validar(self, minimo: float, maximo: Optional[float]) -> None:
+        if maximo is not None and maximo < minimo:
+            raise ValidacionError(f"{self.campo}_max debe ser mayor o igual a {self.campo}_min.")
+
+    def contar(self, minimo: float, maximo: Optional[float] = None) -> int:
+        """Cantidad de ítems con el campo en [minimo, maximo] (maximo None = sin límite)."""
+        self._validar(minimo, maximo)
+        return self._indice_actual().contar(minimo, maximo)
+
+    def buscar_items(self, minimo: float, maximo: Optional[float] = None, desde: int = 0,
+                        cantidad: Optional[int] = None, descendente: bool = False) -> list:
+        """
+        Ítems con el campo en [minimo, maximo], ordenados por ese campo
+        (ascendente, o descendente con `descendente`). `desde` y `cantidad`
+        eligen una página: se cargan solo los ítems de esa página.
+        """
+        self._validar(minimo, maximo)
+        if desde < 0 or (cantidad is not None and cantidad < 0):
+            raise ValidacionError("La página pedida no es válida.")
+        codigos = self._indice_actual().rango(minimo, maximo, desde, cantidad, descendente)
+        encontrados = self.repo.cargar_por_codigos(codigos)
+        return [encontrados[codigo] for codigo in codigos if codigo in encontrados]
@@ -0,0 +1,64 @@
+from typing import Dict, List, Optional
+
+from repositories.tickets_repo import TicketsRepo
+
+
+class RelacionesService:
+    """
+    Qué tickets hacen referencia a cada cliente y a cada producto o extintor,
+    para comprobar la integridad referencial al eliminar.
+
+    Cliente → tickets usa el índice por cliente del repositorio de tickets.
+    Código de producto → tickets se construye con una pasada sobre los
+    tickets al primer uso y luego se mantiene con los cambios que notifica
+    el repositorio; si el repositorio avisa que los datos cambiaron por
+    fuera ("recargar"), se reconstruye al siguiente uso. Así, saber si un
+    código está en uso cuesta lo mismo tenga el historial diez tickets o un
+    millón.
+    """
+
+    def __init__(self, tickets_repo: TicketsRepo):
+        self.tickets_repo = tickets_repo
+        # código de producto → códigos de ticket (dict como conjunto ordenado)
+        self._por_producto: Optional[Dict[str, Dict[str, None]]] = None
+        tickets_repo.suscribir(self._al_cambiar)
+
+    def _al_cambiar(self, evento: str, anterior: Optional[dict], nuevo: Optional[dict]) -> None:
+        por_producto = self._por_producto
+        if por_producto is None:
+            return  # Aún no se construyó; se armará completo al usarse
+        if evento == 'recargar':
+            self._por_producto = None
+            return
+        if anterior is not None:
+            for p in anterior['productos']:
+                tickets = por_producto.get(p['codigo'])
+                if tickets is not None:
+                    tickets.pop(anterior['codigo_ticket'], None)
+                    if not tickets:
+                        del por_producto[p['codigo']]
+        if nuevo is not None:
+            for p in nuevo['productos']:
+                por_producto.setdefault(p['codigo'], {})[nuevo['codigo_ticket']] = None
+
+    def _indice_productos(self) -> Dict[str, Dict[str, None]]:
+        self.tickets_repo.verificar_cambios()
+        por_producto = self._por_producto
+        if por_producto is None:
+            por_producto = {}
+            for t in self.tickets_repo.iterar_todos():
+                for p in t.productos:
+                    por_producto.setdefault(p['codigo'], {})[t.codigo_ticket] = None
+            self._por_producto = por_producto
+        return por_producto
+
+    def tickets_de_cliente(self, codigo_cliente: str) -> List[str]:
+        """Códigos de los tickets de un cliente."""
+        return self.tickets_repo.codigos_por_cliente(codigo_cliente)
+
+    def tickets_con_producto(self, codigo: str) -> List[str]:
+        """Códigos de los tickets que incluyen el producto o extintor `codigo`."""
+        return list(self._indice_productos().get(codigo, ()))
+
+    def producto_en_uso(self, codigo: str) -> bool:
+        return codigo in self._indice_productos()
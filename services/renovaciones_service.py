@@ -0,0 +1,98 @@
+from datetime import date
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from models.clientes import Cliente
+from repositories.clientes_repo import ClientesRepo
+from config.exceptions import ValidacionError
+
+MESES = [
+    "Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio",
+    "Julio", "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"
+]
+
+
+class VencimientoMes(NamedTuple):
+    """Clientes a renovar en un mes concreto del plan."""
+    anio: int
+    mes: str  # nombre del mes, como en Cliente.mes_vencimiento
+    clientes: List[Cliente]
+
+
+class RenovacionesService:
+    """
+    Vencimientos de clientes agrupados por mes y plan de renovaciones.
+
+    Los códigos de cliente se reparten en una cubeta por mes de vencimiento
+    al primer uso; luego las cubetas se mantienen con los cambios que
+    notifica el repositorio, así consultar un mes no recorre los clientes.
+    El plan de los próximos meses (solo códigos) queda armado hasta el
+    siguiente cambio en los clientes o hasta que cambie el mes actual. Si el
+    repositorio avisa que los datos cambiaron por fuera ("recargar"), todo
+    se reconstruye al siguiente uso.
+    """
+
+    def __init__(self, clientes_repo: ClientesRepo):
+        self.clientes_repo = clientes_repo
+        # mes → códigos en orden de alta (dict como conjunto ordenado); un
+        # cliente que cambia de mes queda al final de su nueva cubeta
+        self._cubetas: Optional[Dict[str, Dict[str, None]]] = None
+        self._plan: Optional[Tuple[Tuple[int, int, int], List[Tuple[int, str, List[str]]]]] = None
+        clientes_repo.suscribir(self._al_cambiar)
+
+    def _al_cambiar(self, evento: str, anterior: Optional[dict], nuevo: Optional[dict]) -> None:
+        cubetas = self._cubetas
+        if cubetas is None:
+            return  # Aún no se construyeron; se armarán completas al usarse
+        self._plan = None
+        if evento == 'recargar':
+            self._cubetas = None
+            return
+        if anterior is not None and nuevo is not None and (
+                anterior['codigo'], anterior['mes_vencimiento']) == (nuevo['codigo'], nuevo['mes_vencimiento']):
+            return  # Sigue en la misma cubeta y en el mismo lugar
+        if anterior is not None:
+            cubetas.get(anterior['mes_vencimiento'], {}).pop(anterior['codigo'], None)
+        if nuevo is not None:
+            cubetas.setdefault(nuevo['mes_vencimiento'], {})[nuevo['codigo']] = None
+
+    def _obtener_cubetas(self) -> Dict[str, Dict[str, None]]:
+        self.clientes_repo.verificar_cambios()
+        cubetas = self._cubetas
+        if cubetas is None:
+            cubetas = {mes: {} for mes in MESES}
+            for c in self.clientes_repo.iterar_todos():
+                cubetas.setdefault(c.mes_vencimiento, {})[c.codigo] = None
+            self._cubetas = cubetas
+            self._plan = None
+        return cubetas
+
+    def _cargar(self, codigos: List[str]) -> List[Cliente]:
+        encontrados = self.clientes_repo.cargar_por_codigos(codigos)
+        return [encontrados[codigo] for codigo in codigos if codigo in encontrados]
+
+    def codigos_por_mes(self, mes: str) -> List[str]:
+        """Códigos de los clientes que vencen en `mes`, en orden de alta."""
+        return list(self._obtener_cubetas().get(mes, ()))
+
+    def clientes_por_mes(self, mes: str) -> List[Cliente]:
+        """Clientes que vencen en `mes`, en orden de alta."""
+        return self._cargar(self.codigos_por_mes(mes))
+
+    def plan(self, meses: int = 3, hoy: Optional[date] = None) -> List[VencimientoMes]:
+        """
+        Vencimientos de los próximos `meses` meses, empezando por el actual
+        (según `hoy`, por defecto la fecha del sistema).
+        """
+        if meses < 1:
+            raise ValidacionError("El plan debe cubrir al menos un mes.")
+        hoy = hoy or date.today()
+        cubetas = self._obtener_cubetas()
+        clave = (hoy.year, hoy.month, meses)
+        if self._plan is None or self._plan[0] != clave:
+            filas = []
+            for i in range(meses):
+                anio, indice = divmod(hoy.month - 1 + i, 12)
+                mes = MESES[indice]
+                filas.append((hoy.year + anio, mes, list(cubetas.get(mes, ()))))
+            self._plan = (clave, filas)
+        return [VencimientoMes(anio, mes, self._cargar(codigos)) for anio, mes, codigos in self._plan[1]]
@@ -0,0 +1,164 @@
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+from models.tickets import Ticket
+from repositories.tickets_repo import TicketsRepo
+from config.exceptions import ValidacionError
+
+
+def _decimal(valor: Union[int, float]) -> Decimal:
+    # Desde el texto del float: 0.1 es Decimal('0.1'), no su aproximación binaria
+    return Decimal(valor) if isinstance(valor, int) else Decimal(str(valor))
+
+
+def _numero(monto: Decimal) -> Union[int, float]:
+    """Monto acumulado para entregar: entero si no tiene decimales, si no el float más cercano."""
+    return int(monto) if monto == monto.to_integral_value() else float(monto)
+
+
+class Totales:
+    """Monto acumulado y cantidad: de tickets, o de unidades vendidas para los productos."""
+
+    def __init__(self, monto: Union[int, float, Decimal] = 0, cantidad: int = 0) -> None:
+        self.monto = monto
+        self.cantidad = cantidad
+
+    def __repr__(self) -> str:
+        return f"Totales(monto={self.monto!r}, cantidad={self.cantidad!r})"
+
+
+# Dimensiones de los reportes:
+#   "cliente"  → código de cliente
+#   "mes"      → AAAA-MM de la fecha del ticket
+#   "servicio" → servicio del ticket
+#   "producto" → código de producto o extintor (monto de sus líneas, unidades)
+DIMENSIONES = ("cliente", "mes", "servicio", "producto")
+
+
+class AgregadosTickets:
+    """
+    Totales de ingresos por dimensión, que se suman o restan de a un ticket.
+
+    Los montos se acumulan como Decimal: sumar y restar el mismo ticket
+    muchas veces (cada actualización resta el anterior y suma el nuevo) no
+    deja residuos como 0.30000000000000004.
+    """
+
+    def __init__(self) -> None:
+        self.general = Totales()
+        self.por: Dict[str, Dict[str, Totales]] = {dimension: {} for dimension in DIMENSIONES}
+
+    def _acumular(self, dimension: str, clave: str, monto: Decimal, cantidad: int) -> None:
+        tabla = self.por[dimension]
+        totales = tabla.get(clave)
+        if totales is None:
+            totales = tabla[clave] = Totales()
+        totales.monto += monto
+        totales.cantidad += cantidad
+        if totales.cantidad <= 0:
+            # Ya no quedan tickets (o unidades) con esta clave
+            del tabla[clave]
+
+    def _aplicar(self, codigo_cliente: str, mes: str, servicio: str, total: float,
+                    productos: Iterable[dict], signo: int) -> None:
+        monto = _decimal(total) * signo
+        self.general.monto += monto
+        self.general.cantidad += signo
+        self._acumular("cliente", codigo_cliente, monto, signo)
+        self._acumular("mes", mes, monto, signo)
+        self._acumular("servicio", servicio, monto, signo)
+        for p in productos:
+            self._acumular("producto", p['codigo'], _decimal(p['precio']) * p['cantidad'] * signo,
+                            p['cantidad'] * signo)
+
+    def aplicar_registro(self, registro: dict, signo: int = 1) -> None:
+        """Suma (signo 1) o resta (signo -1) un ticket en la forma en que lo guarda el repositorio."""
+        self._aplicar(registro['codigo_cliente'], registro['fecha'][:7], registro['servicio'],
+                        registro['total'], registro['productos'], signo)
+
+    def aplicar_ticket(self, ticket: Ticket, signo: int = 1) -> None:
+        self._aplicar(ticket.codigo_cliente, ticket.fecha.strftime('%Y-%m'), ticket.servicio,
+                        ticket.total, ticket.productos, signo)
+
+
+class ReportesService:
+    """
+    Reportes de ingresos por cliente, mes, servicio y producto.
+
+    Los totales se construyen con una pasada sobre los tickets al primer
+    uso y luego se mantienen con los cambios que notifica el repositorio de
+    tickets (crear, actualizar, eliminar, importar): cada consulta responde
+    en tiempo constante, sin recorrer el historial. Si el repositorio avisa
+    que los datos cambiaron por fuera ("recargar"), se reconstruyen al
+    siguiente uso.
+
+    Los totales viven solo en memoria: cada proceso los arma al primer uso
+    con una pasada sobre todo el historial, así que ese arranque (y cada
+    "recargar") sigue creciendo con la cantidad de tickets.
+    """
+
+    def __init__(self, tickets_repo: TicketsRepo):
+        self.tickets_repo = tickets_repo
+        self._agregados: Optional[AgregadosTickets] = None
+        tickets_repo.suscribir(self._al_cambiar)
+
+    def _al_cambiar(self, evento: str, anterior: Optional[dict], nuevo: Optional[dict]) -> None:
+        agregados = self._agregados
+        if agregados is None:
+            return  # Aún no se construyeron; se armarán completos al usarse
+        if evento == 'recargar':
+            self._agregados = None
+            return
+        if anterior is not None:
+            agregados.aplicar_registro(anterior, -1)
+        if nuevo is not None:
+            agregados.aplicar_registro(nuevo)
+
+    def _obtener(self) -> AgregadosTickets:
+        self.tickets_repo.verificar_cambios()
+        agregados = self._agregados
+        if agregados is None:
+            agregados = AgregadosTickets()
+            for ticket in self.tickets_repo.iterar_todos():
+                agregados.aplicar_ticket(ticket)
+            self._agregados = agregados
+        return agregados
+
+    def _consultar(self, dimension: str, clave: str) -> Totales:
+        totales = self._obtener().por[dimension].get(clave)
+        return Totales(_numero(totales.monto), totales.cantidad) if totales else Totales()
+
+    def total_general(self) -> Totales:
+        """Ingresos y cantidad de tickets de todo el historial."""
+        general = self._obtener().general
+        return Totales(_numero(general.monto), general.cantidad)
+
+    def por_cliente(self, codigo_cliente: str) -> Totales:
+        """Ingresos y cantidad de tickets de un cliente."""
+        return self._consultar("cliente", codigo_cliente)
+
+    def por_mes(self, mes: str) -> Totales:
+        """Ingresos y cantidad de tickets de un mes ('AAAA-MM')."""
+        return self._consultar("mes", mes)
+
+    def por_servicio(self, servicio: str) -> Totales:
+        """Ingresos y cantidad de tickets de un servicio."""
+        return self._consultar("servicio", servicio.strip().title())
+
+    def por_producto(self, codigo: str) -> Totales:
+        """Ingresos y unidades vendidas de un producto o extintor."""
+        return self._consultar("producto", codigo)
+
+    def resumen(self, dimension: str) -> List[Tuple[str, Totales]]:
+        """
+        Todos los totales de una dimensión, de mayor a menor monto
+        ("mes" se ordena por fecha). El costo depende de la cantidad de
+        claves, no de tickets.
+        """
+        if dimension not in DIMENSIONES:
+            raise ValidacionError(f"Dimensión '{dimension}' inválida. Use una de: {', '.join(DIMENSIONES)}")
+        filas = [
+            (clave, Totales(_numero(t.monto), t.cantidad)) for clave, t in self._obtener().por[dimension].items()
+        ]
+        if dimension == "mes":
+            return sorted(filas, key=lambda fila: fila[0])
+        return sorted(filas, key=lambda fila: fila[1].monto, reverse=True)
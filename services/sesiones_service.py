@@ -0,0 +1,156 @@
+import base64
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional
+
+from models.usuarios import Usuario
+from services.usuarios_service import UsuariosService
+from config.exceptions import AutenticacionError
+
+# Duración por defecto de una sesión, en segundos
+TTL_POR_DEFECTO = 8 * 3600
+
+
+class Sesion(NamedTuple):
+    token: str
+    email: str
+    expira: float  # segundos desde la época (time.time())
+
+
+def _b64(datos: bytes) -> str:
+    return base64.urlsafe_b64encode(datos).rstrip(b"=").decode("ascii")
+
+
+def _desde_b64(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+
+def _huella(hashed: str) -> str:
+    """Resumen corto del hash de la contraseña: cambia si se cambia la contraseña."""
+    return hashlib.sha256(hashed.encode("utf-8")).hexdigest()[:16]
+
+
+class SesionesService:
+    """
+    Sesiones de usuario con tokens firmados y vencimiento.
+
+    Iniciar sesión verifica la contraseña con bcrypt una sola vez y entrega
+    un token `email.expira.huella.firma`, firmado con HMAC-SHA256. Validar
+    un token solo comprueba la firma y el vencimiento y toma el usuario de
+    una caché LRU de usuarios autenticados hace poco, sin leer el archivo
+    de usuarios ni volver a correr bcrypt.
+
+    La huella del hash de la contraseña va dentro del token: si la
+    contraseña cambia, las sesiones abiertas dejan de valer. La caché se
+    mantiene con los cambios que notifica el repositorio de usuarios
+    (actualizar, eliminar, "recargar"). Sin `clave`, se genera una al azar
+    y los tokens valen solo mientras dure el proceso.
+    """
+
+    def __init__(self, usuarios_service: UsuariosService, clave: Optional[bytes] = None,
+                    ttl: float = TTL_POR_DEFECTO, capacidad: int = 256,
+                    reloj: Callable[[], float] = time.time) -> None:
+        self.usuarios_service = usuarios_service
+        self.repo = usuarios_service.repo
+        self._clave = clave or secrets.token_bytes(32)
+        self.ttl = ttl
+        self.capacidad = capacidad
+        self._reloj = reloj
+        self._usuarios: "OrderedDict[str, Usuario]" = OrderedDict()  # email → usuario, del más viejo al más reciente
+        self._cerradas: Dict[str, float] = {}  # firma → vencimiento, para no aceptar tokens cerrados
+        self._lock = threading.Lock()
+        self.repo.suscribir(self._al_cambiar)
+
+    def _al_cambiar(self, evento: str, anterior: Optional[dict], nuevo: Optional[dict]) -> None:
+        with self._lock:
+            if evento == 'recargar':
+                self._usuarios.clear()
+                return
+            for registro in (anterior, nuevo):
+                if registro is not None:
+                    self._usuarios.pop(registro['email'].lower(), None)
+
+    def _recordar(self, usuario: Usuario) -> None:
+        with self._lock:
+            self._usuarios[usuario.email.lower()] = usuario
+            self._usuarios.move_to_end(usuario.email.lower())
+            while len(self._usuarios) > self.capacidad:
+                self._usuarios.popitem(last=False)
+
+    def _usuario(self, email: str) -> Optional[Usuario]:
+        self.repo.verificar_cambios()
+        with self._lock:
+            usuario = self._usuarios.get(email)
+            if usuario is not None:
+                self._usuarios.move_to_end(email)
+                return usuario
+        usuario = self.repo.cargar_por_email(email)
+        if usuario is not None:
+            self._recordar(usuario)
+        return usuario
+
+    def _firmar(self, contenido: str) -> str:
+        return _b64(hmac.new(self._clave, contenido.encode("ascii"), hashlib.sha256).digest())
+
+    def abrir(self, usuario: Usuario) -> Sesion:
+        """Entrega un token para un usuario ya autenticado (por ejemplo, recién creado)."""
+        self._recordar(usuario)
+        expira = int(self._reloj() + self.ttl)
+        contenido = f"{_b64(usuario.email.lower().encode('utf-8'))}.{expira}.{_huella(usuario.contraseña)}"
+        return Sesion(f"{contenido}.{self._firmar(contenido)}", usuario.email.lower(), expira)
+
+    def iniciar(self, email: str, password: str) -> Sesion:
+        """Verifica las credenciales (bcrypt) y abre una sesión. Lanza AutenticacionError si fallan."""
+        return self.abrir(self.usuarios_service.login(email, password))
+
+    def _partes(self, token: str) -> Optional[tuple]:
+        """(email, expira, huella, firma) de un token con firma correcta, o None."""
+        partes = (token or "").split(".")
+        if len(partes) != 4:
+            return None
+        email_b64, expira, huella, firma = partes
+        try:
+            esperada = self._firmar(f"{email_b64}.{expira}.{huella}")
+            if not hmac.compare_digest(firma.encode("ascii"), esperada.encode("ascii")):
+                return None
+            return _desde_b64(email_b64).decode("utf-8"), int(expira), huella, firma
+        except ValueError:  # texto que no es ASCII o base64: no es un token nuestro
+            return None
+
+    def validar(self, token: str) -> Usuario:
+        """
+        Devuelve el usuario de una sesión válida. Lanza AutenticacionError si
+        el token está alterado, venció, se cerró o su usuario ya no existe o
+        cambió la contraseña.
+        """
+        partes = self._partes(token)
+        if partes is None:
+            raise AutenticacionError("Sesión inválida.")
+        email, expira, huella, firma = partes
+        if expira <= self._reloj():
+            raise AutenticacionError("La sesión venció. Inicie sesión nuevamente.")
+        with self._lock:
+            cerrada = firma in self._cerradas
+        if cerrada:
+            raise AutenticacionError("La sesión fue cerrada.")
+
+        usuario = self._usuario(email)
+        if usuario is None or _huella(usuario.contraseña) != huella:
+            raise AutenticacionError("Sesión inválida.")
+        return usuario
+
+    def cerrar(self, token: str) -> None:
+        """Cierra una sesión: su token deja de valer aunque no haya vencido."""
+        partes = self._partes(token)
+        if partes is None:
+            return
+        ahora = self._reloj()
+        with self._lock:
+            # De paso se olvidan los tokens cerrados que ya vencieron solos
+            for firma in [f for f, expira in self._cerradas.items() if expira <= ahora]:
+                del self._cerradas[firma]
+            self._cerradas[partes[3]] = partes[1]
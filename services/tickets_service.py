@@ -1,10 +1,13 @@
-from datetime import datetime
-from typing import List, Dict
-from models.tickets import Ticket
+from datetime import date, datetime, time
+from typing import Iterator, List, Dict, Optional
+from models.tickets import LineaTicket, Ticket
 from repositories.tickets_repo import TicketsRepo
 from repositories.clientes_repo import ClientesRepo
 from repositories.productos_repo import ProductosRepo
 from repositories.extintores_repo import ExtintoresRepo
+from services.catalogo_service import CatalogoService
+from services.reportes_service import ReportesService
+from services.relaciones_service import RelacionesService
 from config.exceptions import ValidacionError, NotFoundError, RepositoryError
 
 
@@ -15,6 +18,11 @@ class TicketsService:
         self.clientes_repo = clientes_repo
         self.productos_repo = productos_repo
         self.extintores_repo = extintores_repo
+        self.catalogo = CatalogoService(productos_repo, extintores_repo)
+        # Los totales se mantienen con cada crear/actualizar/eliminar (ver ReportesService)
+        self.reportes = ReportesService(tickets_repo)
+        # Qué tickets usan cada cliente y cada código, para eliminar sin dejar huérfanos
+        self.relaciones = RelacionesService(tickets_repo)
 
     def _validar_servicio(self, servicio: str) -> str:
         if not servicio or not servicio.strip():
@@ -31,39 +39,19 @@ class TicketsService:
             raise ValidacionError("La cantidad debe ser un entero mayor a 0.")
         return item
 
-    def _sincronizar_productos(self, productos: List[Dict]) -> List[Dict]:
+    def _sincronizar_productos(self, productos: List[Dict]) -> List[LineaTicket]:
         """Sincroniza nombre y precio desde Productos o Extintores."""
+        # Todos los códigos del ticket se resuelven en una sola pasada
+        catalogo = self.catalogo.resolver(item['codigo'] for item in productos)
+
         sincronizados = []
         for item in productos:
             codigo = item['codigo']
-            cantidad = item['cantidad']
-
-            # 1. Buscar en Productos
-            prod = self.productos_repo.cargar_por_codigo(codigo)
-            if prod:
-                item = {
-                    'codigo': codigo,
-                    'nombre': prod.nombre,
-                    'precio': prod.precio,
-                    'cantidad': cantidad
-                }
-                sincronizados.append(item)
-                continue  # ← ¡Importante! Siguiente producto
-
-            # 2. Si no está en productos → Buscar en Extintores
-            ext = self.extintores_repo.cargar_por_codigo(codigo)
-            if ext:
-                item = {
-                    'codigo': codigo,
-                    'nombre': ext.nombre,
-                    'precio': ext.precio,
-                    'cantidad': cantidad
-                }
-                sincronizados.append(item)
-                continue
-
-            # 3. Si no existe en ninguno → ERROR
-            raise NotFoundError(f"Producto o extintor con código '{codigo}' no encontrado.")
+            encontrado = catalogo.get(codigo)
+            if encontrado is None:
+                raise NotFoundError(f"Producto o extintor con código '{codigo}' no encontrado.")
+
+            sincronizados.append(LineaTicket(codigo, encontrado.nombre, encontrado.precio, item['cantidad']))
 
         return sincronizados
 
@@ -74,14 +62,15 @@ class TicketsService:
             total += p['precio'] * p['cantidad']
         return total
 
-    def crear(
+    def preparar(
         self,
         servicio: str,
         codigo_cliente: str,
-        productos: List[Dict]
+        productos: List[Dict],
+        fecha: Optional[datetime] = None
     ) -> Ticket:
         """
-        Crea un ticket completo.
+        Valida y arma un ticket con nombres y precios del catálogo, sin guardarlo.
         Lanza excepciones si hay errores.
         """
         servicio = self._validar_servicio(servicio)
@@ -112,9 +101,23 @@ class TicketsService:
             cliente=cliente.nombre_empresa,
             productos=productos_sync,
             total=total,
-            fecha=datetime.now()
+            fecha=fecha or datetime.now()
         )
 
+        return ticket
+
+    def crear(
+        self,
+        servicio: str,
+        codigo_cliente: str,
+        productos: List[Dict]
+    ) -> Ticket:
+        """
+        Crea un ticket completo.
+        Lanza excepciones si hay errores.
+        """
+        ticket = self.preparar(servicio, codigo_cliente, productos)
+
         try:
             self.tickets_repo.crear(ticket)
         except Exception as e:
@@ -177,10 +180,21 @@ class TicketsService:
     def obtener_por_cliente(self, codigo_cliente: str) -> List[Ticket]:
         """Obtiene todos los tickets de un cliente."""
         # Validar que el cliente exista
-        if not self.clientes_repo.cargar_por_codigo(codigo_cliente):
+        if not self.clientes_repo.existe_cliente(codigo_cliente):
             raise NotFoundError(f"Cliente con código '{codigo_cliente}' no encontrado.")
         return self.tickets_repo.cargar_todos_por_cliente(codigo_cliente)
 
+    def listar_por_rango(self, desde: date, hasta: date) -> List[Ticket]:
+        """
+        Devuelve los tickets con fecha entre `desde` y `hasta`, ambos incluidos.
+        Acepta fechas o fechas con hora; una fecha sin hora abarca el día completo.
+        """
+        inicio = desde if isinstance(desde, datetime) else datetime.combine(desde, time.min)
+        fin = hasta if isinstance(hasta, datetime) else datetime.combine(hasta, time.max)
+        if inicio > fin:
+            raise ValidacionError("La fecha inicial no puede ser posterior a la final.")
+        return list(self.tickets_repo.iterar_por_rango(inicio, fin))
+
     def eliminar(self, codigo_ticket: str) -> None:
         """Elimina un ticket."""
         if not self.tickets_repo.cargar_por_codigo(codigo_ticket):
@@ -195,4 +209,8 @@ class TicketsService:
 
     def listar_todos(self) -> List[Ticket]:
         """Devuelve todos los tickets."""
-        return self.tickets_repo.cargar_todos()
\ No newline at end of file
+        return self.tickets_repo.cargar_todos()
+
+    def iterar_todos(self) -> Iterator[Ticket]:
+        """Recorre todos los tickets de a uno, sin cargarlos todos en memoria."""
+        return self.tickets_repo.iterar_todos()
\ No newline at end of file
@@ -1,25 +1,30 @@
-import bcrypt
+from typing import Iterable, List, Optional, Tuple
 from models.usuarios import Usuario
 from repositories.usuarios_repo import UsuariosRepo
+from services.contrasenas_service import ContrasenasService
 from config.exceptions import (
     ValidacionError, NotFoundError, ConflictError, AutenticacionError, RepositoryError
 )
 
 
 class UsuariosService:
-    def __init__(self, repo: UsuariosRepo):
+    def __init__(self, repo: UsuariosRepo, contrasenas: Optional[ContrasenasService] = None):
         self.repo = repo
+        # bcrypt corre en un pool de hilos con costo configurable
+        self.contrasenas = contrasenas or ContrasenasService()
 
-    def _hash_password(self, password: str) -> str:
-        """Encripta la contraseña usando bcrypt."""
+    def _validar_password(self, password: str) -> None:
         if not password or len(password.strip()) < 4:
             raise ValidacionError("La contraseña debe tener al menos 4 caracteres.")
-        salt = bcrypt.gensalt()
-        return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+    def _hash_password(self, password: str) -> str:
+        """Encripta la contraseña usando bcrypt."""
+        self._validar_password(password)
+        return self.contrasenas.hashear(password)
 
     def _check_password(self, password: str, hashed: str) -> bool:
         """Verifica si la contraseña coincide con el hash."""
-        return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
+        return self.contrasenas.verificar(password, hashed)
 
     def _validar_email(self, email: str) -> None:
         """Valida formato básico de email."""
@@ -57,6 +62,36 @@ class UsuariosService:
 
         return usuario
 
+    def crear_varios(self, datos: Iterable[Tuple[str, str, str]]) -> List[Usuario]:
+        """
+        Crea varios usuarios a partir de tuplas (nombre, email, contraseña).
+        Se valida todo antes de guardar nada; las contraseñas se hashean en
+        paralelo y los usuarios se guardan juntos.
+        """
+        datos = list(datos)
+        emails = set()
+        for nombre, email, password in datos:
+            self._validar_nombre(nombre)
+            self._validar_email(email)
+            self._validar_password(password)
+            email = email.strip().lower()
+            if email in emails or self.repo.existe_usuario(email):
+                raise ConflictError(f"El email '{email}' ya está registrado.")
+            emails.add(email)
+
+        hashes = self.contrasenas.hashear_varios(password for _, _, password in datos)
+        usuarios = [
+            Usuario(nombre=nombre.strip(), email=email.strip().lower(), contraseña=hashed)
+            for (nombre, email, _), hashed in zip(datos, hashes)
+        ]
+
+        try:
+            self.repo.guardar_varios(usuarios)
+        except Exception as e:
+            raise RepositoryError("Error al guardar los usuarios en el repositorio.") from e
+
+        return usuarios
+
     def login(self, email: str, password: str) -> Usuario:
         """
         Autentica al usuario.